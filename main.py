@@ -1,5 +1,22 @@
-from src.game import Game
+import argparse
+
+from src.bitboard import BLACK, WHITE
+from src.book import OpeningBook
+from src.game import DEFAULT_COMPUTER_TIME_LIMIT, Game
+from src.tablebase import Tablebases
 
 if __name__ == "__main__":
-    game = Game()
-    game.play_game()
+    parser = argparse.ArgumentParser(description="Play a game of chess")
+    parser.add_argument("--computer", choices=["white", "black"], help="Side played by the engine")
+    parser.add_argument("--think-time", type=float, default=DEFAULT_COMPUTER_TIME_LIMIT)
+    parser.add_argument("--book", help="Opening book used by the engine")
+    parser.add_argument("--fen", help="Start from this position instead")
+    parser.add_argument("--tablebases", help="Directory of endgame tables used by the engine")
+    args = parser.parse_args()
+    computer_color = {"white": WHITE, "black": BLACK}.get(args.computer)
+    game = Game(args.fen)
+    if args.book:
+        game.opening_book = OpeningBook(args.book)
+    if args.tablebases:
+        game.tablebases = Tablebases(args.tablebases)
+    game.play_game(computer_color, args.think_time)
@@ -0,0 +1,219 @@
+import mmap
+import os
+import struct
+import sys
+from array import array
+from typing import Iterable, Iterator, List, NamedTuple, Sequence, Tuple
+
+from .fen import parse_fen
+from .game import Game
+from .move import move_destination, move_origin
+from .perft import START_FEN
+from .pgn import PgnGame, iter_game_moves
+from .position import Position
+
+# An archive is a file of game records plus an index file holding the byte offset of each
+# record as little-endian 64-bit integers. Both are only ever appended to. A record is a
+# fixed-size header, an optional start FEN padded to an even length and one little-endian
+# 16-bit packed move per ply.
+ARCHIVE_MAGIC = b"WGCA"
+ARCHIVE_VERSION = 1
+FILE_HEADER = struct.Struct("<4sHH")
+# ply count, result, flags, white rating, black rating, start FEN length
+RECORD_HEADER = struct.Struct("<IBBHHH")
+INDEX_SUFFIX = ".idx"
+
+HAS_START_FEN = 1
+
+UNKNOWN_RESULT = 0
+WHITE_WINS = 1
+BLACK_WINS = 2
+DRAW = 3
+PGN_RESULTS = {"1-0": WHITE_WINS, "0-1": BLACK_WINS, "1/2-1/2": DRAW, "*": UNKNOWN_RESULT}
+
+
+class GameRecord(NamedTuple):
+    moves: Sequence[int]
+    result: int = UNKNOWN_RESULT
+    white_rating: int = 0
+    black_rating: int = 0
+    fen: str | None = None
+
+
+def record_from_game(game: Game, result: int = UNKNOWN_RESULT) -> GameRecord:
+    return GameRecord(list(game.move_history), result, fen=game.start_fen)
+
+
+def record_from_pgn(pgn_game: PgnGame) -> GameRecord:
+    headers = pgn_game.headers
+    return GameRecord(
+        list(iter_game_moves(pgn_game)),
+        PGN_RESULTS.get(pgn_game.result, UNKNOWN_RESULT),
+        int(headers.get("WhiteElo", "0") or 0),
+        int(headers.get("BlackElo", "0") or 0),
+        headers.get("FEN"),
+    )
+
+
+def _encode_record(record: GameRecord) -> bytes:
+    fen = record.fen.encode() if record.fen else b""
+    if len(fen) % 2:
+        fen += b" "
+    moves = array("H", record.moves)
+    if sys.byteorder != "little":
+        moves.byteswap()
+    header = RECORD_HEADER.pack(
+        len(moves),
+        record.result,
+        HAS_START_FEN if fen else 0,
+        record.white_rating,
+        record.black_rating,
+        len(fen),
+    )
+    return header + fen + moves.tobytes()
+
+
+class ArchiveWriter:
+    def __init__(self, path: str):
+        self.path = path
+        self.file = open(path, "ab")
+        self.index_file = open(path + INDEX_SUFFIX, "ab")
+        if self.file.tell() == 0:
+            self.file.write(FILE_HEADER.pack(ARCHIVE_MAGIC, ARCHIVE_VERSION, 0))
+
+    def __enter__(self) -> "ArchiveWriter":
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def close(self):
+        self.file.close()
+        self.index_file.close()
+
+    def write_games(self, records: Iterable[GameRecord]) -> int:
+        # Encodes the whole batch in memory, then appends it with one write per file.
+        offset = self.file.tell()
+        data = bytearray()
+        offsets = array("Q")
+        for record in records:
+            offsets.append(offset + len(data))
+            data += _encode_record(record)
+        if sys.byteorder != "little":
+            offsets.byteswap()
+        self.file.write(data)
+        self.index_file.write(offsets.tobytes())
+        self.file.flush()
+        self.index_file.flush()
+        return len(offsets)
+
+    def write_game(self, record: GameRecord):
+        self.write_games((record,))
+
+
+def _map(path: str) -> mmap.mmap | bytes:
+    with open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return b""
+        return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class ArchiveReader:
+    def __init__(self, path: str):
+        self.data = _map(path)
+        magic, version, _ = FILE_HEADER.unpack_from(self.data, 0)
+        if magic != ARCHIVE_MAGIC or version != ARCHIVE_VERSION:
+            raise ValueError(f"{path} is not a version {ARCHIVE_VERSION} game archive")
+        self.view = memoryview(self.data)
+        if os.path.exists(path + INDEX_SUFFIX):
+            index_data = _map(path + INDEX_SUFFIX)
+            self._index_data = index_data
+            self.offsets: Sequence[int] = memoryview(index_data).cast("Q")
+            if sys.byteorder != "little":
+                self.offsets = array("Q", self.offsets)
+                self.offsets.byteswap()
+        else:
+            self._index_data = b""
+            self.offsets = self._scan_offsets()
+
+    def __enter__(self) -> "ArchiveReader":
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def close(self):
+        # Views on the maps have to be released before the maps can be closed.
+        if isinstance(self.offsets, memoryview):
+            self.offsets.release()
+        self.view.release()
+        for data in (self.data, self._index_data):
+            if isinstance(data, mmap.mmap):
+                data.close()
+
+    def _scan_offsets(self) -> List[int]:
+        # Rebuilds the index from the record headers when the index file is missing.
+        offsets: List[int] = []
+        offset = FILE_HEADER.size
+        while offset < len(self.data):
+            offsets.append(offset)
+            plies, _, _, _, _, fen_length = RECORD_HEADER.unpack_from(self.data, offset)
+            offset += RECORD_HEADER.size + fen_length + 2 * plies
+        return offsets
+
+    def read_header(self, number: int) -> Tuple[int, int, int, int, int, int]:
+        return RECORD_HEADER.unpack_from(self.data, self.offsets[number])
+
+    def read_moves(self, number: int) -> Sequence[int]:
+        # A zero-copy view of the packed moves inside the mapped file.
+        offset = self.offsets[number]
+        plies, _, _, _, _, fen_length = RECORD_HEADER.unpack_from(self.data, offset)
+        start = offset + RECORD_HEADER.size + fen_length
+        moves = self.view[start : start + 2 * plies].cast("H")
+        if sys.byteorder != "little":
+            swapped = array("H", moves)
+            swapped.byteswap()
+            return swapped
+        return moves
+
+    def read_fen(self, number: int) -> str:
+        offset = self.offsets[number]
+        _, _, flags, _, _, fen_length = RECORD_HEADER.unpack_from(self.data, offset)
+        if not flags & HAS_START_FEN:
+            return START_FEN
+        start = offset + RECORD_HEADER.size
+        return bytes(self.view[start : start + fen_length]).decode().rstrip()
+
+    def read_record(self, number: int) -> GameRecord:
+        _, result, flags, white_rating, black_rating, _ = self.read_header(number)
+        fen = self.read_fen(number) if flags & HAS_START_FEN else None
+        return GameRecord(list(self.read_moves(number)), result, white_rating, black_rating, fen)
+
+    def iter_moves(self) -> Iterator[Sequence[int]]:
+        for number in range(len(self.offsets)):
+            yield self.read_moves(number)
+
+    def _read_moves_to_ply(self, number: int, ply: int | None) -> Sequence[int]:
+        moves = self.read_moves(number)
+        if ply is None:
+            return moves
+        if not 0 <= ply <= len(moves):
+            raise IndexError(f"Game {number} has no ply {ply}")
+        return moves[:ply]
+
+    def replay_position(self, number: int, ply: int | None = None) -> Position:
+        # Fast path for statistics: plays the moves straight on a Position.
+        position = parse_fen(self.read_fen(number))
+        for move in self._read_moves_to_ply(number, ply):
+            position.make_move(move)
+        return position
+
+    def replay(self, number: int, ply: int | None = None) -> Game:
+        game = Game.from_fen(self.read_fen(number))
+        for move in self._read_moves_to_ply(number, ply):
+            game.play_move(move_origin(move), move_destination(move))
+        game.start_turn(*game.get_players_to_move())
+        return game
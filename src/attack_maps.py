@@ -0,0 +1,76 @@
+from typing import List
+
+from .attacks import piece_attacks
+from .bitboard import BISHOP, NO_PIECE, QUEEN, ROOK, iter_squares
+from .position import Position
+
+
+class AttackMaps:
+    # Attack sets of every piece on the board, indexed both ways: attacks_from[square] holds
+    # the squares attacked by the piece on square, attackers[square] the pieces attacking it.
+    # After a move only the moved and captured pieces and the sliders whose rays crossed a
+    # changed square are recomputed.
+    def __init__(self, position: Position):
+        self.position = position
+        self.attacks_from: List[int] = [0] * 64
+        self.attackers: List[int] = [0] * 64
+        self.attacked: List[int] = [0, 0]
+        self.hash = position.hash
+        self.refresh()
+
+    def refresh(self):
+        position = self.position
+        self.attacks_from = [0] * 64
+        self.attackers = [0] * 64
+        self.attacked = [0, 0]
+        self.update(position.occupied)
+
+    def update(self, changed: int):
+        position = self.position
+        pieces = position.pieces
+        mailbox = position.mailbox
+        attackers = self.attackers
+        attacks_from = self.attacks_from
+        sliders = 0
+        for code in (BISHOP, ROOK, QUEEN, BISHOP + 6, ROOK + 6, QUEEN + 6):
+            sliders |= pieces[code]
+        affected = changed
+        for square in iter_squares(changed):
+            affected |= attackers[square] & sliders
+        touched = 0
+        for square in iter_squares(affected):
+            code = mailbox[square]
+            previous_attacks = attacks_from[square]
+            attacks = piece_attacks(code, square, position.occupied) if code != NO_PIECE else 0
+            if attacks != previous_attacks:
+                square_bit = 1 << square
+                for target in iter_squares(previous_attacks & ~attacks):
+                    attackers[target] &= ~square_bit
+                for target in iter_squares(attacks & ~previous_attacks):
+                    attackers[target] |= square_bit
+                attacks_from[square] = attacks
+            touched |= previous_attacks | attacks
+        white, black = position.colors
+        for target in iter_squares(touched):
+            target_bit = 1 << target
+            if attackers[target] & white:
+                self.attacked[0] |= target_bit
+            else:
+                self.attacked[0] &= ~target_bit
+            if attackers[target] & black:
+                self.attacked[1] |= target_bit
+            else:
+                self.attacked[1] &= ~target_bit
+        self.hash = position.hash
+
+    def sync(self, position: Position):
+        # Rebuilds the maps when the board was set up or edited outside of the game moves.
+        if position is not self.position or position.hash != self.hash:
+            self.position = position
+            self.refresh()
+
+    def is_square_attacked(self, square: int, by_color: int) -> bool:
+        return bool(self.attacked[by_color] >> square & 1)
+
+    def attackers_of(self, square: int, by_color: int) -> int:
+        return self.attackers[square] & self.position.colors[by_color]
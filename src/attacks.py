@@ -0,0 +1,149 @@
+from typing import List, Tuple
+
+from .bitboard import BISHOP, BLACK, KING, KNIGHT, PAWN, QUEEN, ROOK, WHITE, bit
+
+KNIGHT_VECTORS = [(2, -1), (2, 1), (-2, 1), (-2, -1), (1, 2), (-1, 2), (1, -2), (-1, -2)]
+KING_VECTORS = [(-1, -1), (-1, 1), (-1, 0), (1, -1), (1, 1), (1, 0), (0, -1), (0, 1)]
+PAWN_CAPTURE_VECTORS = ([(-1, 1), (-1, -1)], [(1, -1), (1, 1)])
+PAWN_PUSH_VECTORS = ((-1, 0), (1, 0))
+
+NORTH = (-1, 0)
+SOUTH = (1, 0)
+WEST = (0, -1)
+EAST = (0, 1)
+NORTH_WEST = (-1, -1)
+NORTH_EAST = (-1, 1)
+SOUTH_WEST = (1, -1)
+SOUTH_EAST = (1, 1)
+
+
+def _step(square: int, vector: Tuple[int, int]) -> int | None:
+    row_index = (square >> 3) + vector[0]
+    column_index = (square & 7) + vector[1]
+    if 0 <= row_index <= 7 and 0 <= column_index <= 7:
+        return row_index * 8 + column_index
+    return None
+
+
+def _leaper_table(vectors: List[Tuple[int, int]]) -> List[int]:
+    table: List[int] = []
+    for square in range(64):
+        attacks = 0
+        for vector in vectors:
+            destination = _step(square, vector)
+            if destination is not None:
+                attacks |= bit(destination)
+        table.append(attacks)
+    return table
+
+
+def _ray_table(vector: Tuple[int, int]) -> List[int]:
+    table: List[int] = []
+    for square in range(64):
+        ray = 0
+        destination = _step(square, vector)
+        while destination is not None:
+            ray |= bit(destination)
+            destination = _step(destination, vector)
+        table.append(ray)
+    return table
+
+
+KNIGHT_ATTACKS = _leaper_table(KNIGHT_VECTORS)
+KING_ATTACKS = _leaper_table(KING_VECTORS)
+PAWN_ATTACKS = (
+    _leaper_table(PAWN_CAPTURE_VECTORS[WHITE]),
+    _leaper_table(PAWN_CAPTURE_VECTORS[BLACK]),
+)
+PAWN_PUSHES = (
+    _leaper_table([PAWN_PUSH_VECTORS[WHITE]]),
+    _leaper_table([PAWN_PUSH_VECTORS[BLACK]]),
+)
+PAWN_START_ROWS = (6, 1)
+
+# Rays growing towards higher square indexes stop at their lowest blocker, the
+# others at their highest one.
+ROOK_POSITIVE_RAYS = [_ray_table(SOUTH), _ray_table(EAST)]
+ROOK_NEGATIVE_RAYS = [_ray_table(NORTH), _ray_table(WEST)]
+BISHOP_POSITIVE_RAYS = [_ray_table(SOUTH_EAST), _ray_table(SOUTH_WEST)]
+BISHOP_NEGATIVE_RAYS = [_ray_table(NORTH_WEST), _ray_table(NORTH_EAST)]
+
+ROOK_RAYS = [
+    ROOK_POSITIVE_RAYS[0][square]
+    | ROOK_POSITIVE_RAYS[1][square]
+    | ROOK_NEGATIVE_RAYS[0][square]
+    | ROOK_NEGATIVE_RAYS[1][square]
+    for square in range(64)
+]
+BISHOP_RAYS = [
+    BISHOP_POSITIVE_RAYS[0][square]
+    | BISHOP_POSITIVE_RAYS[1][square]
+    | BISHOP_NEGATIVE_RAYS[0][square]
+    | BISHOP_NEGATIVE_RAYS[1][square]
+    for square in range(64)
+]
+
+
+def _between_table() -> List[List[int]]:
+    table = [[0] * 64 for _ in range(64)]
+    for square in range(64):
+        for vector in KING_VECTORS:
+            between = 0
+            destination = _step(square, vector)
+            while destination is not None:
+                table[square][destination] = between
+                between |= bit(destination)
+                destination = _step(destination, vector)
+    return table
+
+
+# Squares strictly between two aligned squares, empty when they are not aligned.
+BETWEEN = _between_table()
+
+
+def _sliding_attacks(
+    square: int, occupied: int, positive_rays: List[List[int]], negative_rays: List[List[int]]
+) -> int:
+    attacks = 0
+    for rays in positive_rays:
+        ray = rays[square]
+        blockers = ray & occupied
+        if blockers:
+            ray ^= rays[(blockers & -blockers).bit_length() - 1]
+        attacks |= ray
+    for rays in negative_rays:
+        ray = rays[square]
+        blockers = ray & occupied
+        if blockers:
+            ray ^= rays[blockers.bit_length() - 1]
+        attacks |= ray
+    return attacks
+
+
+def rook_attacks(square: int, occupied: int) -> int:
+    return _sliding_attacks(square, occupied, ROOK_POSITIVE_RAYS, ROOK_NEGATIVE_RAYS)
+
+
+def bishop_attacks(square: int, occupied: int) -> int:
+    return _sliding_attacks(square, occupied, BISHOP_POSITIVE_RAYS, BISHOP_NEGATIVE_RAYS)
+
+
+def queen_attacks(square: int, occupied: int) -> int:
+    return rook_attacks(square, occupied) | bishop_attacks(square, occupied)
+
+
+def piece_attacks(code: int, square: int, occupied: int) -> int:
+    kind = code % 6
+    if kind == PAWN:
+        return PAWN_ATTACKS[code // 6][square]
+    if kind == KNIGHT:
+        return KNIGHT_ATTACKS[square]
+    if kind == BISHOP:
+        return bishop_attacks(square, occupied)
+    if kind == ROOK:
+        return rook_attacks(square, occupied)
+    if kind == QUEEN:
+        return queen_attacks(square, occupied)
+    if kind == KING:
+        return KING_ATTACKS[square]
+    return 0
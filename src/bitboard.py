@@ -0,0 +1,42 @@
+from typing import Iterator
+
+WHITE = 0
+BLACK = 1
+
+PAWN = 0
+KNIGHT = 1
+BISHOP = 2
+ROOK = 3
+QUEEN = 4
+KING = 5
+
+NO_PIECE = 12
+
+FULL = (1 << 64) - 1
+
+
+def square_index(row_index: int, column_index: int) -> int:
+    return row_index * 8 + column_index
+
+
+def piece_code(color: int, kind: int) -> int:
+    return color * 6 + kind
+
+
+def code_color(code: int) -> int:
+    return WHITE if code < 6 else BLACK
+
+
+def bit(square: int) -> int:
+    return 1 << square
+
+
+def iter_squares(bitboard: int) -> Iterator[int]:
+    while bitboard:
+        lowest_bit = bitboard & -bitboard
+        yield lowest_bit.bit_length() - 1
+        bitboard ^= lowest_bit
+
+
+def pop_count(bitboard: int) -> int:
+    return bitboard.bit_count()
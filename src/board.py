@@ -1,6 +1,18 @@
-from typing import List
+from typing import Iterator, List, Tuple
 
-from .pieces import Bishop, King, Knight, Pawn, Piece, Queen, Rook
+from .bitboard import iter_squares
+from .fen import PieceIndexes, parse_fen
+from .pieces import (
+    FLYWEIGHT_PIECES,
+    Bishop,
+    King,
+    Knight,
+    Pawn,
+    Piece,
+    Queen,
+    Rook,
+)
+from .position import ALL_CASTLING, Position
 from .utils import row_index_to_algebraic
 
 """ BLACK_SQUARE = "█"
@@ -9,8 +21,64 @@ BLACK_SQUARE = "·"
 WHITE_SQUARE = "·"
 
 
+class BoardRow:
+    __slots__ = ("_board", "_offset")
+
+    def __init__(self, board: "Board", row_index: int):
+        self._board = board
+        self._offset = row_index * 8
+
+    def __getitem__(self, column_index: int) -> Piece | None:
+        return self._board.pieces[self._offset + column_index]
+
+    def __setitem__(self, column_index: int, piece: Piece | None):
+        self._board.set_square(self._offset + column_index, piece)
+
+    def __iter__(self) -> Iterator[Piece | None]:
+        return iter(self._board.pieces[self._offset : self._offset + 8])
+
+    def __len__(self) -> int:
+        return 8
+
+
+class FlyweightBoardRow(BoardRow):
+    __slots__ = ()
+
+    def __getitem__(self, column_index: int) -> Piece | None:
+        return FLYWEIGHT_PIECES[self._board.position.mailbox[self._offset + column_index]]
+
+    def __iter__(self) -> Iterator[Piece | None]:
+        mailbox = self._board.position.mailbox
+        return (FLYWEIGHT_PIECES[code] for code in mailbox[self._offset : self._offset + 8])
+
+
+class BoardSquares:
+    __slots__ = ("position", "_rows")
+
+    def __init__(self, board: "Board"):
+        self.position = board.position
+        row_type = FlyweightBoardRow if board.flyweight else BoardRow
+        self._rows = tuple(row_type(board, row_index) for row_index in range(8))
+
+    def __getitem__(self, row_index: int) -> BoardRow:
+        return self._rows[row_index]
+
+    def __iter__(self) -> Iterator[BoardRow]:
+        return iter(self._rows)
+
+    def __len__(self) -> int:
+        return 8
+
+
 class Board:
-    squares: List[List[Piece | None]]
+    squares: BoardSquares
+    position: Position
+    pieces: List[Piece | None]
+
+    def __init__(self, flyweight: bool = False):
+        # Flyweight boards only keep the piece codes of the position and hand out shared
+        # piece instances when read, instead of holding one object per occupied square.
+        self.flyweight = flyweight
 
     def __str__(self):
         text: str = ""
@@ -30,13 +98,11 @@ class Board:
         return text
 
     def init_board(self):
-        self.squares = []
-        for _ in range(8):
-            self.squares.append([None] * 8)
+        self.init_empty_board()
         # PAWNS
-        for column_index, _ in enumerate(self.squares[1]):
+        for column_index in range(8):
             self.squares[1][column_index] = Pawn(1, column_index, False)
-        for column_index, _ in enumerate(self.squares[6]):
+        for column_index in range(8):
             self.squares[6][column_index] = Pawn(6, column_index, True)
         # ROOKS
         self.squares[0][0] = Rook(0, 0, False)
@@ -59,20 +125,62 @@ class Board:
         # KINGS
         self.squares[0][4] = King(0, 4, False)
         self.squares[7][4] = King(7, 4, True)
+        self.position.set_castling(ALL_CASTLING)
 
     def init_empty_board(self):
-        self.squares = []
-        for _ in range(8):
-            self.squares.append([None] * 8)
+        self.position = Position()
+        self.pieces = [] if self.flyweight else [None] * 64
+        self.squares = BoardSquares(self)
+
+    def init_board_from_fen(self, fen: str) -> Tuple[PieceIndexes, PieceIndexes]:
+        # Builds the position, the piece objects and the indexes of each color for the players
+        # in the single walk over the FEN board.
+        indexes: Tuple[PieceIndexes, PieceIndexes] = (({}, {}), ({}, {}))
+        if self.flyweight:
+            self.position = parse_fen(fen)
+            self.pieces = []
+        else:
+            self.pieces = [None] * 64
+            self.position = parse_fen(fen, self.pieces, indexes)
+        self.squares = BoardSquares(self)
+        return indexes
 
     def init_board_with_pieces(self, *pieces: Piece):
         for piece in pieces:
             self.squares[piece.row][piece.column] = piece
 
     def clear_board(self):
-        for row in self.squares:
-            for square in row:
-                square = None
+        self.position.clear()
+        if not self.flyweight:
+            self.pieces[:] = [None] * 64
+
+    def set_square(self, square: int, piece: Piece | None):
+        if self.flyweight:
+            self._set_flyweight_square(square, piece)
+            return
+        if self.pieces[square] is not None:
+            self.position.remove_piece(square)
+        self.pieces[square] = piece
+        if piece is not None:
+            self.position.put_piece(square, piece.code)
+            if piece.has_moved:
+                self.position.moved |= 1 << square
+
+    def _set_flyweight_square(self, square: int, piece: Piece | None):
+        position = self.position
+        position.remove_piece(square)
+        if piece is not None:
+            position.put_piece(square, piece.code)
+            if piece.has_moved:
+                position.moved |= 1 << square
 
     def get_square_from_row_column(self, row_index: int, column_index: int) -> Piece | None:
         return self.squares[row_index][column_index]
+
+    def get_pieces(self) -> List[Piece]:
+        if self.flyweight:
+            mailbox = self.position.mailbox
+            return [
+                FLYWEIGHT_PIECES[mailbox[square]] for square in iter_squares(self.position.occupied)
+            ]
+        return [self.pieces[square] for square in iter_squares(self.position.occupied)]
@@ -0,0 +1,174 @@
+import argparse
+import mmap
+import os
+import random
+import struct
+from typing import Dict, Iterable, List, NamedTuple, Tuple
+
+from .exceptions import InvalidSanException
+from .fen import parse_fen
+from .move import move_to_algebraic
+from .movegen import generate_legal_moves
+from .perft import START_FEN
+from .pgn import PgnReader, san_to_move
+from .position import Position
+
+# Polyglot-style book: sorted 16-byte big-endian entries of position key, move, weight and
+# a learn field. Keys are this engine's Zobrist hashes and moves its packed 16-bit moves,
+# so books have to be built with build_book rather than taken from other programs.
+ENTRY = struct.Struct(">QHHI")
+KEY = struct.Struct(">Q")
+MAX_WEIGHT = 0xFFFF
+DEFAULT_BOOK_PLIES = 16
+
+BEST_MOVE = "best"
+WEIGHTED_MOVE = "weighted"
+
+
+class BookEntry(NamedTuple):
+    key: int
+    move: int
+    weight: int
+    learn: int
+
+
+class OpeningBook:
+    def __init__(self, path: str):
+        self.file = open(path, "rb")
+        if os.fstat(self.file.fileno()).st_size:
+            self.data: mmap.mmap | bytes = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            self.data = b""
+        self.size = len(self.data) // ENTRY.size
+
+    def __enter__(self) -> "OpeningBook":
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def __len__(self) -> int:
+        return self.size
+
+    def close(self):
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+        self.file.close()
+
+    def _first_entry(self, key: int) -> int:
+        # Binary search for the first entry whose key is not lower than key, reading only
+        # the keys it visits from the mapped file.
+        low, high = 0, self.size
+        while low < high:
+            middle = (low + high) // 2
+            if KEY.unpack_from(self.data, middle * ENTRY.size)[0] < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def get_entries(self, key: int) -> List[BookEntry]:
+        entries: List[BookEntry] = []
+        for index in range(self._first_entry(key), self.size):
+            entry = BookEntry(*ENTRY.unpack_from(self.data, index * ENTRY.size))
+            if entry.key != key:
+                break
+            entries.append(entry)
+        return entries
+
+    def probe(
+        self,
+        position: Position,
+        selection: str = WEIGHTED_MOVE,
+        generator: random.Random | None = None,
+    ) -> int | None:
+        entries = self.get_entries(position.hash)
+        if not entries:
+            return None
+        # Guards against key collisions with positions that are not in the book.
+        legal_moves = set(generate_legal_moves(position, position.turn))
+        entries = [entry for entry in entries if entry.move in legal_moves and entry.weight]
+        if not entries:
+            return None
+        if selection == BEST_MOVE:
+            return max(entries, key=lambda entry: entry.weight).move
+        generator = generator or random
+        weights = [entry.weight for entry in entries]
+        return generator.choices(entries, weights)[0].move
+
+
+def _result_weights(result: str) -> Tuple[int, int]:
+    # Points for White and Black moves, as in Polyglot: two for a win, one for a draw.
+    if result == "1-0":
+        return 2, 0
+    if result == "0-1":
+        return 0, 2
+    return 1, 1
+
+
+def collect_book_moves(
+    pgn_paths: Iterable[str], max_plies: int = DEFAULT_BOOK_PLIES
+) -> Dict[Tuple[int, int], int]:
+    scores: Dict[Tuple[int, int], int] = {}
+    for path in pgn_paths:
+        with PgnReader(path) as reader:
+            for game in reader:
+                position = parse_fen(game.headers.get("FEN", START_FEN))
+                weights = _result_weights(game.result)
+                for san in game.moves[:max_plies]:
+                    try:
+                        move = san_to_move(position, san)
+                    except InvalidSanException:
+                        # Lines with moves the engine cannot play yet end the game's book moves.
+                        break
+                    entry_key = (position.hash, move)
+                    scores[entry_key] = scores.get(entry_key, 0) + weights[position.turn]
+                    position.make_move(move)
+    return scores
+
+
+def write_book(path: str, scores: Dict[Tuple[int, int], int]):
+    top_score = max(scores.values(), default=0)
+    # Weights are scaled down together when the top one does not fit in 16 bits.
+    scale = MAX_WEIGHT / top_score if top_score > MAX_WEIGHT else 1
+    with open(path, "wb") as file:
+        data = bytearray()
+        for (key, move), score in sorted(scores.items()):
+            weight = int(score * scale)
+            if weight:
+                data += ENTRY.pack(key, move, weight, 0)
+        file.write(data)
+
+
+def build_book(
+    pgn_paths: Iterable[str], output_path: str, max_plies: int = DEFAULT_BOOK_PLIES
+) -> int:
+    scores = collect_book_moves(pgn_paths, max_plies)
+    write_book(output_path, scores)
+    return os.path.getsize(output_path) // ENTRY.size
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or probe an opening book")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    build_parser = subparsers.add_parser("build", help="Build a book from PGN files")
+    build_parser.add_argument("pgn", nargs="+")
+    build_parser.add_argument("--output", required=True)
+    build_parser.add_argument("--plies", type=int, default=DEFAULT_BOOK_PLIES)
+    probe_parser = subparsers.add_parser("probe", help="List the book moves of a position")
+    probe_parser.add_argument("book")
+    probe_parser.add_argument("--fen", default=START_FEN)
+    args = parser.parse_args()
+
+    if args.command == "build":
+        entries = build_book(args.pgn, args.output, args.plies)
+        print(f"Wrote {entries} entries to {args.output}")
+        return
+    with OpeningBook(args.book) as book:
+        position = parse_fen(args.fen)
+        for entry in sorted(book.get_entries(position.hash), key=lambda entry: -entry.weight):
+            print(f"{move_to_algebraic(entry.move)}: {entry.weight}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+from typing import Iterable, Sequence
+
+from .bitboard import NO_PIECE, WHITE
+from .position import Position
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is only needed to build training data.
+    np = None
+
+# Feature planes of a position, each 8x8 and indexed like the board (a8 first): one plane
+# per piece code, then a plane set when White is to move, one per castling right in the
+# order of the position castling bits and one marking the en passant square.
+PIECE_PLANES = 12
+SIDE_PLANE = 12
+CASTLING_PLANE = 13
+EN_PASSANT_PLANE = 17
+PLANE_COUNT = 18
+
+# A packed position is its mailbox followed by the side to move, the castling bits and
+# the en passant square, NO_EN_PASSANT when there is none.
+PACKED_SIZE = 67
+NO_EN_PASSANT = 255
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("Board encoding needs NumPy, install it with pip install numpy")
+
+
+def allocate_planes(batch_size: int, dtype: str = "float32") -> "np.ndarray":
+    _require_numpy()
+    return np.zeros((batch_size, PLANE_COUNT, 8, 8), dtype=dtype)
+
+
+def pack_position(position: Position) -> bytes:
+    en_passant = NO_EN_PASSANT if position.en_passant is None else position.en_passant
+    return bytes(position.mailbox) + bytes((position.turn, position.castling, en_passant))
+
+
+def pack_positions(positions: Iterable[Position]) -> "np.ndarray":
+    _require_numpy()
+    data = b"".join(map(pack_position, positions))
+    return np.frombuffer(data, dtype=np.uint8).reshape(-1, PACKED_SIZE)
+
+
+def encode_packed(packed: "np.ndarray", out: "np.ndarray | None" = None) -> "np.ndarray":
+    # Writes the planes of a batch of packed positions into out, or a new array, and returns
+    # the part of out holding them. Every plane is set with whole-batch array operations.
+    _require_numpy()
+    count = len(packed)
+    if out is None:
+        out = allocate_planes(count)
+    elif out.shape[1:] != (PLANE_COUNT, 8, 8) or len(out) < count or not out.flags.c_contiguous:
+        raise ValueError(f"Planes of {count} positions do not fit an array of {out.shape}")
+    planes = out[:count]
+    planes.fill(0)
+    squares = planes.reshape(count, PLANE_COUNT, 64)
+    codes = packed[:, :64]
+    batch_indexes, square_indexes = np.nonzero(codes != NO_PIECE)
+    squares[batch_indexes, codes[batch_indexes, square_indexes], square_indexes] = 1
+    squares[:, SIDE_PLANE] = (packed[:, 64] == WHITE)[:, None]
+    castling_bits = (packed[:, 65, None] >> np.arange(4, dtype=np.uint8)) & 1
+    squares[:, CASTLING_PLANE:EN_PASSANT_PLANE] = castling_bits[:, :, None]
+    en_passant = packed[:, 66]
+    (batch_indexes,) = np.nonzero(en_passant != NO_EN_PASSANT)
+    squares[batch_indexes, EN_PASSANT_PLANE, en_passant[batch_indexes]] = 1
+    return planes
+
+
+def encode_positions(
+    positions: Sequence[Position], out: "np.ndarray | None" = None
+) -> "np.ndarray":
+    return encode_packed(pack_positions(positions), out)
@@ -16,3 +16,15 @@ class ImpossibleMoveException(Exception):
 class PieceNotFoundException(Exception):
     def __init__(self, origin_square_algebraic: str):
         super().__init__(f"Cannot find piece at {origin_square_algebraic}")
+
+
+class HashMismatchException(Exception):
+    def __init__(self, incremental_hash: int, computed_hash: int):
+        super().__init__(
+            f"Incremental hash {incremental_hash:016x} differs from computed {computed_hash:016x}"
+        )
+
+
+class InvalidSanException(Exception):
+    def __init__(self, san: str, reason: str):
+        super().__init__(f"Cannot play {san}: {reason}")
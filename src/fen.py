@@ -0,0 +1,97 @@
+from typing import Dict, List, Tuple, Type
+
+from .bitboard import BLACK, NO_PIECE, WHITE, piece_code
+from .pieces import PIECE_TYPES, Piece
+from .position import (
+    BLACK_KINGSIDE,
+    BLACK_QUEENSIDE,
+    WHITE_KINGSIDE,
+    WHITE_QUEENSIDE,
+    Position,
+)
+from .utils import SQUARE_NAMES, algebraic_to_square
+
+PIECE_CHARS = "pnbrqk"
+CASTLING_CHARS = {
+    "K": WHITE_KINGSIDE,
+    "Q": WHITE_QUEENSIDE,
+    "k": BLACK_KINGSIDE,
+    "q": BLACK_QUEENSIDE,
+}
+# Pieces of one color keyed by square, and the same pieces grouped by type.
+PieceIndexes = Tuple[Dict[int, Piece], Dict[Type[Piece], Dict[int, Piece]]]
+
+
+def parse_fen(
+    fen: str,
+    pieces: List[Piece | None] | None = None,
+    indexes: Tuple[PieceIndexes, PieceIndexes] | None = None,
+) -> Position:
+    # When pieces is given, the piece objects are created in the same walk over the board
+    # and placed on it, and indexes (one per color) is filled with them as well.
+    fields = fen.split()
+    position = Position()
+    for row_index, row in enumerate(fields[0].split("/")):
+        column_index = 0
+        for char in row:
+            if char.isdigit():
+                column_index += int(char)
+                continue
+            color = WHITE if char.isupper() else BLACK
+            kind = PIECE_CHARS.index(char.lower())
+            square = row_index * 8 + column_index
+            position.put_piece(square, piece_code(color, kind))
+            if pieces is not None:
+                piece_type = PIECE_TYPES[kind]
+                piece = piece_type(row_index, column_index, color == WHITE)
+                pieces[square] = piece
+                if indexes is not None:
+                    pieces_by_square, pieces_by_type = indexes[color]
+                    pieces_by_square[square] = piece
+                    pieces_by_type.setdefault(piece_type, {})[square] = piece
+            column_index += 1
+    position.set_turn(WHITE if len(fields) < 2 or fields[1] == "w" else BLACK)
+    if len(fields) > 2:
+        castling = 0
+        for char in fields[2].replace("-", ""):
+            castling |= CASTLING_CHARS[char]
+        position.set_castling(castling)
+    if len(fields) > 3 and fields[3] != "-":
+        position.set_en_passant(algebraic_to_square(fields[3]))
+    if len(fields) > 5:
+        position.halfmove_clock = int(fields[4])
+        position.fullmove_number = int(fields[5])
+    return position
+
+
+def position_to_fen(position: Position) -> str:
+    rows = []
+    mailbox = position.mailbox
+    for row_index in range(8):
+        row = ""
+        empty_squares = 0
+        for square in range(row_index * 8, row_index * 8 + 8):
+            code = mailbox[square]
+            if code == NO_PIECE:
+                empty_squares += 1
+                continue
+            if empty_squares:
+                row += str(empty_squares)
+                empty_squares = 0
+            char = PIECE_CHARS[code % 6]
+            row += char.upper() if code < 6 else char
+        if empty_squares:
+            row += str(empty_squares)
+        rows.append(row)
+    castling = "".join(char for char, right in CASTLING_CHARS.items() if position.castling & right)
+    en_passant = "-" if position.en_passant is None else SQUARE_NAMES[position.en_passant]
+    return " ".join(
+        (
+            "/".join(rows),
+            "w" if position.turn == WHITE else "b",
+            castling or "-",
+            en_passant,
+            str(position.halfmove_clock),
+            str(position.fullmove_number),
+        )
+    )
@@ -1,55 +1,121 @@
-from typing import List
+from typing import Dict, Iterator, List, Sequence, Tuple
 
+from .attack_maps import AttackMaps
+from .bitboard import BLACK, WHITE, iter_squares
 from .board import Board
-from .exceptions import DiscoveredCheckException, ImpossibleMoveException
+from .book import OpeningBook
+from .exceptions import (
+    DiscoveredCheckException,
+    ImpossibleMoveException,
+    PieceNotFoundException,
+)
+from .fen import position_to_fen
+from .material import is_dead_position
+from .move import (
+    CAPTURE,
+    DOUBLE_PAWN_PUSH,
+    EN_PASSANT,
+    PROMOTION,
+    encode_move,
+    move_destination,
+    move_flags,
+    move_origin,
+    move_to_algebraic,
+)
+from .movegen import (
+    CAPTURE_STAGE,
+    QUIET_STAGE,
+    generate_legal_moves,
+    has_legal_move,
+    iter_legal_moves,
+)
+from .parallel import ParallelSearchResult, parallel_search
 from .parser import parse_command
-from .pieces import EnPassantPawn, King, Pawn, Piece
+from .pieces import Pawn, Piece
 from .player import Player
-from .utils import algebraic_to_indexes, indexes_to_algebraic
+from .position import CASTLING_MASKS
+from .search import SearchResult, search_position
+from .tablebase import DRAW, TablebaseResult, Tablebases
+from .transposition import TranspositionTable
+from .utils import SQUARE_NAMES, algebraic_to_indexes
+
+DEFAULT_TABLE_SIZE_MB = 16
+DEFAULT_COMPUTER_TIME_LIMIT = 1.0
 
 
 class Game:
-    def __init__(self):
+    def __init__(self, fen: str | None = None):
         self.board = Board()
-        self.board.init_board()
-        self.pieces = self._get_all_pieces()
-        self.player_1 = Player(is_white=True, all_pieces=self.pieces)
-        self.player_2 = Player(is_white=False, all_pieces=self.pieces)
+        self.start_fen = fen
+        if fen is None:
+            self.board.init_board()
+            self.pieces = self._get_all_pieces()
+            self.player_1 = Player(is_white=True, all_pieces=self.pieces)
+            self.player_2 = Player(is_white=False, all_pieces=self.pieces)
+        else:
+            white_indexes, black_indexes = self.board.init_board_from_fen(fen)
+            self.pieces = [*white_indexes[0].values(), *black_indexes[0].values()]
+            position = self.board.position
+            self.player_1 = Player.from_indexes(True, *white_indexes, position.king_square(WHITE))
+            self.player_2 = Player.from_indexes(False, *black_indexes, position.king_square(BLACK))
+        # Only built once something asks for attacks, games that never do skip the cost.
+        self.attack_maps: AttackMaps | None = None
+        self.move_history: List[int] = []
+        # Hash of the position before every move played, for the search to see repetitions.
+        self.hash_history: List[int] = []
         self.checkmate = False
         self.stalemate = False
+        self.dead_position = False
+        # Legal moves keyed by origin and destination, kept until the position hash changes.
+        self.legal_moves: Dict[Tuple[int, int], int] = {}
+        self._legal_moves_key: Tuple[int, int] | None = None
+        self.transposition_table: TranspositionTable | None = None
+        self.opening_book: OpeningBook | None = None
+        self.tablebases: Tablebases | None = None
+        self.computer_time_limit = DEFAULT_COMPUTER_TIME_LIMIT
+
+    @classmethod
+    def from_fen(cls, fen: str) -> "Game":
+        return cls(fen)
+
+    def to_fen(self) -> str:
+        return position_to_fen(self.board.position)
 
-    def play_game(self):
+    def play_game(
+        self,
+        computer_color: int | None = None,
+        computer_time_limit: float = DEFAULT_COMPUTER_TIME_LIMIT,
+    ):
+        self.player_1.is_computer = computer_color == WHITE
+        self.player_2.is_computer = computer_color == BLACK
+        self.computer_time_limit = computer_time_limit
         print("Let the game begin!")
         print(self.board)
+        attacking_player, defending_player = self.get_players_to_move()
         while True:
-            self._player_turn(self.player_1, self.player_2)
-            if self.checkmate:
+            result = self.probe_tablebase()
+            if result is not None and result.wdl == DRAW:
+                print("Draw: the tablebases show neither side can force mate")
+                return
+            self._player_turn(attacking_player, defending_player)
+            if self.checkmate or self.stalemate or self.dead_position:
                 break
-            self._player_turn(self.player_2, self.player_1)
-            if self.checkmate or self.stalemate:
-                break
-        print("Checkmate") if self.checkmate else print("Stalemate")
+            attacking_player, defending_player = defending_player, attacking_player
+        if self.dead_position:
+            print("Draw: neither side has the material to mate")
+        else:
+            print("Checkmate") if self.checkmate else print("Stalemate")
 
     def _player_turn(self, attacking_player: Player, defending_player: Player):
+        if self.is_game_over(attacking_player):
+            return
+        if attacking_player.is_computer:
+            self._computer_turn(attacking_player, defending_player)
+            return
+
+        attacking_color = "White" if attacking_player.is_white else "Black"
         turn_over = False
         while not turn_over:
-            self._remove_en_passant_pawn(attacking_player)
-            self.update_all_player_moves(attacking_player)
-            self.update_all_player_moves(defending_player)
-            self._remove_illegal_moves(attacking_player, defending_player)
-            has_player_available_moves = self._has_player_available_moves(attacking_player)
-            opossite_checking_pieces = self._get_opposite_checking_pieces(
-                defending_player, attacking_player
-            )
-            if opossite_checking_pieces:
-                if has_player_available_moves:
-                    self.checkmate = True
-                    break
-            if has_player_available_moves:
-                self.stalemate = True
-                break
-
-            attacking_color = "White" if attacking_player.is_white else "Black"
             print(
                 f"{attacking_color}'s turn!. Introduce your move in the following way: origin square destination square"
             )
@@ -68,172 +134,258 @@ class Game:
                     turn_over = True
                     print(self.board)
                 else:
-                    print(f"No piece available at {origin_square}")
+                    print(f"No piece available at {SQUARE_NAMES[origin_square]}")
             except (DiscoveredCheckException, ImpossibleMoveException) as exception:
                 print(f"Careful! {str(exception)}")
 
+    def start_turn(self, attacking_player: Player, defending_player: Player) -> bool:
+        # Prepares the legal moves of the attacking player and returns whether the game goes on.
+        if self.is_game_over(attacking_player):
+            return False
+        self.update_all_player_moves(defending_player)
+        self.update_legal_moves(attacking_player)
+        return True
+
+    def is_game_over(self, player: Player) -> bool:
+        # Stops at the first legal move of player and only looks for a check without one,
+        # setting checkmate or stalemate. Dead positions are found from the material alone.
+        position = self.board.position
+        if is_dead_position(position.material):
+            self.dead_position = True
+            return True
+        if has_legal_move(position, player.color):
+            return False
+        king_square = player.king_square
+        opponent = player.color ^ 1
+        in_check = king_square is not None and self.is_square_attacked(king_square, opponent)
+        self.checkmate = in_check
+        self.stalemate = not in_check
+        return True
+
+    def get_players_to_move(self) -> Tuple[Player, Player]:
+        if self.board.position.turn == WHITE:
+            return self.player_1, self.player_2
+        return self.player_2, self.player_1
+
+    def play_move(self, origin_square: int, destination_square: int):
+        # Plays a move for the side to move, validated against its cached legal moves.
+        attacking_player, defending_player = self.get_players_to_move()
+        piece = self._get_origin_square_player_piece(attacking_player, origin_square)
+        if piece is None:
+            raise PieceNotFoundException(SQUARE_NAMES[origin_square])
+        self.move_piece(
+            attacking_player, piece, defending_player, origin_square, destination_square
+        )
+
+    def _computer_turn(self, attacking_player: Player, defending_player: Player):
+        move = self.find_book_move()
+        if move is None:
+            move = self.find_tablebase_move()
+        if move is None:
+            move = self.find_best_move(time_limit=self.computer_time_limit).best_move
+        origin_square = move_origin(move)
+        destination_square = move_destination(move)
+        self.move_piece(
+            attacking_player,
+            self.board.pieces[origin_square],
+            defending_player,
+            origin_square,
+            destination_square,
+        )
+        print(f"{attacking_player.name} plays {move_to_algebraic(move)}")
+        print(self.board)
+
+    def find_book_move(self) -> int | None:
+        if self.opening_book is None:
+            return None
+        return self.opening_book.probe(self.board.position)
+
+    def probe_tablebase(self) -> TablebaseResult | None:
+        if self.tablebases is None:
+            return None
+        return self.tablebases.probe(self.board.position)
+
+    def find_tablebase_move(self) -> int | None:
+        if self.tablebases is None:
+            return None
+        return self.tablebases.best_move(self.board.position)
+
+    def find_best_move(
+        self,
+        max_depth: int | None = None,
+        max_nodes: int | None = None,
+        time_limit: float | None = None,
+    ) -> SearchResult:
+        if self.transposition_table is None:
+            self.transposition_table = TranspositionTable(DEFAULT_TABLE_SIZE_MB)
+        return search_position(
+            self.board.position,
+            max_depth,
+            max_nodes,
+            time_limit,
+            self.transposition_table,
+            self.hash_history,
+        )
+
+    def find_best_move_parallel(
+        self,
+        depth: int,
+        workers: int | None = None,
+        shared_table_mb: float | None = None,
+    ) -> ParallelSearchResult:
+        return parallel_search(
+            self.board.position, depth, workers, shared_table_mb, self.hash_history
+        )
+
+    def _get_attack_maps(self) -> AttackMaps:
+        if self.attack_maps is None:
+            self.attack_maps = AttackMaps(self.board.position)
+        else:
+            self.attack_maps.sync(self.board.position)
+        return self.attack_maps
+
+    def is_square_attacked(self, square: int, by_color: int) -> bool:
+        return self._get_attack_maps().is_square_attacked(square, by_color)
+
+    def iter_legal_moves(
+        self,
+        stages: Sequence[int] = (CAPTURE_STAGE, QUIET_STAGE),
+        player: Player | None = None,
+    ) -> Iterator[int]:
+        # Packed legal moves of the side to move (or of player), captures before quiet moves.
+        # A stage is only generated when the consumer reaches it.
+        color = self.board.position.turn if player is None else player.color
+        return iter_legal_moves(self.board.position, color, stages)
+
     def update_all_player_moves(self, player: Player):
         for piece in player.own_pieces:
             piece.update_possible_moves(self.board.squares)
 
-    def _remove_illegal_moves(self, attacking_player: Player, defending_player: Player):
-        for piece in attacking_player.own_pieces:
-            for move in piece.capture_moves + piece.possible_moves:
-                if self._is_move_illegal(attacking_player, defending_player, piece, move):
-                    if move in piece.possible_moves:
-                        piece.possible_moves.remove(move)
-                    else:
-                        piece.capture_moves.remove(move)
-
-    def _is_move_illegal(
-        self, attacking_player: Player, defending_player: Player, piece: Piece, possible_move: str
-    ):
-        attacking_player_king = [
-            piece for piece in attacking_player.own_pieces if isinstance(piece, King)
-        ][0]
-        attacking_player_king_algebraic = indexes_to_algebraic(
-            attacking_player_king.row, attacking_player_king.column
-        )
-        original_square_row = piece.row
-        original_square_column = piece.column
-        destination_square_row, destination_square_column = algebraic_to_indexes(possible_move)
-        destination_square_content = self.board.squares[destination_square_row][
-            destination_square_column
-        ]
-        self.board.squares[destination_square_row][destination_square_column] = piece
-        self.board.squares[original_square_row][original_square_column] = destination_square_content
-        if isinstance(piece, King):
-            attacking_player_king_algebraic = possible_move
-        self.update_all_player_moves(defending_player)
-        is_illegal = any(
-            [
-                attacking_player_king_algebraic in (piece.possible_moves + piece.capture_moves)
-                for piece in defending_player.own_pieces
-            ]
-        )
-        self.board.squares[destination_square_row][
-            destination_square_column
-        ] = destination_square_content
-        self.board.squares[original_square_row][original_square_column] = piece
-        self.update_all_player_moves(defending_player)
-        return is_illegal
+    def get_legal_moves(self, player: Player | None = None) -> Dict[Tuple[int, int], int]:
+        # Packed legal moves of the side to move (or of player) keyed by origin and destination.
+        # They are only generated again once the position or the color changes.
+        position = self.board.position
+        color = position.turn if player is None else player.color
+        key = (position.hash, color)
+        if key != self._legal_moves_key:
+            self.legal_moves = {
+                (move_origin(move), move_destination(move)): move
+                for move in generate_legal_moves(position, color)
+            }
+            self._legal_moves_key = key
+        return self.legal_moves
+
+    def update_legal_moves(self, player: Player):
+        legal_destinations: Dict[int, List[int]] = {}
+        for origin, destination in self.get_legal_moves(player):
+            legal_destinations.setdefault(origin, []).append(destination)
+        for piece_type, pieces in player.pieces_by_type.items():
+            for origin, piece in pieces.items():
+                destinations = legal_destinations.get(origin, [])
+                if piece_type is Pawn:
+                    piece.possible_moves = [
+                        destination
+                        for destination in destinations
+                        if (destination - origin) & 7 == 0
+                    ]
+                    piece.capture_moves = [
+                        destination
+                        for destination in destinations
+                        if (destination - origin) & 7 != 0
+                    ]
+                else:
+                    piece.possible_moves = destinations
+                    piece.capture_moves = []
 
     def move_piece(
         self,
         attacking_player: Player,
         attacking_player_piece: Piece,
         defending_player: Player,
-        origin_square: str,
-        destination_square: str,
+        origin_square: int,
+        destination_square: int,
     ):
-        if (
-            destination_square in attacking_player_piece.possible_moves
-            or destination_square in attacking_player_piece.capture_moves
-        ):
-            self.move_piece_to_square(
-                attacking_player_piece,
-                origin_square,
-                destination_square,
-                attacking_player,
-                defending_player,
-            )
-        else:
-            raise ImpossibleMoveException(origin_square, destination_square)
-
-    def _get_origin_square_player_piece(
-        self, player: Player, origin_algebraic: str
-    ) -> Piece | None:
-        row_index, column_index = algebraic_to_indexes(origin_algebraic)
-        origin_square = self.board.squares[row_index][column_index]
-        if origin_square:
-            if origin_square.is_white == player.is_white:
-                return origin_square
-        return None
+        self.move_piece_to_square(
+            attacking_player_piece,
+            origin_square,
+            destination_square,
+            attacking_player,
+            defending_player,
+        )
+
+    def _get_origin_square_player_piece(self, player: Player, origin: int) -> Piece | None:
+        return player.get_piece(origin)
 
     def move_piece_to_square(
         self,
         attacking_player_piece: Piece,
-        origin_square: str,
-        destination_square: str,
+        origin_square: int,
+        destination_square: int,
         attacking_player: Player,
         defending_player: Player,
     ):
-        origin_row_index, origin_column_index = algebraic_to_indexes(origin_square)
-        dest_row_index, dest_column_index = algebraic_to_indexes(destination_square)
-        opponent_square = self.board.squares[dest_row_index][dest_column_index]
-
-        if opponent_square:
-            if not (
-                destination_square in attacking_player_piece.capture_moves
-                or destination_square in attacking_player_piece.possible_moves
-            ):
-                raise ImpossibleMoveException(origin_square, destination_square)
-            self._remove_piece_from_player(defending_player, opponent_square)
+        # Only legal moves are played, their flags come from the move generator.
+        move = self.get_legal_moves(attacking_player).get((origin_square, destination_square))
+        if move is None:
+            raise ImpossibleMoveException(
+                SQUARE_NAMES[origin_square], SQUARE_NAMES[destination_square]
+            )
+        flags = move_flags(move)
+        if flags & PROMOTION:
+            # Pawns are not promoted on the board, so the move is kept as the pawn move it is.
+            flags &= CAPTURE
+        origin_row_index, origin_column_index = origin_square >> 3, origin_square & 7
+        dest_row_index, dest_column_index = destination_square >> 3, destination_square & 7
+        attack_maps = self._get_attack_maps()
+        position = self.board.position
+        previous_occupied = position.occupied
+        self.hash_history.append(position.hash)
+        opponent_square = self.board.pieces[destination_square]
+        if flags == EN_PASSANT:
+            # The captured pawn stands next to the origin, on the column of the destination.
+            opponent_square = self.board.pieces[origin_row_index * 8 + dest_column_index]
+        is_pawn = isinstance(attacking_player_piece, Pawn)
+        is_capture = opponent_square is not None
+
+        if opponent_square is not None:
+            defending_player.remove_piece(opponent_square)
+            if flags == EN_PASSANT:
+                self.board.squares[opponent_square.row][opponent_square.column] = None
 
+        attacking_player_piece.has_moved = True
+        attacking_player.move_piece(attacking_player_piece, destination_square)
         self.board.squares[dest_row_index][dest_column_index] = attacking_player_piece
         attacking_player_piece.row = dest_row_index
         attacking_player_piece.column = dest_column_index
-        if isinstance(attacking_player_piece, Pawn):
-            if (
-                dest_column_index == origin_column_index
-                and abs(dest_row_index - origin_row_index) == 2
-            ):
-                en_passant_pawn_column = origin_column_index
-                en_passant_pawn_row = (
-                    origin_row_index - 1
-                    if attacking_player_piece.is_white
-                    else origin_row_index + 1
-                )
-                en_passant_pawn = EnPassantPawn(attacking_player_piece)
-                self.board.squares[en_passant_pawn_row][en_passant_pawn_column] = en_passant_pawn
-                attacking_player.own_pieces.append(en_passant_pawn)
+        position.set_en_passant(
+            (origin_square + destination_square) >> 1 if flags == DOUBLE_PAWN_PUSH else None
+        )
 
         self.board.squares[origin_row_index][origin_column_index] = None
-        self.update_all_player_moves(attacking_player)
-        self.update_all_player_moves(defending_player)
+        position.set_castling(
+            position.castling & CASTLING_MASKS[origin_square] & CASTLING_MASKS[destination_square]
+        )
+        position.advance_clocks(attacking_player.color, is_capture or is_pawn)
+        position.set_turn(defending_player.color)
+        # Every square whose content changed: origin, destination and an en passant victim.
+        attack_maps.update((previous_occupied ^ position.occupied) | 1 << destination_square)
+        self.move_history.append(encode_move(origin_square, destination_square, flags))
+        # Piece move lists are only refreshed by start_turn, legality comes from get_legal_moves.
+        if position.debug:
+            position.verify_hash()
 
     def _get_all_pieces(self) -> List[Piece]:
-        pieces: List[Piece] = []
-        for row in self.board.squares:
-            for square in row:
-                if isinstance(square, Piece):
-                    pieces.append(square)
-        return pieces
+        return self.board.get_pieces()
 
     def _get_square_from_algebraic(self, algebraic_square: str) -> Piece | None:
         row_index, column_index = algebraic_to_indexes(algebraic_square)
         return self.board.get_square_from_row_column(row_index, column_index)
 
-    def _remove_piece_from_player(self, player: Player, piece: Piece):
-        if isinstance(piece, EnPassantPawn):
-            original_pawn = piece.original_pawn
-            player.own_pieces.pop(player.own_pieces.index(original_pawn))
-            self.board.squares[original_pawn.row][original_pawn.column] = None
-        player.own_pieces.pop(player.own_pieces.index(piece))
-
     def _get_opposite_checking_pieces(
         self, attacking_player: Player, defending_player: Player
     ) -> List[Piece]:
-        king = [piece for piece in defending_player.own_pieces if isinstance(piece, King)][0]
-        king_row_index, king_column_index = king.row, king.column
-        king_algebraic_square = indexes_to_algebraic(king_row_index, king_column_index)
-        return [
-            piece
-            for piece in attacking_player.own_pieces
-            if king_algebraic_square in piece.possible_moves
-        ]
-
-    def _has_player_available_moves(self, player: Player) -> bool:
-        for piece in player.own_pieces:
-            available_moves = piece.capture_moves + piece.possible_moves
-            if available_moves:
-                return False
-        return True
-
-    def _remove_en_passant_pawn(self, player: Player):
-        en_passant_pawn: Piece | None = None
-        for piece in player.own_pieces:
-            en_passant_pawn = piece if isinstance(piece, EnPassantPawn) else None
-        if en_passant_pawn:
-            self.board.squares[en_passant_pawn.row][en_passant_pawn.column] = None
-            player.own_pieces.remove(en_passant_pawn)
+        king_square = defending_player.king_square
+        if king_square is None:
+            return []
+        checkers = self._get_attack_maps().attackers_of(king_square, attacking_player.color)
+        return [self.board.pieces[square] for square in iter_squares(checkers)]
@@ -0,0 +1,132 @@
+import argparse
+import asyncio
+import json
+import random
+import time
+from typing import Any, Dict, List, NamedTuple
+
+from .server import DEFAULT_HOST, DEFAULT_PORT
+
+
+class LoadReport(NamedTuple):
+    sessions: int
+    requests: int
+    errors: int
+    elapsed: float
+    requests_per_second: int
+    median_latency: float
+    p95_latency: float
+
+
+class GameClient:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.latencies: List[float] = []
+
+    @classmethod
+    async def connect(
+        cls, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, path: str | None = None
+    ) -> "GameClient":
+        if path is not None:
+            reader, writer = await asyncio.open_unix_connection(path)
+        else:
+            reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def request(self, command: str, **arguments: Any) -> Dict[str, Any]:
+        start = time.perf_counter()
+        self.writer.write(json.dumps({"command": command, **arguments}).encode() + b"\n")
+        await self.writer.drain()
+        response = json.loads(await self.reader.readline())
+        self.latencies.append(time.perf_counter() - start)
+        return response
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+async def play_random_game(
+    client: GameClient, plies: int, generator: random.Random, computer: str | None = None
+) -> int:
+    # Plays random legal moves for the human side and returns the number of failed requests.
+    errors = 0
+    response = await client.request("new", computer=computer)
+    game_id = response["game"]
+    for _ in range(plies):
+        if response.get("status", "ongoing") != "ongoing":
+            break
+        moves = await client.request("moves", game=game_id)
+        if not moves["moves"]:
+            break
+        response = await client.request("move", game=game_id, move=generator.choice(moves["moves"]))
+        errors += not response["ok"]
+    await client.request("close", game=game_id)
+    return errors
+
+
+async def run_load(
+    sessions: int,
+    plies: int,
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    path: str | None = None,
+    computer: str | None = None,
+    seed: int = 0,
+) -> LoadReport:
+    async def run_session(session_index: int) -> GameClient:
+        client = await GameClient.connect(host, port, path)
+        try:
+            client_errors.append(
+                await play_random_game(client, plies, random.Random(seed + session_index), computer)
+            )
+        finally:
+            await client.close()
+        return client
+
+    client_errors: List[int] = []
+    start = time.perf_counter()
+    clients = await asyncio.gather(*(run_session(index) for index in range(sessions)))
+    elapsed = time.perf_counter() - start
+    latencies = sorted(latency for client in clients for latency in client.latencies)
+    requests = len(latencies)
+    return LoadReport(
+        sessions,
+        requests,
+        sum(client_errors),
+        elapsed,
+        int(requests / elapsed) if elapsed > 0 else requests,
+        latencies[requests // 2] if latencies else 0.0,
+        latencies[min(requests - 1, requests * 95 // 100)] if latencies else 0.0,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play many concurrent games against the server")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix", default=None, help="Connect to a Unix socket path instead")
+    parser.add_argument("--sessions", type=int, default=100)
+    parser.add_argument("--plies", type=int, default=20, help="Moves sent per session")
+    parser.add_argument("--computer", choices=["white", "black"], help="Side played by the engine")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    report = asyncio.run(
+        run_load(
+            args.sessions, args.plies, args.host, args.port, args.unix, args.computer, args.seed
+        )
+    )
+    print(f"Sessions: {report.sessions}")
+    print(f"Requests: {report.requests} ({report.errors} errors)")
+    print(f"Time: {report.elapsed:.3f}s")
+    print(f"Requests per second: {report.requests_per_second}")
+    print(
+        f"Latency: {report.median_latency * 1000:.1f}ms median, "
+        f"{report.p95_latency * 1000:.1f}ms p95"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+from typing import List, Sequence, Set
+
+from .bitboard import BISHOP, BLACK, KING, KNIGHT, WHITE, piece_code
+
+# A material signature packs a 4-bit count per piece code, kings included, followed by
+# the counts of White bishops on light and dark squares and then Black ones. Adding or
+# removing a piece adds or subtracts its delta, so the signature is kept up to date in O(1).
+COUNT_BITS = 4
+BISHOP_COLOR_SHIFT = 12 * COUNT_BITS
+
+
+def is_light_square(square: int) -> bool:
+    return ((square >> 3) + (square & 7)) % 2 == 0
+
+
+def _piece_delta(code: int, square: int) -> int:
+    delta = 1 << (code * COUNT_BITS)
+    if code % 6 == BISHOP:
+        bishop_slot = (code // 6) * 2 + (0 if is_light_square(square) else 1)
+        delta += 1 << (BISHOP_COLOR_SHIFT + bishop_slot * COUNT_BITS)
+    return delta
+
+
+MATERIAL_DELTAS: List[List[int]] = [
+    [_piece_delta(code, square) for square in range(64)] for code in range(12)
+]
+
+
+def piece_count(signature: int, code: int) -> int:
+    return signature >> (code * COUNT_BITS) & 15
+
+
+def signature_of(
+    white_pieces: Sequence[int] = (),
+    black_pieces: Sequence[int] = (),
+    bishop_squares: Sequence[int] = (),
+) -> int:
+    # Signature of two kings plus the given piece kinds; bishops stand on bishop_squares.
+    signature = MATERIAL_DELTAS[piece_code(WHITE, KING)][0]
+    signature += MATERIAL_DELTAS[piece_code(BLACK, KING)][0]
+    bishop_squares = list(bishop_squares)
+    for color, kinds in ((WHITE, white_pieces), (BLACK, black_pieces)):
+        for kind in kinds:
+            square = bishop_squares.pop(0) if kind == BISHOP else 0
+            signature += MATERIAL_DELTAS[piece_code(color, kind)][square]
+    return signature
+
+
+def _dead_signatures() -> Set[int]:
+    # Positions where no sequence of legal moves can mate: a lone minor piece against a
+    # bare king, or any number of bishops, of both sides, all on squares of one color.
+    signatures = {
+        signature_of(),
+        signature_of([KNIGHT]),
+        signature_of(black_pieces=[KNIGHT]),
+    }
+    for square in (0, 1):
+        for white_bishops in range(11):
+            for black_bishops in range(11):
+                signatures.add(
+                    signature_of(
+                        [BISHOP] * white_bishops,
+                        [BISHOP] * black_bishops,
+                        [square] * (white_bishops + black_bishops),
+                    )
+                )
+    return signatures
+
+
+DEAD_POSITION_SIGNATURES = _dead_signatures()
+
+
+def is_dead_position(signature: int) -> bool:
+    return signature in DEAD_POSITION_SIGNATURES
@@ -0,0 +1,54 @@
+from typing import Tuple
+
+from .bitboard import KNIGHT
+from .utils import SQUARE_NAMES, algebraic_to_square
+
+# A move is packed in 16 bits: origin in bits 0-5, destination in bits 6-11 and
+# flags in bits 12-15. Promotion moves set the PROMOTION flag and store the
+# promoted piece kind, relative to KNIGHT, in the two lowest flag bits.
+QUIET = 0
+DOUBLE_PAWN_PUSH = 1
+CAPTURE = 4
+EN_PASSANT = 5
+PROMOTION = 8
+
+PROMOTION_CHARS = "nbrq"
+
+
+def encode_move(origin: int, destination: int, flags: int = QUIET) -> int:
+    return origin | destination << 6 | flags << 12
+
+
+def move_origin(move: int) -> int:
+    return move & 63
+
+
+def move_destination(move: int) -> int:
+    return (move >> 6) & 63
+
+
+def move_flags(move: int) -> int:
+    return move >> 12
+
+
+def is_capture(move: int) -> bool:
+    return bool(move_flags(move) & CAPTURE)
+
+
+def move_promotion(move: int) -> int | None:
+    flags = move_flags(move)
+    if flags & PROMOTION:
+        return KNIGHT + (flags & 3)
+    return None
+
+
+def move_to_algebraic(move: int) -> str:
+    text = SQUARE_NAMES[move_origin(move)] + SQUARE_NAMES[move_destination(move)]
+    promotion = move_promotion(move)
+    if promotion is not None:
+        text += PROMOTION_CHARS[promotion - KNIGHT]
+    return text
+
+
+def algebraic_to_squares(text: str) -> Tuple[int, int]:
+    return algebraic_to_square(text[0:2]), algebraic_to_square(text[2:4])
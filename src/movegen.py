@@ -0,0 +1,227 @@
+from typing import Dict, Iterator, List, Sequence
+
+from .attacks import (
+    BETWEEN,
+    BISHOP_RAYS,
+    KING_ATTACKS,
+    KNIGHT_ATTACKS,
+    PAWN_ATTACKS,
+    PAWN_PUSHES,
+    PAWN_START_ROWS,
+    ROOK_RAYS,
+    bishop_attacks,
+    queen_attacks,
+    rook_attacks,
+)
+from .bitboard import BISHOP, FULL, KNIGHT, PAWN, QUEEN, ROOK, iter_squares
+from .move import CAPTURE, DOUBLE_PAWN_PUSH, EN_PASSANT, encode_move
+from .position import Position
+
+CAPTURE_FLAG = CAPTURE << 12
+DOUBLE_PUSH_FLAG = DOUBLE_PAWN_PUSH << 12
+
+SLIDER_ATTACKS = {BISHOP: bishop_attacks, ROOK: rook_attacks, QUEEN: queen_attacks}
+
+# Move generation stages, combinable as bit flags.
+CAPTURE_STAGE = 1
+QUIET_STAGE = 2
+ALL_STAGES = CAPTURE_STAGE | QUIET_STAGE
+
+
+def find_pins(position: Position, color: int, king_square: int) -> Dict[int, int]:
+    pieces = position.pieces
+    opponent_base = (color ^ 1) * 6
+    queens = pieces[opponent_base + QUEEN]
+    snipers = (ROOK_RAYS[king_square] & (pieces[opponent_base + ROOK] | queens)) | (
+        BISHOP_RAYS[king_square] & (pieces[opponent_base + BISHOP] | queens)
+    )
+    occupied = position.occupied
+    own_pieces = position.colors[color]
+    pin_rays: Dict[int, int] = {}
+    for sniper in iter_squares(snipers):
+        between = BETWEEN[king_square][sniper]
+        blockers = between & occupied
+        if blockers and not blockers & (blockers - 1) and blockers & own_pieces:
+            pin_rays[blockers.bit_length() - 1] = between | (1 << sniper)
+    return pin_rays
+
+
+def _append_moves(moves: List[int], origin: int, targets: int, opponent_pieces: int):
+    captures = targets & opponent_pieces
+    while captures:
+        lowest_bit = captures & -captures
+        moves.append(origin | (lowest_bit.bit_length() - 1) << 6 | CAPTURE_FLAG)
+        captures ^= lowest_bit
+    quiets = targets ^ (targets & opponent_pieces)
+    while quiets:
+        lowest_bit = quiets & -quiets
+        moves.append(origin | (lowest_bit.bit_length() - 1) << 6)
+        quiets ^= lowest_bit
+
+
+def generate_legal_moves(
+    position: Position, color: int, stages: int = ALL_STAGES, origins: int = FULL
+) -> List[int]:
+    # Legal moves of the pieces of color standing on the origins bitboard.
+    moves: List[int] = []
+    pieces = position.pieces
+    base = color * 6
+    opponent = color ^ 1
+    occupied = position.occupied
+    opponent_pieces = position.colors[opponent]
+    empty = ~occupied & FULL
+    # Destinations allowed by the requested stages: opponent pieces and/or empty squares.
+    stage_targets = (opponent_pieces if stages & CAPTURE_STAGE else 0) | (
+        empty if stages & QUIET_STAGE else 0
+    )
+    check_mask = FULL
+    pin_rays: Dict[int, int] = {}
+
+    king_square = position.king_square(color)
+    if king_square is not None:
+        if origins >> king_square & 1:
+            occupied_without_king = occupied ^ (1 << king_square)
+            king_targets = 0
+            for destination in iter_squares(KING_ATTACKS[king_square] & stage_targets):
+                if not position.is_square_attacked(destination, opponent, occupied_without_king):
+                    king_targets |= 1 << destination
+            _append_moves(moves, king_square, king_targets, opponent_pieces)
+        checkers = position.attackers_to(king_square, opponent, occupied)
+        if checkers:
+            if checkers & (checkers - 1):
+                return moves
+            check_mask = checkers | BETWEEN[king_square][checkers.bit_length() - 1]
+        pin_rays = find_pins(position, color, king_square)
+
+    target_mask = stage_targets & check_mask
+    for origin in iter_squares(pieces[base + KNIGHT] & origins):
+        if origin not in pin_rays:
+            _append_moves(moves, origin, KNIGHT_ATTACKS[origin] & target_mask, opponent_pieces)
+
+    for kind, slider_attacks in SLIDER_ATTACKS.items():
+        for origin in iter_squares(pieces[base + kind] & origins):
+            targets = slider_attacks(origin, occupied) & target_mask
+            if origin in pin_rays:
+                targets &= pin_rays[origin]
+            _append_moves(moves, origin, targets, opponent_pieces)
+
+    en_passant = position.en_passant_target(color) if stages & CAPTURE_STAGE else 0
+    if not stages & QUIET_STAGE:
+        empty = 0
+    pushes_table = PAWN_PUSHES[color]
+    attacks_table = PAWN_ATTACKS[color]
+    start_row = PAWN_START_ROWS[color]
+    for origin in iter_squares(pieces[base + PAWN] & origins):
+        pin_ray = pin_rays.get(origin, FULL)
+        captures = attacks_table[origin] & stage_targets & opponent_pieces & check_mask & pin_ray
+        _append_moves(moves, origin, captures, captures)
+        push = pushes_table[origin] & empty
+        if push:
+            if push & check_mask & pin_ray:
+                moves.append(origin | (push.bit_length() - 1) << 6)
+            if origin >> 3 == start_row:
+                double_push = pushes_table[push.bit_length() - 1] & empty & check_mask & pin_ray
+                if double_push:
+                    moves.append(origin | (double_push.bit_length() - 1) << 6 | DOUBLE_PUSH_FLAG)
+        if attacks_table[origin] & en_passant:
+            # En passant removes two pieces from the same row, so it is checked by playing it.
+            move = encode_move(origin, en_passant.bit_length() - 1, EN_PASSANT)
+            position.make_move(move)
+            if king_square is None or not position.is_square_attacked(king_square, opponent):
+                moves.append(move)
+            position.unmake_move()
+    return moves
+
+
+def iter_legal_moves(
+    position: Position, color: int, stages: Sequence[int] = (CAPTURE_STAGE, QUIET_STAGE)
+) -> Iterator[int]:
+    # Each stage is only generated once the moves of the previous ones have been consumed.
+    for stage in stages:
+        yield from generate_legal_moves(position, color, stage)
+
+
+def is_legal_move(position: Position, move: int) -> bool:
+    # Checks a move of the side to move, such as a transposition table move, by only
+    # generating the moves of its piece in its stage.
+    stage = CAPTURE_STAGE if move >> 12 & CAPTURE else QUIET_STAGE
+    return move in generate_legal_moves(position, position.turn, stage, 1 << (move & 63))
+
+
+def has_legal_move(position: Position, color: int) -> bool:
+    # Stops at the first legal move found. Out of check an unpinned piece with any target
+    # has a legal move, so the most mobile pieces are tried first and the king, whose moves
+    # each need an attack test, last; in check the king goes first as the usual escape.
+    pieces = position.pieces
+    base = color * 6
+    opponent = color ^ 1
+    occupied = position.occupied
+    own_pieces = position.colors[color]
+    opponent_pieces = position.colors[opponent]
+    not_own = ~own_pieces & FULL
+    check_mask = FULL
+    pin_rays: Dict[int, int] = {}
+
+    king_square = position.king_square(color)
+    king_targets = 0
+    if king_square is not None:
+        king_targets = KING_ATTACKS[king_square] & not_own
+        checkers = position.attackers_to(king_square, opponent, occupied)
+        if checkers:
+            if _has_king_move(position, king_square, king_targets, opponent):
+                return True
+            if checkers & (checkers - 1):
+                return False
+            king_targets = 0
+            check_mask = checkers | BETWEEN[king_square][checkers.bit_length() - 1]
+        pin_rays = find_pins(position, color, king_square)
+
+    target_mask = not_own & check_mask
+    for kind in (QUEEN, ROOK, BISHOP):
+        slider_attacks = SLIDER_ATTACKS[kind]
+        for origin in iter_squares(pieces[base + kind]):
+            if slider_attacks(origin, occupied) & target_mask & pin_rays.get(origin, FULL):
+                return True
+    for origin in iter_squares(pieces[base + KNIGHT]):
+        if origin not in pin_rays and KNIGHT_ATTACKS[origin] & target_mask:
+            return True
+
+    empty = ~occupied & FULL
+    pushes_table = PAWN_PUSHES[color]
+    attacks_table = PAWN_ATTACKS[color]
+    start_row = PAWN_START_ROWS[color]
+    pawns = pieces[base + PAWN]
+    for origin in iter_squares(pawns):
+        pin_ray = pin_rays.get(origin, FULL)
+        if attacks_table[origin] & opponent_pieces & check_mask & pin_ray:
+            return True
+        push = pushes_table[origin] & empty
+        if push & check_mask & pin_ray:
+            return True
+        if push and origin >> 3 == start_row:
+            if pushes_table[push.bit_length() - 1] & empty & check_mask & pin_ray:
+                return True
+
+    if king_targets and _has_king_move(position, king_square, king_targets, opponent):
+        return True
+    en_passant = position.en_passant_target(color)
+    if en_passant:
+        for origin in iter_squares(pawns):
+            if attacks_table[origin] & en_passant:
+                move = encode_move(origin, en_passant.bit_length() - 1, EN_PASSANT)
+                position.make_move(move)
+                is_legal = king_square is None or not position.is_square_attacked(
+                    king_square, opponent
+                )
+                position.unmake_move()
+                if is_legal:
+                    return True
+    return False
+
+
+def _has_king_move(position: Position, king_square: int, targets: int, opponent: int) -> bool:
+    occupied_without_king = position.occupied ^ (1 << king_square)
+    for destination in iter_squares(targets):
+        if not position.is_square_attacked(destination, opponent, occupied_without_king):
+            return True
+    return False
@@ -0,0 +1,164 @@
+import argparse
+import multiprocessing
+import os
+import time
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, List, NamedTuple, Sequence, Tuple
+
+from .fen import parse_fen
+from .move import move_to_algebraic
+from .movegen import generate_legal_moves
+from .perft import START_FEN, nodes_per_second
+from .position import Position
+from .search import INFINITY, MATE_SCORE, Search
+from .transposition import TranspositionTable, table_bytes
+
+DEFAULT_PARALLEL_DEPTH = 3
+# A small table per worker when no shared table is requested, so a worker keeps its
+# transpositions between the root moves it is handed.
+WORKER_TABLE_SIZE_MB = 4
+
+
+class WorkerStats(NamedTuple):
+    worker: int
+    moves: int
+    nodes: int
+    elapsed: float
+    nodes_per_second: int
+
+
+class ParallelSearchResult(NamedTuple):
+    best_move: int
+    score: int
+    move_scores: Dict[int, int]
+    depth: int
+    nodes: int
+    elapsed: float
+    nodes_per_second: int
+    workers: List[WorkerStats]
+
+
+# move, score, nodes, elapsed, worker pid
+RootMoveResult = Tuple[int, int, int, float, int]
+
+_worker_table: TranspositionTable | None = None
+_worker_memory: SharedMemory | None = None
+
+
+def _init_worker(shared_memory_name: str | None, table_size_mb: float):
+    global _worker_table, _worker_memory
+    if shared_memory_name is None:
+        _worker_table = TranspositionTable(table_size_mb)
+        return
+    _worker_memory = SharedMemory(name=shared_memory_name)
+    _worker_table = TranspositionTable(table_size_mb, buffer=_worker_memory.buf)
+
+
+def _search_root_move(task: Tuple[Position, int, int, Sequence[int]]) -> RootMoveResult:
+    position, move, depth, previous_hashes = task
+    start = time.perf_counter()
+    search = Search(position, _worker_table, previous_hashes)
+    score = search.score_root_move(move, depth)
+    return move, score, search.nodes, time.perf_counter() - start, os.getpid()
+
+
+def parallel_search(
+    position: Position,
+    depth: int = DEFAULT_PARALLEL_DEPTH,
+    workers: int | None = None,
+    shared_table_mb: float | None = None,
+    previous_hashes: Sequence[int] = (),
+) -> ParallelSearchResult:
+    # Splits the root moves across a pool of processes. Each root move is searched at a
+    # fixed depth with a full window, so the scores match a serial minimax of the same
+    # depth; the optional shared table lets workers reuse each other's transpositions.
+    if depth < 1:
+        raise ValueError("Parallel search needs a depth of at least 1")
+    workers = workers or os.cpu_count() or 1
+    start = time.perf_counter()
+    root_moves = generate_legal_moves(position, position.turn)
+    if not root_moves:
+        king_square = position.king_square(position.turn)
+        in_check = king_square is not None and position.is_square_attacked(
+            king_square, position.turn ^ 1
+        )
+        score = -MATE_SCORE if in_check else 0
+        return ParallelSearchResult(0, score, {}, depth, 0, 0.0, 0, [])
+
+    shared_memory = None
+    if shared_table_mb:
+        shared_memory = SharedMemory(create=True, size=table_bytes(shared_table_mb))
+    try:
+        with multiprocessing.Pool(
+            processes=min(workers, len(root_moves)),
+            initializer=_init_worker,
+            initargs=(
+                shared_memory.name if shared_memory else None,
+                shared_table_mb or WORKER_TABLE_SIZE_MB,
+            ),
+        ) as pool:
+            tasks = [(position, move, depth, previous_hashes) for move in root_moves]
+            results = list(pool.imap_unordered(_search_root_move, tasks))
+    finally:
+        if shared_memory is not None:
+            shared_memory.close()
+            shared_memory.unlink()
+    elapsed = time.perf_counter() - start
+
+    move_scores: Dict[int, int] = {}
+    worker_totals: Dict[int, List] = {}
+    for move, score, nodes, move_elapsed, pid in results:
+        move_scores[move] = score
+        totals = worker_totals.setdefault(pid, [0, 0, 0.0])
+        totals[0] += 1
+        totals[1] += nodes
+        totals[2] += move_elapsed
+    worker_stats = [
+        WorkerStats(pid, moves, nodes, busy, nodes_per_second(nodes, busy))
+        for pid, (moves, nodes, busy) in sorted(worker_totals.items())
+    ]
+
+    best_move = 0
+    best_score = -INFINITY
+    # Ties are broken by the move generation order to keep the result deterministic.
+    for move in root_moves:
+        if move_scores[move] > best_score:
+            best_move = move
+            best_score = move_scores[move]
+    total_nodes = sum(stats.nodes for stats in worker_stats)
+    return ParallelSearchResult(
+        best_move,
+        best_score,
+        move_scores,
+        depth,
+        total_nodes,
+        elapsed,
+        nodes_per_second(total_nodes, elapsed),
+        worker_stats,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Search a position across several processes")
+    parser.add_argument("--fen", default=START_FEN)
+    parser.add_argument("--depth", type=int, default=DEFAULT_PARALLEL_DEPTH)
+    parser.add_argument("--workers", type=int, default=None, help="Defaults to the CPU count")
+    parser.add_argument(
+        "--shared-table", type=float, default=None, help="Size in MB of a table shared by workers"
+    )
+    args = parser.parse_args()
+
+    result = parallel_search(parse_fen(args.fen), args.depth, args.workers, args.shared_table)
+    for stats in result.workers:
+        print(
+            f"Worker {stats.worker}: {stats.moves} moves, {stats.nodes} nodes, "
+            f"{stats.nodes_per_second} nps"
+        )
+    print(f"Best move: {move_to_algebraic(result.best_move)} ({result.score})")
+    print(f"Nodes: {result.nodes}")
+    print(f"Time: {result.elapsed:.3f}s")
+    print(f"Nodes per second: {result.nodes_per_second}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,8 @@
 from typing import Tuple
 
+from .utils import algebraic_to_square
 
-def parse_command(command: str) -> Tuple[str, str]:
+
+def parse_command(command: str) -> Tuple[int, int]:
     origin_square, destination_square = command.split(" ")
-    return origin_square, destination_square
+    return algebraic_to_square(origin_square), algebraic_to_square(destination_square)
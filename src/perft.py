@@ -0,0 +1,97 @@
+import argparse
+import time
+from typing import Dict, List, Tuple
+
+from .fen import parse_fen
+from .move import move_to_algebraic
+from .movegen import generate_legal_moves
+from .position import Position
+
+START_FEN = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+
+# Reference node counts. Only positions and depths whose trees contain no
+# castling or promotion are bundled, as the game does not play those moves yet.
+PERFT_SUITE: List[Tuple[str, str, Dict[int, int]]] = [
+    ("start", START_FEN, {1: 20, 2: 400, 3: 8902, 4: 197281, 5: 4865609}),
+    (
+        "endgame",
+        "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+        {1: 14, 2: 191, 3: 2812, 4: 43238, 5: 674624},
+    ),
+    ("mate and stalemate", "8/8/2k5/5q2/5n2/8/5K2/8 b - - 0 1", {4: 23527}),
+]
+
+
+def perft(position: Position, depth: int) -> int:
+    moves = generate_legal_moves(position, position.turn)
+    if depth <= 1:
+        return len(moves) if depth == 1 else 1
+    nodes = 0
+    for move in moves:
+        position.make_move(move)
+        nodes += perft(position, depth - 1)
+        position.unmake_move()
+    return nodes
+
+
+def divide(position: Position, depth: int) -> Dict[str, int]:
+    results: Dict[str, int] = {}
+    for move in generate_legal_moves(position, position.turn):
+        position.make_move(move)
+        results[move_to_algebraic(move)] = perft(position, depth - 1)
+        position.unmake_move()
+    return results
+
+
+def timed_perft(position: Position, depth: int) -> Tuple[int, float]:
+    start = time.perf_counter()
+    nodes = perft(position, depth)
+    return nodes, time.perf_counter() - start
+
+
+def run_suite(max_depth: int) -> bool:
+    passed = True
+    for name, fen, expected_nodes in PERFT_SUITE:
+        position = parse_fen(fen)
+        for depth, expected in expected_nodes.items():
+            if depth > max_depth:
+                continue
+            nodes, elapsed = timed_perft(position, depth)
+            status = "ok" if nodes == expected else f"FAILED (expected {expected})"
+            speed = nodes_per_second(nodes, elapsed)
+            print(f"{name} depth {depth}: {nodes} nodes, {speed} nps {status}")
+            passed = passed and nodes == expected
+    return passed
+
+
+def nodes_per_second(nodes: int, elapsed: float) -> int:
+    return int(nodes / elapsed) if elapsed > 0 else nodes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Count move generation leaf nodes")
+    parser.add_argument("--fen", default=START_FEN)
+    parser.add_argument("--depth", type=int, default=4)
+    parser.add_argument("--divide", action="store_true", help="Show node counts per root move")
+    parser.add_argument("--suite", action="store_true", help="Check the bundled positions")
+    args = parser.parse_args()
+
+    if args.suite:
+        raise SystemExit(0 if run_suite(args.depth) else 1)
+    position = parse_fen(args.fen)
+    start = time.perf_counter()
+    if args.divide:
+        results = divide(position, args.depth)
+        for move, nodes in sorted(results.items()):
+            print(f"{move}: {nodes}")
+        total_nodes = sum(results.values())
+    else:
+        total_nodes = perft(position, args.depth)
+    elapsed = time.perf_counter() - start
+    print(f"Nodes: {total_nodes}")
+    print(f"Time: {elapsed:.3f}s")
+    print(f"Nodes per second: {nodes_per_second(total_nodes, elapsed)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+import mmap
+import re
+from typing import Dict, Iterator, List, NamedTuple, Tuple
+
+from .bitboard import BISHOP, KING, KNIGHT, PAWN, QUEEN, ROOK
+from .exceptions import InvalidSanException
+from .fen import parse_fen
+from .move import move_destination, move_origin, move_promotion
+from .movegen import generate_legal_moves
+from .perft import START_FEN
+from .position import Position
+from .utils import algebraic_to_square
+
+SAN_PIECES = {"N": KNIGHT, "B": BISHOP, "R": ROOK, "Q": QUEEN, "K": KING}
+RESULTS = (b"1-0", b"0-1", b"1/2-1/2", b"*")
+
+# One token per match: a header tag, a comment, a variation bracket, a move number,
+# a numeric annotation glyph or a movetext word (SAN move or game result).
+TOKEN_PATTERN = re.compile(
+    rb'\[\s*([A-Za-z0-9_]+)\s+"((?:[^"\\]|\\.)*)"\s*\]'
+    rb"|\{[^}]*\}"
+    rb"|;[^\n]*"
+    rb"|([()])"
+    rb"|\d+\.+"
+    rb"|\$\d+"
+    rb"|([^\s\[\]{}();.]+)"
+)
+SAN_PATTERN = re.compile(r"^([NBRQK])?([a-h])?([1-8])?x?([a-h][1-8])(?:=?([NBRQ]))?[+#]?[!?]*$")
+
+
+class PgnGame(NamedTuple):
+    headers: Dict[str, str]
+    moves: List[str]
+    result: str
+    offset: int
+
+
+def _find_game_start(data, offset: int) -> int:
+    # Skips blank lines and stray text so offsets always point at a tag or movetext.
+    match = TOKEN_PATTERN.search(data, offset)
+    return match.start() if match else len(data)
+
+
+def read_game(data, offset: int) -> Tuple[PgnGame | None, int]:
+    # Parses the game starting at offset and returns it with the offset of the next one.
+    # Only tag pairs and mainline moves are decoded; comments and variations are skipped
+    # in place on the buffer.
+    headers: Dict[str, str] = {}
+    moves: List[str] = []
+    variation_depth = 0
+    start = _find_game_start(data, offset)
+    for match in TOKEN_PATTERN.finditer(data, start):
+        tag, word, bracket = match.group(1), match.group(4), match.group(3)
+        if tag is not None:
+            if moves:
+                # A new tag section without a result closes the previous game.
+                return PgnGame(headers, moves, "*", start), match.start()
+            headers[tag.decode()] = match.group(2).decode().replace('\\"', '"')
+        elif bracket is not None:
+            variation_depth += 1 if bracket == b"(" else -1
+        elif word is not None and not variation_depth:
+            if word in RESULTS:
+                return PgnGame(headers, moves, word.decode(), start), match.end()
+            moves.append(word.decode())
+    if headers or moves:
+        return PgnGame(headers, moves, "*", start), len(data)
+    return None, len(data)
+
+
+class PgnReader:
+    def __init__(self, path: str):
+        self.file = open(path, "rb")
+        try:
+            self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped.
+            self.data = b""
+        self.offsets: List[int] = []
+        self.indexed_until = 0
+        self.is_fully_indexed = False
+
+    def __enter__(self) -> "PgnReader":
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def __iter__(self) -> Iterator[PgnGame]:
+        return self.iter_games()
+
+    def close(self):
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+        self.file.close()
+
+    def _record_offset(self, number: int, offset: int):
+        if number == len(self.offsets):
+            self.offsets.append(offset)
+
+    def iter_games(self, start: int = 0) -> Iterator[PgnGame]:
+        # Yields games lazily from game number start, extending the offset index while
+        # reading past the part of the file indexed so far.
+        number = start
+        if start < len(self.offsets):
+            offset = self.offsets[start]
+        else:
+            self._index_until(start)
+            if start >= len(self.offsets):
+                return
+            offset = self.offsets[start]
+        while True:
+            game, next_offset = read_game(self.data, offset)
+            if game is None:
+                self.is_fully_indexed = True
+                return
+            self._record_offset(number, game.offset)
+            self.indexed_until = max(self.indexed_until, next_offset)
+            yield game
+            number += 1
+            offset = next_offset
+
+    def _index_until(self, number: int):
+        while not self.is_fully_indexed and len(self.offsets) <= number:
+            game, next_offset = read_game(self.data, self.indexed_until)
+            if game is None:
+                self.is_fully_indexed = True
+                return
+            self.offsets.append(game.offset)
+            self.indexed_until = next_offset
+
+    def build_index(self) -> List[int]:
+        self._index_until(len(self.data))
+        return self.offsets
+
+    def game(self, number: int) -> PgnGame:
+        for game in self.iter_games(number):
+            return game
+        raise IndexError(f"The file has no game {number}")
+
+    def __len__(self) -> int:
+        return len(self.build_index())
+
+
+def iter_pgn_games(path: str) -> Iterator[PgnGame]:
+    with PgnReader(path) as reader:
+        yield from reader
+
+
+def san_to_move(position: Position, san: str) -> int:
+    if san.startswith("O-O") or san.startswith("0-0"):
+        raise InvalidSanException(san, "castling is not supported")
+    match = SAN_PATTERN.match(san)
+    if match is None:
+        raise InvalidSanException(san, "not a SAN move")
+    piece, file, rank, destination, promotion = match.groups()
+    kind = SAN_PIECES[piece] if piece else PAWN
+    destination_square = algebraic_to_square(destination)
+    promotion_kind = SAN_PIECES[promotion] if promotion else None
+    candidates = []
+    for move in generate_legal_moves(position, position.turn):
+        origin = move_origin(move)
+        if move_destination(move) != destination_square or position.mailbox[origin] % 6 != kind:
+            continue
+        if file is not None and origin & 7 != "abcdefgh".index(file):
+            continue
+        if rank is not None and 8 - (origin >> 3) != int(rank):
+            continue
+        if move_promotion(move) != promotion_kind:
+            continue
+        candidates.append(move)
+    if len(candidates) != 1:
+        reason = "no legal move matches" if not candidates else "the move is ambiguous"
+        raise InvalidSanException(san, reason)
+    return candidates[0]
+
+
+def iter_game_moves(game: PgnGame, position: Position | None = None) -> Iterator[int]:
+    # Plays the game on position (by default its FEN tag or the starting position) and
+    # yields each resolved packed move after it has been made.
+    if position is None:
+        position = parse_fen(game.headers.get("FEN", START_FEN))
+    for san in game.moves:
+        move = san_to_move(position, san)
+        position.make_move(move)
+        yield move
@@ -1,9 +1,23 @@
 from __future__ import annotations
 
-from typing import List, Tuple
-
+from typing import TYPE_CHECKING, List, Tuple
+
+from .attacks import (
+    KING_ATTACKS,
+    KNIGHT_ATTACKS,
+    PAWN_ATTACKS,
+    PAWN_PUSHES,
+    PAWN_START_ROWS,
+    bishop_attacks,
+    queen_attacks,
+    rook_attacks,
+)
+from .bitboard import BISHOP, BLACK, KING, KNIGHT, PAWN, QUEEN, ROOK, WHITE, iter_squares
 from .utils import indexes_to_algebraic
 
+if TYPE_CHECKING:
+    from .board import BoardSquares
+
 WHITE_KING = "♔"
 WHITE_QUEEN = "♕"
 WHITE_ROOK = "♖"
@@ -20,172 +34,159 @@ BLACK_PAWN = "♟"
 
 
 class Piece:
+    __slots__ = (
+        "char",
+        "is_white",
+        "row",
+        "column",
+        "has_moved",
+        "possible_moves",
+        "capture_moves",
+    )
+    kind: int
+    # Shared by every instance of a class, as they only depend on the piece type.
+    _movement_vectors: Tuple[Tuple[int, int], ...] = ()
+
     def __init__(self, char: str, is_white: bool, row: int, column: int):
         self.char = char
         self.is_white = is_white
         self.row = row
         self.column = column
         self.has_moved: bool = False
-        self.possible_moves: List[str] = []
-        self.capture_moves: List[str] = []
-        self._movement_vectors: List[Tuple[int, int]]
+        self.possible_moves: List[int] = []
+        self.capture_moves: List[int] = []
 
     def __str__(self) -> str:
         return self.char
 
+    @property
+    def code(self) -> int:
+        return self.kind if self.is_white else self.kind + 6
+
+    @property
+    def color(self) -> int:
+        return WHITE if self.is_white else BLACK
+
     def __repr__(self) -> str:
         return f"Piece: {self.char}. Row: {self.row}. Column: {self.column}. Algebraic: {indexes_to_algebraic(self.row, self.column)}"
 
-    def _check_boundary(self, new_row_pos: int, new_column_pos: int) -> bool:
-        return 0 <= new_row_pos <= 7 and 0 <= new_column_pos <= 7
-
-    def _check_destination_is_origin(self, new_row_pos: int, new_column_pos: int) -> bool:
-        return new_row_pos == self.row and new_column_pos == self.column
-
-    def _is_destination_square_valid(
-        self, destination_row: int, destination_column: int, squares: List[List[Piece | None]]
-    ) -> bool:
-        destination_square = squares[destination_row][destination_column]
-        if isinstance(destination_square, Piece):
-            if destination_square.is_white != self.is_white and not isinstance(self, Pawn):
-                return True
-        else:
-            return True
-        return False
-
-    def _is_destination_capturable(
-        self, destination_row: int, destination_column: int, squares: List[List[Piece | None]]
-    ) -> bool:
-        destination_square = squares[destination_row][destination_column]
-        if isinstance(destination_square, Piece):
-            if destination_square.is_white != self.is_white:
-                return True
-        return False
-
-    def update_possible_moves(self, squares: List[List[Piece | None]], number_of_steps=7):
-        possible_moves: List[str] = []
-        for movement in self._movement_vectors:
-            candidate_row = self.row
-            candidate_column = self.column
-            for _ in range(number_of_steps):
-                candidate_row += movement[0]
-                candidate_column += movement[1]
-                if self._check_boundary(candidate_row, candidate_column):
-                    if self._is_destination_square_valid(candidate_row, candidate_column, squares):
-                        possible_moves.append(indexes_to_algebraic(candidate_row, candidate_column))
-                        if squares[candidate_row][candidate_column]:
-                            break
-                    else:
-                        break
-                else:
-                    break
-        self.possible_moves = possible_moves
+    def _get_attacks(self, square: int, occupied: int) -> int:
+        return 0
+
+    def update_possible_moves(self, squares: BoardSquares):
+        position = squares.position
+        targets = self._get_attacks(self.row * 8 + self.column, position.occupied)
+        targets &= ~position.colors[self.color]
+        self.possible_moves = list(iter_squares(targets))
 
 
 class Pawn(Piece):
+    __slots__ = ()
+    kind = PAWN
+    _MOVEMENT_VECTORS = (((-1, 0),), ((1, 0),))
+    _CAPTURE_VECTORS = (((-1, 1), (-1, -1)), ((1, -1), (1, 1)))
+
     def __init__(self, row: int, column: int, is_white: bool):
         char = WHITE_PAWN if is_white else BLACK_PAWN
         super().__init__(char=char, is_white=is_white, row=row, column=column)
-        self._movement_vectors = [(-1, 0)] if self.is_white else [(1, 0)]
-        self._capture_vectors = [(-1, 1), (-1, -1)] if self.is_white else [(1, -1), (1, 1)]
-
-    def update_possible_moves(self, squares: List[List[Piece | None]]):
-        squares_to_move = 1
-        if self.is_white and self.row == 6:
-            squares_to_move = 2
-        if not self.is_white and self.row == 1:
-            squares_to_move = 2
-        super().update_possible_moves(squares, number_of_steps=squares_to_move)
+
+    @property
+    def _movement_vectors(self) -> Tuple[Tuple[int, int], ...]:
+        return self._MOVEMENT_VECTORS[self.color]
+
+    @property
+    def _capture_vectors(self) -> Tuple[Tuple[int, int], ...]:
+        return self._CAPTURE_VECTORS[self.color]
+
+    def update_possible_moves(self, squares: BoardSquares):
+        position = squares.position
+        color = self.color
+        square = self.row * 8 + self.column
+        targets = PAWN_PUSHES[color][square] & ~position.occupied
+        if targets and self.row == PAWN_START_ROWS[color]:
+            targets |= PAWN_PUSHES[color][targets.bit_length() - 1] & ~position.occupied
+        self.possible_moves = list(iter_squares(targets))
         self._update_capturing_moves(squares)
 
-    def _update_capturing_moves(self, squares: List[List[Piece | None]]):
-        capture_moves: List[str] = []
-        for capture_move in self._capture_vectors:
-            candidate_row = self.row
-            candidate_column = self.column
-            candidate_row += capture_move[0]
-            candidate_column += capture_move[1]
-            if self._check_boundary(candidate_row, candidate_column):
-                if self._is_destination_capturable(candidate_row, candidate_column, squares):
-                    capture_moves.append((indexes_to_algebraic(candidate_row, candidate_column)))
-        self.capture_moves = capture_moves
-
-
-class EnPassantPawn(Piece):
-    def __init__(self, original_pawn: Pawn):
-        is_white = original_pawn.is_white
-        char = "·" if is_white else "·"
-        column = original_pawn.column
-        row = original_pawn.row + 1 if is_white else original_pawn.row - 1
-        super().__init__(char=char, is_white=is_white, row=row, column=column)
-        self._movement_vectors = []
-        self._capture_vectors = []
-        self.original_pawn = original_pawn
+    def _update_capturing_moves(self, squares: BoardSquares):
+        position = squares.position
+        color = self.color
+        targets = PAWN_ATTACKS[color][self.row * 8 + self.column] & (
+            position.colors[color ^ 1] | position.en_passant_target(color)
+        )
+        self.capture_moves = list(iter_squares(targets))
 
 
 class King(Piece):
+    __slots__ = ()
+    kind = KING
+    _movement_vectors = ((-1, -1), (-1, 1), (-1, 0), (1, -1), (1, 1), (1, 0), (0, -1), (0, 1))
+
     def __init__(self, row: int, column: int, is_white: bool):
         char = WHITE_KING if is_white else BLACK_KING
         super().__init__(char=char, is_white=is_white, row=row, column=column)
-        self._movement_vectors = [
-            (-1, -1),
-            (-1, 1),
-            (-1, 0),
-            (1, -1),
-            (1, 1),
-            (1, 0),
-            (0, -1),
-            (0, 1),
-        ]
 
-    def update_possible_moves(self, squares: List[List[Piece | None]]):
-        super().update_possible_moves(squares, number_of_steps=1)
+    def _get_attacks(self, square: int, occupied: int) -> int:
+        return KING_ATTACKS[square]
 
 
 class Queen(Piece):
+    __slots__ = ()
+    kind = QUEEN
+    _movement_vectors = ((-1, -1), (-1, 1), (-1, 0), (1, -1), (1, 1), (1, 0), (0, -1), (0, 1))
+
     def __init__(self, row: int, column: int, is_white: bool):
         char = WHITE_QUEEN if is_white else BLACK_QUEEN
         super().__init__(char=char, is_white=is_white, row=row, column=column)
-        self._movement_vectors = [
-            (-1, -1),
-            (-1, 1),
-            (-1, 0),
-            (1, -1),
-            (1, 1),
-            (1, 0),
-            (0, -1),
-            (0, 1),
-        ]
+
+    def _get_attacks(self, square: int, occupied: int) -> int:
+        return queen_attacks(square, occupied)
 
 
 class Rook(Piece):
+    __slots__ = ()
+    kind = ROOK
+    _movement_vectors = ((1, 0), (-1, 0), (0, 1), (0, -1))
+
     def __init__(self, row: int, column: int, is_white: bool):
         char = WHITE_ROOK if is_white else BLACK_ROOK
         super().__init__(char=char, is_white=is_white, row=row, column=column)
-        self._movement_vectors = [(1, 0), (-1, 0), (0, 1), (0, -1)]
+
+    def _get_attacks(self, square: int, occupied: int) -> int:
+        return rook_attacks(square, occupied)
 
 
 class Bishop(Piece):
+    __slots__ = ()
+    kind = BISHOP
+    _movement_vectors = ((1, 1), (-1, -1), (1, -1), (-1, 1))
+
     def __init__(self, row: int, column: int, is_white: bool):
         char = WHITE_BISHOP if is_white else BLACK_BISHOP
         super().__init__(char=char, is_white=is_white, row=row, column=column)
-        self._movement_vectors = [(1, 1), (-1, -1), (1, -1), (-1, 1)]
+
+    def _get_attacks(self, square: int, occupied: int) -> int:
+        return bishop_attacks(square, occupied)
 
 
 class Knight(Piece):
+    __slots__ = ()
+    kind = KNIGHT
+    _movement_vectors = ((2, -1), (2, 1), (-2, 1), (-2, -1), (1, 2), (-1, 2), (1, -2), (-1, -2))
+
     def __init__(self, row: int, column: int, is_white: bool):
         char = WHITE_KNIGHT if is_white else BLACK_KNIGHT
         super().__init__(char=char, is_white=is_white, row=row, column=column)
-        self._movement_vectors = [
-            (2, -1),
-            (2, 1),
-            (-2, 1),
-            (-2, -1),
-            (1, 2),
-            (-1, 2),
-            (1, -2),
-            (-1, -2),
-        ]
-
-    def update_possible_moves(self, squares: List[List[Piece | None]]):
-        super().update_possible_moves(squares, number_of_steps=1)
+
+    def _get_attacks(self, square: int, occupied: int) -> int:
+        return KNIGHT_ATTACKS[square]
+
+
+# Piece classes indexed by piece kind.
+PIECE_TYPES = [Pawn, Knight, Bishop, Rook, Queen, King]
+
+# One shared instance per piece code, plus None for NO_PIECE, handed out by flyweight boards.
+# They carry no square, so their row and column are meaningless.
+FLYWEIGHT_PIECES: List[Piece | None] = [
+    PIECE_TYPES[code % 6](0, 0, code < 6) for code in range(12)
+] + [None]
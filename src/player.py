@@ -1,21 +1,88 @@
-from typing import List
+from typing import Dict, Iterable, List, Type, ValuesView
 
-from .pieces import Piece
+from .bitboard import BLACK, WHITE
+from .pieces import King, Piece
 
 
 class Player:
-    def __init__(self, is_white: bool, all_pieces: List[Piece]):
+    def __init__(self, is_white: bool, all_pieces: List[Piece], is_computer: bool = False):
         self.is_white = is_white
+        self.color = WHITE if self.is_white else BLACK
         self.name = "White" if self.is_white else "Black"
+        self.is_computer = is_computer
+        self.pieces_by_square: Dict[int, Piece] = {}
+        self.pieces_by_type: Dict[Type[Piece], Dict[int, Piece]] = {}
+        self.king_square: int | None = None
         self.own_pieces = self._get_own_pieces(all_pieces)
 
+    @classmethod
+    def from_indexes(
+        cls,
+        is_white: bool,
+        pieces_by_square: Dict[int, Piece],
+        pieces_by_type: Dict[Type[Piece], Dict[int, Piece]],
+        king_square: int | None,
+        is_computer: bool = False,
+    ) -> "Player":
+        # Takes over indexes already built, e.g. while parsing a FEN.
+        player = cls(is_white, [], is_computer)
+        player.pieces_by_square = pieces_by_square
+        player.pieces_by_type = pieces_by_type
+        player.king_square = king_square
+        return player
+
+    # A read-only view of the square index, pieces are changed through the methods below.
+    @property
+    def own_pieces(self) -> ValuesView[Piece]:
+        return self.pieces_by_square.values()
+
+    @own_pieces.setter
+    def own_pieces(self, pieces: Iterable[Piece]):
+        self.pieces_by_square = {}
+        self.pieces_by_type = {}
+        self.king_square = None
+        for piece in pieces:
+            self.add_piece(piece)
+
     def _get_own_pieces(self, pieces: List[Piece]) -> List[Piece]:
         return [piece for piece in pieces if piece.is_white == self.is_white]
 
+    # The indexes are keyed by square, so pieces have to be added, removed and moved through
+    # these methods, moves before the piece row and column change.
+    def add_piece(self, piece: Piece):
+        square = piece.row * 8 + piece.column
+        self.pieces_by_square[square] = piece
+        self.pieces_by_type.setdefault(type(piece), {})[square] = piece
+        if isinstance(piece, King):
+            self.king_square = square
+
+    def remove_piece(self, piece: Piece):
+        square = piece.row * 8 + piece.column
+        del self.pieces_by_square[square]
+        del self.pieces_by_type[type(piece)][square]
+        if isinstance(piece, King):
+            self.king_square = None
+
+    def move_piece(self, piece: Piece, destination: int):
+        origin = piece.row * 8 + piece.column
+        del self.pieces_by_square[origin]
+        self.pieces_by_square[destination] = piece
+        pieces_of_type = self.pieces_by_type[type(piece)]
+        del pieces_of_type[origin]
+        pieces_of_type[destination] = piece
+        if isinstance(piece, King):
+            self.king_square = destination
+
+    def get_piece(self, square: int) -> Piece | None:
+        return self.pieces_by_square.get(square)
+
+    def get_pieces(self, piece_type: Type[Piece]) -> List[Piece]:
+        return list(self.pieces_by_type.get(piece_type, {}).values())
+
     def get_all_available_moves(self):
-        available_moves: List[str] = []
+        available_moves: List[int] = []
         for piece in self.own_pieces:
-            available_moves += (piece.capture_moves + piece.possible_moves)
+            available_moves += piece.capture_moves + piece.possible_moves
         return available_moves
 
     """ def update_own_pieces(self):
@@ -0,0 +1,299 @@
+from typing import List, Tuple
+
+from .attacks import (
+    KING_ATTACKS,
+    KNIGHT_ATTACKS,
+    PAWN_ATTACKS,
+    bishop_attacks,
+    rook_attacks,
+)
+from .bitboard import (
+    BISHOP,
+    KING,
+    KNIGHT,
+    NO_PIECE,
+    PAWN,
+    QUEEN,
+    ROOK,
+    WHITE,
+    bit,
+    code_color,
+    iter_squares,
+)
+from .exceptions import HashMismatchException
+from .material import MATERIAL_DELTAS
+from .move import DOUBLE_PAWN_PUSH, EN_PASSANT, PROMOTION
+from .zobrist import CASTLING_KEYS, EN_PASSANT_KEYS, PIECE_KEYS, SIDE_KEY, compute_hash
+
+EN_PASSANT_ROWS = (2, 5)
+
+WHITE_KINGSIDE = 1
+WHITE_QUEENSIDE = 2
+BLACK_KINGSIDE = 4
+BLACK_QUEENSIDE = 8
+ALL_CASTLING = 15
+
+# Castling rights kept after a move touches each square.
+CASTLING_MASKS = [ALL_CASTLING] * 64
+CASTLING_MASKS[0] = ALL_CASTLING & ~BLACK_QUEENSIDE
+CASTLING_MASKS[4] = ALL_CASTLING & ~(BLACK_KINGSIDE | BLACK_QUEENSIDE)
+CASTLING_MASKS[7] = ALL_CASTLING & ~BLACK_KINGSIDE
+CASTLING_MASKS[56] = ALL_CASTLING & ~WHITE_QUEENSIDE
+CASTLING_MASKS[60] = ALL_CASTLING & ~(WHITE_KINGSIDE | WHITE_QUEENSIDE)
+CASTLING_MASKS[63] = ALL_CASTLING & ~WHITE_KINGSIDE
+
+# move, moving code, captured code, en passant, moved, castling, hash, turn, halfmove clock
+UndoRecord = Tuple[int, int, int, int | None, int, int, int, int, int]
+
+
+class Position:
+    def __init__(self):
+        self.pieces: List[int] = [0] * 12
+        self.colors: List[int] = [0, 0]
+        self.occupied: int = 0
+        self.mailbox = bytearray([NO_PIECE]) * 64
+        self.en_passant: int | None = None
+        self.moved: int = 0
+        self.castling: int = 0
+        self.turn: int = WHITE
+        self.hash: int = 0
+        self.material: int = 0
+        self.halfmove_clock: int = 0
+        self.fullmove_number: int = 1
+        self.history: List[UndoRecord] = []
+        self.debug: bool = False
+
+    def clear(self):
+        self.pieces = [0] * 12
+        self.colors = [0, 0]
+        self.occupied = 0
+        self.mailbox = bytearray([NO_PIECE]) * 64
+        self.en_passant = None
+        self.moved = 0
+        self.castling = 0
+        self.turn = WHITE
+        self.hash = 0
+        self.material = 0
+        self.halfmove_clock = 0
+        self.fullmove_number = 1
+        self.history = []
+
+    def compute_hash(self) -> int:
+        return compute_hash(self.pieces, self.turn, self.castling, self.en_passant)
+
+    def verify_hash(self):
+        computed_hash = self.compute_hash()
+        if computed_hash != self.hash:
+            raise HashMismatchException(self.hash, computed_hash)
+
+    def compute_material(self) -> int:
+        material = 0
+        for square in iter_squares(self.occupied):
+            material += MATERIAL_DELTAS[self.mailbox[square]][square]
+        return material
+
+    def set_turn(self, color: int):
+        if color != self.turn:
+            self.hash ^= SIDE_KEY
+            self.turn = color
+
+    def set_en_passant(self, square: int | None):
+        if self.en_passant is not None:
+            self.hash ^= EN_PASSANT_KEYS[self.en_passant & 7]
+        if square is not None:
+            self.hash ^= EN_PASSANT_KEYS[square & 7]
+        self.en_passant = square
+
+    def set_castling(self, castling: int):
+        self.hash ^= CASTLING_KEYS[self.castling] ^ CASTLING_KEYS[castling]
+        self.castling = castling
+
+    def advance_clocks(self, color: int, is_pawn_move_or_capture: bool):
+        self.halfmove_clock = 0 if is_pawn_move_or_capture else self.halfmove_clock + 1
+        if color != WHITE:
+            self.fullmove_number += 1
+
+    def piece_at(self, square: int) -> int:
+        return self.mailbox[square]
+
+    def king_square(self, color: int) -> int | None:
+        king = self.pieces[color * 6 + KING]
+        if not king:
+            return None
+        return (king & -king).bit_length() - 1
+
+    def en_passant_target(self, color: int) -> int:
+        if self.en_passant is None or self.en_passant >> 3 != EN_PASSANT_ROWS[color]:
+            return 0
+        return bit(self.en_passant)
+
+    def attackers_to(self, square: int, by_color: int, occupied: int) -> int:
+        pieces = self.pieces
+        base = by_color * 6
+        queens = pieces[base + QUEEN]
+        return (
+            (KNIGHT_ATTACKS[square] & pieces[base + KNIGHT])
+            | (PAWN_ATTACKS[by_color ^ 1][square] & pieces[base + PAWN])
+            | (KING_ATTACKS[square] & pieces[base + KING])
+            | (rook_attacks(square, occupied) & (pieces[base + ROOK] | queens))
+            | (bishop_attacks(square, occupied) & (pieces[base + BISHOP] | queens))
+        )
+
+    def is_square_attacked(self, square: int, by_color: int, occupied: int | None = None) -> bool:
+        if occupied is None:
+            occupied = self.occupied
+        pieces = self.pieces
+        base = by_color * 6
+        if KNIGHT_ATTACKS[square] & pieces[base + KNIGHT]:
+            return True
+        if PAWN_ATTACKS[by_color ^ 1][square] & pieces[base + PAWN]:
+            return True
+        if KING_ATTACKS[square] & pieces[base + KING]:
+            return True
+        queens = pieces[base + QUEEN]
+        if rook_attacks(square, occupied) & (pieces[base + ROOK] | queens):
+            return True
+        return bool(bishop_attacks(square, occupied) & (pieces[base + BISHOP] | queens))
+
+    def put_piece(self, square: int, code: int):
+        if self.mailbox[square] != NO_PIECE:
+            self.remove_piece(square)
+        square_bit = bit(square)
+        self.pieces[code] |= square_bit
+        self.colors[code_color(code)] |= square_bit
+        self.occupied |= square_bit
+        self.mailbox[square] = code
+        self.hash ^= PIECE_KEYS[code][square]
+        self.material += MATERIAL_DELTAS[code][square]
+
+    def remove_piece(self, square: int) -> int:
+        code = self.mailbox[square]
+        if code == NO_PIECE:
+            return code
+        square_mask = ~bit(square)
+        self.pieces[code] &= square_mask
+        self.colors[code_color(code)] &= square_mask
+        self.occupied &= square_mask
+        self.moved &= square_mask
+        self.mailbox[square] = NO_PIECE
+        self.hash ^= PIECE_KEYS[code][square]
+        self.material -= MATERIAL_DELTAS[code][square]
+        return code
+
+    def make_move(self, move: int):
+        mailbox = self.mailbox
+        pieces = self.pieces
+        colors = self.colors
+        origin = move & 63
+        destination = (move >> 6) & 63
+        flags = move >> 12
+        moving = mailbox[origin]
+        color = 0 if moving < 6 else 1
+        capture_square = destination
+        if flags == EN_PASSANT:
+            capture_square = destination + 8 if color == WHITE else destination - 8
+        captured = mailbox[capture_square]
+        en_passant = self.en_passant
+        castling = self.castling
+        key = self.hash
+        self.history.append(
+            (
+                move,
+                moving,
+                captured,
+                en_passant,
+                self.moved,
+                castling,
+                key,
+                self.turn,
+                self.halfmove_clock,
+            )
+        )
+
+        origin_bit = 1 << origin
+        destination_bit = 1 << destination
+        if captured != NO_PIECE:
+            capture_bit = 1 << capture_square
+            pieces[captured] ^= capture_bit
+            colors[color ^ 1] ^= capture_bit
+            self.occupied ^= capture_bit
+            mailbox[capture_square] = NO_PIECE
+            key ^= PIECE_KEYS[captured][capture_square]
+            self.material -= MATERIAL_DELTAS[captured][capture_square]
+        placed = moving
+        if flags & PROMOTION:
+            placed = color * 6 + KNIGHT + (flags & 3)
+            self.material += MATERIAL_DELTAS[placed][destination] - MATERIAL_DELTAS[moving][origin]
+        pieces[moving] ^= origin_bit
+        pieces[placed] ^= destination_bit
+        colors[color] ^= origin_bit | destination_bit
+        self.occupied = (self.occupied & ~origin_bit) | destination_bit
+        mailbox[origin] = NO_PIECE
+        mailbox[destination] = placed
+        key ^= PIECE_KEYS[moving][origin] ^ PIECE_KEYS[placed][destination]
+        self.moved = (self.moved & ~(origin_bit | (1 << capture_square))) | destination_bit
+
+        if en_passant is not None:
+            key ^= EN_PASSANT_KEYS[en_passant & 7]
+        if flags == DOUBLE_PAWN_PUSH:
+            self.en_passant = (origin + destination) >> 1
+            key ^= EN_PASSANT_KEYS[destination & 7]
+        else:
+            self.en_passant = None
+        if castling:
+            self.castling = castling & CASTLING_MASKS[origin] & CASTLING_MASKS[destination]
+            key ^= CASTLING_KEYS[castling] ^ CASTLING_KEYS[self.castling]
+        if self.turn == color:
+            key ^= SIDE_KEY
+        self.turn = color ^ 1
+        self.hash = key
+        if captured != NO_PIECE or moving % 6 == PAWN:
+            self.halfmove_clock = 0
+        else:
+            self.halfmove_clock += 1
+        self.fullmove_number += color
+        if self.debug:
+            self.verify_hash()
+
+    def unmake_move(self):
+        (
+            move,
+            moving,
+            captured,
+            self.en_passant,
+            self.moved,
+            self.castling,
+            self.hash,
+            self.turn,
+            self.halfmove_clock,
+        ) = self.history.pop()
+        mailbox = self.mailbox
+        pieces = self.pieces
+        colors = self.colors
+        origin = move & 63
+        destination = (move >> 6) & 63
+        color = 0 if moving < 6 else 1
+        self.fullmove_number -= color
+        origin_bit = 1 << origin
+        destination_bit = 1 << destination
+        placed = mailbox[destination]
+        if placed != moving:
+            self.material -= MATERIAL_DELTAS[placed][destination] - MATERIAL_DELTAS[moving][origin]
+        pieces[placed] ^= destination_bit
+        pieces[moving] ^= origin_bit
+        colors[color] ^= origin_bit | destination_bit
+        self.occupied ^= origin_bit | destination_bit
+        mailbox[destination] = NO_PIECE
+        mailbox[origin] = moving
+        if captured != NO_PIECE:
+            capture_square = destination
+            if move >> 12 == EN_PASSANT:
+                capture_square = destination + 8 if color == WHITE else destination - 8
+            capture_bit = 1 << capture_square
+            pieces[captured] |= capture_bit
+            colors[color ^ 1] |= capture_bit
+            self.occupied |= capture_bit
+            mailbox[capture_square] = captured
+            self.material += MATERIAL_DELTAS[captured][capture_square]
+        if self.debug:
+            self.verify_hash()
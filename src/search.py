@@ -0,0 +1,261 @@
+import time
+from typing import Iterator, List, NamedTuple, Sequence
+
+from .bitboard import NO_PIECE
+from .evaluation import PIECE_VALUES, evaluate
+from .material import is_dead_position
+from .move import CAPTURE
+from .movegen import (
+    CAPTURE_STAGE,
+    QUIET_STAGE,
+    generate_legal_moves,
+    has_legal_move,
+    is_legal_move,
+)
+from .position import Position
+from .transposition import EXACT, LOWER_BOUND, UPPER_BOUND, TranspositionTable
+
+INFINITY = 32000
+MATE_SCORE = 30000
+MAX_PLY = 128
+DEFAULT_DEPTH = 4
+CHECK_LIMITS_EVERY = 1024
+
+
+class SearchResult(NamedTuple):
+    best_move: int
+    score: int
+    pv: List[int]
+    depth: int
+    nodes: int
+    elapsed: float
+
+
+class SearchStopped(Exception):
+    pass
+
+
+def _score_to_table(score: int, ply: int) -> int:
+    if score > MATE_SCORE - MAX_PLY:
+        return score + ply
+    if score < -MATE_SCORE + MAX_PLY:
+        return score - ply
+    return score
+
+
+def _score_from_table(score: int, ply: int) -> int:
+    if score > MATE_SCORE - MAX_PLY:
+        return score - ply
+    if score < -MATE_SCORE + MAX_PLY:
+        return score + ply
+    return score
+
+
+class Search:
+    def __init__(
+        self,
+        position: Position,
+        transposition_table: TranspositionTable | None = None,
+        previous_hashes: Sequence[int] = (),
+    ):
+        self.position = position
+        # Hashes of the positions played before the position was handed over, such as the
+        # earlier positions of a game, so repeating one of them is scored as a draw.
+        self.previous_hashes = list(previous_hashes)
+        self.table = transposition_table if transposition_table else TranspositionTable(16)
+        self.nodes = 0
+        self.next_limit_check = CHECK_LIMITS_EVERY
+        self.max_nodes: int | None = None
+        self.deadline: float | None = None
+        self.pv_table: List[List[int]] = [[] for _ in range(MAX_PLY + 1)]
+        self.path_hashes: List[int] = []
+
+    def search(
+        self,
+        max_depth: int | None = None,
+        max_nodes: int | None = None,
+        time_limit: float | None = None,
+    ) -> SearchResult:
+        if max_depth is None:
+            max_depth = MAX_PLY if max_nodes or time_limit else DEFAULT_DEPTH
+        start = time.perf_counter()
+        self.nodes = 0
+        self.next_limit_check = CHECK_LIMITS_EVERY
+        self.max_nodes = max_nodes
+        self.deadline = start + time_limit if time_limit else None
+        self.table.new_search()
+        self.path_hashes = self._get_played_hashes()
+
+        root_moves = generate_legal_moves(self.position, self.position.turn)
+        result = SearchResult(root_moves[0] if root_moves else 0, 0, root_moves[:1], 0, 0, 0.0)
+        if not root_moves:
+            return result._replace(score=self._terminal_score(0))
+        history_length = len(self.position.history)
+        for depth in range(1, max_depth + 1):
+            try:
+                score = self._negamax(depth, -INFINITY, INFINITY, 0)
+            except SearchStopped:
+                while len(self.position.history) > history_length:
+                    self.position.unmake_move()
+                break
+            pv = list(self.pv_table[0])
+            result = SearchResult(pv[0], score, pv, depth, self.nodes, 0.0)
+            if abs(score) > MATE_SCORE - MAX_PLY:
+                break
+        return result._replace(nodes=self.nodes, elapsed=time.perf_counter() - start)
+
+    def score_root_move(self, move: int, depth: int) -> int:
+        # Fixed-depth, full-window score of a single root move, as used by the root splitting
+        # parallel search where each worker scores its own share of the root moves.
+        self.nodes = 0
+        self.next_limit_check = CHECK_LIMITS_EVERY
+        self.max_nodes = None
+        self.deadline = None
+        self.path_hashes = self._get_played_hashes()
+        self.path_hashes.append(self.position.hash)
+        self.position.make_move(move)
+        try:
+            return -self._negamax(depth - 1, -INFINITY, INFINITY, 1)
+        finally:
+            self.position.unmake_move()
+
+    def _get_played_hashes(self) -> List[int]:
+        return self.previous_hashes + [record[6] for record in self.position.history]
+
+    def _check_limits(self):
+        if self.max_nodes is not None and self.nodes >= self.max_nodes:
+            raise SearchStopped()
+        if self.deadline is not None and time.perf_counter() >= self.deadline:
+            raise SearchStopped()
+
+    def _is_in_check(self) -> bool:
+        position = self.position
+        king_square = position.king_square(position.turn)
+        return king_square is not None and position.is_square_attacked(
+            king_square, position.turn ^ 1
+        )
+
+    def _terminal_score(self, ply: int) -> int:
+        return -MATE_SCORE + ply if self._is_in_check() else 0
+
+    def _is_repetition(self) -> bool:
+        key = self.position.hash
+        return key in self.path_hashes
+
+    def _order_moves(self, moves: List[int]) -> List[int]:
+        mailbox = self.position.mailbox
+
+        def move_order(move: int) -> int:
+            if move >> 12 & CAPTURE:
+                victim = mailbox[(move >> 6) & 63]
+                victim_value = PIECE_VALUES[victim % 6] if victim != NO_PIECE else 100
+                return -10 * victim_value + PIECE_VALUES[mailbox[move & 63] % 6] // 100
+            return 0
+
+        return sorted(moves, key=move_order)
+
+    def _iter_moves(self, table_move: int) -> Iterator[int]:
+        # The table move is tried before any generation, then the captures and then the quiet
+        # moves, so a cutoff on an early move saves generating the later stages.
+        position = self.position
+        if table_move and is_legal_move(position, table_move):
+            yield table_move
+        captures = generate_legal_moves(position, position.turn, CAPTURE_STAGE)
+        for move in self._order_moves(captures):
+            if move != table_move:
+                yield move
+        for move in generate_legal_moves(position, position.turn, QUIET_STAGE):
+            if move != table_move:
+                yield move
+
+    def _negamax(self, depth: int, alpha: int, beta: int, ply: int) -> int:
+        self.nodes += 1
+        if self.nodes >= self.next_limit_check:
+            self.next_limit_check = self.nodes + CHECK_LIMITS_EVERY
+            self._check_limits()
+        position = self.position
+        self.pv_table[ply] = []
+        if ply and (self._is_repetition() or is_dead_position(position.material)):
+            return 0
+        if ply >= MAX_PLY:
+            return evaluate(position)
+
+        key = position.hash
+        table_move = 0
+        entry = self.table.probe(key)
+        if entry is not None:
+            table_move = entry.move
+            if ply and entry.depth >= depth:
+                score = _score_from_table(entry.score, ply)
+                if entry.bound == EXACT:
+                    return score
+                if entry.bound == LOWER_BOUND and score >= beta:
+                    return score
+                if entry.bound == UPPER_BOUND and score <= alpha:
+                    return score
+
+        if depth <= 0:
+            return self._quiescence(alpha, beta, ply)
+
+        original_alpha = alpha
+        best_score = -INFINITY
+        best_move = 0
+        self.path_hashes.append(key)
+        for move in self._iter_moves(table_move):
+            position.make_move(move)
+            score = -self._negamax(depth - 1, -beta, -alpha, ply + 1)
+            position.unmake_move()
+            if score > best_score:
+                best_score = score
+                best_move = move
+                if score > alpha:
+                    alpha = score
+                    self.pv_table[ply] = [move] + self.pv_table[ply + 1]
+                    if alpha >= beta:
+                        break
+        self.path_hashes.pop()
+        if not best_move:
+            return self._terminal_score(ply)
+
+        if best_score <= original_alpha:
+            bound = UPPER_BOUND
+        elif best_score >= beta:
+            bound = LOWER_BOUND
+        else:
+            bound = EXACT
+        self.table.store(key, depth, _score_to_table(best_score, ply), bound, best_move)
+        return best_score
+
+    def _quiescence(self, alpha: int, beta: int, ply: int) -> int:
+        position = self.position
+        captures = generate_legal_moves(position, position.turn, CAPTURE_STAGE)
+        if not captures and not has_legal_move(position, position.turn):
+            return self._terminal_score(ply)
+        stand_pat = evaluate(position)
+        if stand_pat >= beta or ply >= MAX_PLY:
+            return stand_pat
+        alpha = max(alpha, stand_pat)
+        for move in self._order_moves(captures):
+            self.nodes += 1
+            if self.nodes >= self.next_limit_check:
+                self.next_limit_check = self.nodes + CHECK_LIMITS_EVERY
+                self._check_limits()
+            position.make_move(move)
+            score = -self._quiescence(-beta, -alpha, ply + 1)
+            position.unmake_move()
+            if score >= beta:
+                return score
+            alpha = max(alpha, score)
+        return alpha
+
+
+def search_position(
+    position: Position,
+    max_depth: int | None = None,
+    max_nodes: int | None = None,
+    time_limit: float | None = None,
+    transposition_table: TranspositionTable | None = None,
+    previous_hashes: Sequence[int] = (),
+) -> SearchResult:
+    search = Search(position, transposition_table, previous_hashes)
+    return search.search(max_depth, max_nodes, time_limit)
@@ -0,0 +1,263 @@
+import argparse
+import asyncio
+import itertools
+import json
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Dict, List, Sequence
+
+from .bitboard import BLACK, WHITE
+from .book import OpeningBook
+from .exceptions import DiscoveredCheckException, ImpossibleMoveException, PieceNotFoundException
+from .game import Game
+from .move import algebraic_to_squares, move_to_algebraic
+from .position import Position
+from .search import search_position
+from .transposition import TranspositionTable
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_THINK_TIME = 0.1
+# Every engine move gets its own small table, as thousands of sessions cannot keep one each.
+ENGINE_TABLE_SIZE_MB = 1
+CONNECTION_BACKLOG = 1024
+
+COLORS = {"white": WHITE, "black": BLACK}
+COLOR_NAMES = {WHITE: "white", BLACK: "black"}
+ONGOING = "ongoing"
+CHECKMATE = "checkmate"
+STALEMATE = "stalemate"
+DEAD_POSITION = "dead_position"
+
+
+class ProtocolError(Exception):
+    pass
+
+
+def think(position: Position, time_limit: float, previous_hashes: Sequence[int] = ()) -> int:
+    table = TranspositionTable(ENGINE_TABLE_SIZE_MB)
+    return search_position(
+        position,
+        time_limit=time_limit,
+        transposition_table=table,
+        previous_hashes=previous_hashes,
+    ).best_move
+
+
+class GameSession:
+    def __init__(self, session_id: int, game: Game, computer_color: int | None = None):
+        self.id = session_id
+        self.game = game
+        self.computer_color = computer_color
+        # Serializes the requests of a session, also against its engine move in the executor.
+        self.lock = asyncio.Lock()
+        self.is_over = self._is_game_over()
+
+    @property
+    def status(self) -> str:
+        if self.game.checkmate:
+            return CHECKMATE
+        if self.game.stalemate:
+            return STALEMATE
+        if self.game.dead_position:
+            return DEAD_POSITION
+        return ONGOING
+
+    def _is_game_over(self) -> bool:
+        # Only looks for a first legal move, the move list is built when a move is validated.
+        attacking_player, _ = self.game.get_players_to_move()
+        return self.game.is_game_over(attacking_player)
+
+    @property
+    def is_computer_turn(self) -> bool:
+        return not self.is_over and self.game.board.position.turn == self.computer_color
+
+    def get_state(self) -> Dict[str, Any]:
+        return {
+            "game": self.id,
+            "fen": self.game.to_fen(),
+            "turn": COLOR_NAMES[self.game.board.position.turn],
+            "status": self.status,
+        }
+
+    def get_legal_moves(self) -> List[str]:
+        if self.is_over:
+            return []
+        return [move_to_algebraic(move) for move in self.game.get_legal_moves().values()]
+
+    def play(self, move: str):
+        if self.is_over:
+            raise ProtocolError("The game is over")
+        if len(move) != 4:
+            raise ProtocolError(f"Moves are sent as origin and destination squares, not {move}")
+        try:
+            origin_square, destination_square = algebraic_to_squares(move)
+        except ValueError:
+            raise ProtocolError(f"{move} is not made of two squares on the board")
+        self.game.play_move(origin_square, destination_square)
+        self.is_over = self._is_game_over()
+
+
+class GameServer:
+    # Speaks JSON lines: every request is an object with a "command" and every response an
+    # object with "ok" plus either the command results or an "error".
+    def __init__(
+        self,
+        executor: Executor | None = None,
+        think_time: float = DEFAULT_THINK_TIME,
+        opening_book: OpeningBook | None = None,
+    ):
+        self.sessions: Dict[int, GameSession] = {}
+        self.executor = executor
+        self.think_time = think_time
+        self.opening_book = opening_book
+        self.requests = 0
+        self._session_ids = itertools.count(1)
+        self._commands = {
+            "new": self._new_game,
+            "move": self._move,
+            "moves": self._legal_moves,
+            "state": self._state,
+            "close": self._close,
+        }
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while line := await reader.readline():
+                response = await self.handle_request(line)
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def handle_request(self, line: bytes) -> Dict[str, Any]:
+        self.requests += 1
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict) or request.get("command") not in self._commands:
+                raise ProtocolError(f"Unknown command in {line.decode().strip()}")
+            return {"ok": True, **await self._commands[request["command"]](request)}
+        except (
+            ProtocolError,
+            ImpossibleMoveException,
+            PieceNotFoundException,
+            DiscoveredCheckException,
+            IndexError,
+            KeyError,
+            TypeError,
+            ValueError,
+        ) as exception:
+            return {"ok": False, "error": str(exception)}
+
+    def _get_session(self, request: Dict[str, Any]) -> GameSession:
+        session = self.sessions.get(request.get("game"))
+        if session is None:
+            raise ProtocolError(f"Unknown game {request.get('game')}")
+        return session
+
+    async def _play_computer_move(self, session: GameSession) -> str | None:
+        if not session.is_computer_turn:
+            return None
+        position = session.game.board.position
+        # Book moves are cheap enough to answer on the event loop.
+        move = self.opening_book.probe(position) if self.opening_book else None
+        if move is None:
+            loop = asyncio.get_running_loop()
+            move = await loop.run_in_executor(
+                self.executor, think, position, self.think_time, session.game.hash_history
+            )
+        text = move_to_algebraic(move)
+        session.play(text)
+        return text
+
+    async def _new_game(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        computer = request.get("computer")
+        if computer is not None and computer not in COLORS:
+            raise ProtocolError(f"Unknown computer color {computer}")
+        fen = request.get("fen")
+        if fen is not None and not isinstance(fen, str):
+            raise ProtocolError(f"Positions are sent as FEN strings, not {fen}")
+        game = Game.from_fen(fen) if fen else Game()
+        session = GameSession(next(self._session_ids), game, COLORS.get(computer))
+        self.sessions[session.id] = session
+        async with session.lock:
+            reply = await self._play_computer_move(session)
+            return {**session.get_state(), "reply": reply}
+
+    async def _move(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        session = self._get_session(request)
+        async with session.lock:
+            if session.is_computer_turn:
+                raise ProtocolError("It is the computer's turn")
+            session.play(str(request.get("move", "")))
+            reply = await self._play_computer_move(session)
+            return {**session.get_state(), "reply": reply}
+
+    async def _legal_moves(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        session = self._get_session(request)
+        async with session.lock:
+            return {"game": session.id, "moves": session.get_legal_moves()}
+
+    async def _state(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        session = self._get_session(request)
+        async with session.lock:
+            return session.get_state()
+
+    async def _close(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        session = self._get_session(request)
+        del self.sessions[session.id]
+        return {"game": session.id}
+
+
+async def start_server(
+    game_server: GameServer,
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    path: str | None = None,
+) -> asyncio.AbstractServer:
+    if path is not None:
+        return await asyncio.start_unix_server(
+            game_server.handle_connection, path=path, backlog=CONNECTION_BACKLOG
+        )
+    return await asyncio.start_server(
+        game_server.handle_connection, host, port, backlog=CONNECTION_BACKLOG
+    )
+
+
+async def _serve(args: argparse.Namespace):
+    executor = ProcessPoolExecutor(args.engine_processes) if args.engine_processes else None
+    opening_book = OpeningBook(args.book) if args.book else None
+    game_server = GameServer(executor, args.think_time, opening_book)
+    server = await start_server(game_server, args.host, args.port, args.unix)
+    print(f"Serving games on {args.unix or f'{args.host}:{args.port}'}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Host chess games over a local socket")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix", default=None, help="Listen on a Unix socket path instead")
+    parser.add_argument("--think-time", type=float, default=DEFAULT_THINK_TIME)
+    parser.add_argument("--book", default=None, help="Opening book answering engine moves")
+    parser.add_argument(
+        "--engine-processes",
+        type=int,
+        default=0,
+        help="Search engine moves in a process pool instead of the default thread pool",
+    )
+    args = parser.parse_args()
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
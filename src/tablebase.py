@@ -0,0 +1,437 @@
+import argparse
+import os
+from array import array
+from typing import Dict, List, NamedTuple, Sequence, Tuple
+
+from .attacks import BISHOP_RAYS, ROOK_RAYS, piece_attacks
+from .bitboard import BISHOP, BLACK, KING, PAWN, QUEEN, ROOK, WHITE, iter_squares
+from .fen import parse_fen
+from .move import move_to_algebraic
+from .movegen import generate_legal_moves
+from .position import Position
+
+# Tables cover pawnless endings of up to four pieces. Pawns are left out as the engine does
+# not generate promotions, without which pawn endings cannot be won.
+MAX_PIECES = 4
+PIECE_LETTERS = "PNBRQK"
+TABLE_SUFFIX = ".wtb"
+# Larger tables take minutes to generate, so probes only use them once generated to files.
+ON_DEMAND_PIECES = 3
+
+# An entry is a byte per position and side to move: DRAW_ENTRY, ILLEGAL_ENTRY for positions
+# that cannot occur, or else the distance to mate in plies plus one. Odd distances are wins
+# for the side to move and even ones losses, zero being checkmate.
+DRAW_ENTRY = 0
+ILLEGAL_ENTRY = 255
+
+WIN = 1
+DRAW = 0
+LOSS = -1
+
+SLIDER_KINDS = (BISHOP, ROOK, QUEEN)
+QUEEN_RAYS = [ROOK_RAYS[square] | BISHOP_RAYS[square] for square in range(64)]
+
+# (code, square) of every piece on the board
+PieceList = Sequence[Tuple[int, int]]
+
+
+class TablebaseResult(NamedTuple):
+    wdl: int
+    plies_to_mate: int | None
+
+
+def _transform(square: int, transform: int) -> int:
+    row_index, column_index = square >> 3, square & 7
+    if transform & 1:
+        column_index = 7 - column_index
+    if transform & 2:
+        row_index = 7 - row_index
+    return row_index * 8 + column_index
+
+
+# Pawnless positions are mirrored so the white king stands on the a1-d4 quadrant. Only the
+# mirrors along files and ranks are used: no square is left in place by them, so every
+# position has exactly one mirrored form and retrograde move counts stay exact.
+TRANSFORMS = [[_transform(square, transform) for square in range(64)] for transform in range(4)]
+KING_TRANSFORMS = [
+    next(t for t in range(4) if TRANSFORMS[t][square] >> 3 >= 4 and TRANSFORMS[t][square] & 7 < 4)
+    for square in range(64)
+]
+KING_SQUARES = [square for square in range(64) if square >> 3 >= 4 and square & 7 < 4]
+KING_INDEXES = {square: index for index, square in enumerate(KING_SQUARES)}
+
+
+def _piece_order(code: int) -> Tuple[int, int]:
+    # White pieces first, the king leading each side and the others by decreasing value.
+    return code // 6, -(code % 6)
+
+
+def parse_material(material: str) -> List[int]:
+    codes: List[int] = []
+    for color, side in zip((WHITE, BLACK), material.upper().split("V")):
+        codes.extend(color * 6 + PIECE_LETTERS.index(letter) for letter in side)
+    if sorted(codes, key=_piece_order) != codes or codes.count(KING) + codes.count(6 + KING) != 2:
+        raise ValueError(f"{material} is not a material signature like KQvK")
+    return codes
+
+
+def material_name(codes: Sequence[int]) -> str:
+    sides = ["", ""]
+    for code in sorted(codes, key=_piece_order):
+        sides[code // 6] += PIECE_LETTERS[code % 6]
+    return "v".join(sides)
+
+
+def _canonical_pieces(pieces: PieceList) -> Tuple[List[int], List[int], bool]:
+    # Codes and squares in table order, flipping colors so the stronger side is White.
+    kinds = ([], [])
+    for code, _ in pieces:
+        kinds[code // 6].append(code % 6)
+    flipped = sorted(kinds[BLACK], reverse=True) > sorted(kinds[WHITE], reverse=True)
+    if flipped:
+        pieces = [((code + 6) % 12, square ^ 56) for code, square in pieces]
+    ordered = sorted(pieces, key=lambda piece: _piece_order(piece[0]))
+    return [code for code, _ in ordered], [square for _, square in ordered], flipped
+
+
+def canonical_material(codes: Sequence[int]) -> str:
+    return material_name(_canonical_pieces([(code, 0) for code in codes])[0])
+
+
+class Tablebase:
+    def __init__(self, material: str, entries: Sequence[bytearray] | None = None):
+        self.codes = parse_material(material)
+        self.material = material_name(self.codes)
+        if PAWN in self.codes or 6 + PAWN in self.codes or len(self.codes) > MAX_PIECES:
+            raise ValueError(f"No tables for {material}: up to {MAX_PIECES} pieces, no pawns")
+        self.size = len(KING_SQUARES) * 64 ** (len(self.codes) - 1)
+        # One array per side to move.
+        self.entries = entries or (bytearray(self.size), bytearray(self.size))
+
+    def index(self, squares: Sequence[int]) -> int:
+        table = TRANSFORMS[KING_TRANSFORMS[squares[0]]]
+        index = KING_INDEXES[table[squares[0]]]
+        for square in squares[1:]:
+            index = index << 6 | table[square]
+        return index
+
+    def squares(self, index: int) -> List[int]:
+        squares = [0] * len(self.codes)
+        for piece_index in range(len(self.codes) - 1, 0, -1):
+            squares[piece_index] = index & 63
+            index >>= 6
+        squares[0] = KING_SQUARES[index]
+        return squares
+
+    def save(self, path: str):
+        with open(path, "wb") as file:
+            file.write(self.entries[WHITE])
+            file.write(self.entries[BLACK])
+
+    @classmethod
+    def load(cls, material: str, path: str) -> "Tablebase":
+        tablebase = cls(material)
+        with open(path, "rb") as file:
+            data = file.read()
+        if len(data) != 2 * tablebase.size:
+            raise ValueError(f"{path} does not hold a {tablebase.material} table")
+        tablebase.entries = (bytearray(data[: tablebase.size]), bytearray(data[tablebase.size :]))
+        return tablebase
+
+
+def entry_result(entry: int) -> TablebaseResult | None:
+    if entry == ILLEGAL_ENTRY:
+        return None
+    if entry == DRAW_ENTRY:
+        return TablebaseResult(DRAW, None)
+    return TablebaseResult(WIN if entry % 2 == 0 else LOSS, entry - 1)
+
+
+def _entry_score(entry: int) -> int:
+    # Score of a child entry for the side that moved into it: quick wins and slow losses first.
+    if entry == DRAW_ENTRY:
+        return 0
+    if entry % 2:
+        return 1000 - entry
+    return -1000 + entry
+
+
+def _is_attacked(
+    codes: Sequence[int],
+    squares: Sequence[int],
+    square: int,
+    by_color: int,
+    occupied: int,
+    captured: int = -1,
+) -> bool:
+    for piece_index, code in enumerate(codes):
+        if code // 6 == by_color and piece_index != captured:
+            if piece_attacks(code, squares[piece_index], occupied) >> square & 1:
+                return True
+    return False
+
+
+def _is_legal(codes: Sequence[int], squares: Sequence[int], turn: int) -> bool:
+    # Pieces on distinct squares and the side that just moved not left in check.
+    if len(set(squares)) < len(squares):
+        return False
+    occupied = 0
+    for square in squares:
+        occupied |= 1 << square
+    king_square = squares[codes.index((turn ^ 1) * 6 + KING)]
+    return not _is_attacked(codes, squares, king_square, turn, occupied)
+
+
+def _legal_moves(
+    codes: Sequence[int], squares: Sequence[int], turn: int
+) -> List[Tuple[int, int, int]]:
+    # Legal moves of the side to move as the index of the moving piece, its destination and
+    # the index of the captured piece, -1 for quiet moves.
+    occupied = own = 0
+    owners: Dict[int, int] = {}
+    for piece_index, square in enumerate(squares):
+        occupied |= 1 << square
+        owners[square] = piece_index
+        if codes[piece_index] // 6 == turn:
+            own |= 1 << square
+    king_index = codes.index(turn * 6 + KING)
+    king_square = squares[king_index]
+    # Squares the king cannot step on, sliders seeing through it, and whether any other
+    # move could expose it to a check.
+    danger = 0
+    has_sliders = False
+    without_king = occupied ^ (1 << king_square)
+    for piece_index, code in enumerate(codes):
+        if code // 6 != turn:
+            danger |= piece_attacks(code, squares[piece_index], without_king)
+            has_sliders = has_sliders or code % 6 in SLIDER_KINDS
+    in_check = danger >> king_square & 1
+
+    moves: List[Tuple[int, int, int]] = []
+    for piece_index, code in enumerate(codes):
+        if code // 6 != turn:
+            continue
+        origin = squares[piece_index]
+        targets = piece_attacks(code, origin, occupied) & ~own
+        if piece_index == king_index:
+            targets &= ~danger
+        elif in_check or has_sliders and QUEEN_RAYS[king_square] >> origin & 1:
+            checked_targets = 0
+            for destination in iter_squares(targets):
+                child = list(squares)
+                child[piece_index] = destination
+                child_occupied = occupied ^ (1 << origin) | (1 << destination)
+                captured = owners.get(destination, -1)
+                if not _is_attacked(codes, child, king_square, turn ^ 1, child_occupied, captured):
+                    checked_targets |= 1 << destination
+            targets = checked_targets
+        for destination in iter_squares(targets):
+            moves.append((piece_index, destination, owners.get(destination, -1)))
+    return moves
+
+
+class Tablebases:
+    # Tables by material, loaded from directory when present there and generated otherwise,
+    # generated tables being saved to directory for the next time.
+    def __init__(self, directory: str | None = None):
+        self.directory = directory
+        self.tables: Dict[str, Tablebase] = {}
+
+    def _path(self, material: str) -> str | None:
+        if self.directory is None:
+            return None
+        return os.path.join(self.directory, material + TABLE_SUFFIX)
+
+    def get(self, material: str) -> Tablebase:
+        codes = parse_material(material)
+        material = canonical_material(codes)
+        tablebase = self.tables.get(material)
+        if tablebase is not None:
+            return tablebase
+        path = self._path(material)
+        if path and os.path.exists(path):
+            tablebase = Tablebase.load(material, path)
+        else:
+            tablebase = generate_tablebase(material, self)
+            if path:
+                os.makedirs(self.directory, exist_ok=True)
+                tablebase.save(path)
+        self.tables[material] = tablebase
+        return tablebase
+
+    def is_available(self, material: str) -> bool:
+        path = self._path(material)
+        return (
+            material in self.tables
+            or len(parse_material(material)) <= ON_DEMAND_PIECES
+            or (path is not None and os.path.exists(path))
+        )
+
+    def probe_pieces(self, pieces: PieceList, turn: int) -> int:
+        codes, squares, flipped = _canonical_pieces(pieces)
+        tablebase = self.get(material_name(codes))
+        return tablebase.entries[turn ^ flipped][tablebase.index(squares)]
+
+    def covers(self, position: Position) -> bool:
+        pieces = position.pieces
+        if (
+            position.castling
+            or pieces[PAWN] | pieces[6 + PAWN]
+            or position.occupied.bit_count() > MAX_PIECES
+            or not pieces[KING]
+            or not pieces[6 + KING]
+        ):
+            return False
+        codes = [position.mailbox[square] for square in iter_squares(position.occupied)]
+        return self.is_available(canonical_material(codes))
+
+    def _position_entry(self, position: Position) -> int:
+        mailbox = position.mailbox
+        pieces = [(mailbox[square], square) for square in iter_squares(position.occupied)]
+        return self.probe_pieces(pieces, position.turn)
+
+    def probe(self, position: Position) -> TablebaseResult | None:
+        if not self.covers(position):
+            return None
+        return entry_result(self._position_entry(position))
+
+    def best_move(self, position: Position) -> int | None:
+        # The fastest mate when winning, a drawing move when drawn, the longest defence else.
+        if self.probe(position) is None:
+            return None
+        best_move = None
+        best_score = -2000
+        for move in generate_legal_moves(position, position.turn):
+            position.make_move(move)
+            score = _entry_score(self._position_entry(position))
+            position.unmake_move()
+            if score > best_score:
+                best_move, best_score = move, score
+        return best_move
+
+
+def generate_tablebase(material: str, tablebases: Tablebases | None = None) -> Tablebase:
+    # Retrograde analysis: mates and the results reached through captures seed buckets by
+    # distance to mate, then each resolved position resolves the positions moving into it.
+    # A position is lost once all its moves lead to wins for the opponent, which is
+    # tracked with a count of the moves still unresolved.
+    tablebases = tablebases or Tablebases()
+    tablebase = Tablebase(material)
+    codes = tablebase.codes
+    entries = tablebase.entries
+    pending = (bytearray(tablebase.size), bytearray(tablebase.size))
+    capture_losses = (bytearray(tablebase.size), bytearray(tablebase.size))
+    done = (bytearray(tablebase.size), bytearray(tablebase.size))
+    # Positions queued by distance to mate, packed as index << 1 | side to move.
+    buckets = [array("L") for _ in range(ILLEGAL_ENTRY)]
+
+    for turn in (WHITE, BLACK):
+        for index in range(tablebase.size):
+            squares = tablebase.squares(index)
+            if not _is_legal(codes, squares, turn):
+                entries[turn][index] = ILLEGAL_ENTRY
+                continue
+            losing_moves = slowest_loss = 0
+            legal_moves = _legal_moves(codes, squares, turn)
+            moves = len(legal_moves)
+            for piece_index, destination, captured in legal_moves:
+                if captured < 0:
+                    continue
+                child_pieces = [
+                    (code, destination if index == piece_index else square)
+                    for index, (code, square) in enumerate(zip(codes, squares))
+                    if index != captured
+                ]
+                entry = tablebases.probe_pieces(child_pieces, turn ^ 1)
+                if entry == DRAW_ENTRY:
+                    continue
+                if entry % 2 == 0:
+                    losing_moves += 1
+                    slowest_loss = max(slowest_loss, entry)
+                else:
+                    buckets[entry].append(index << 1 | turn)
+            pending[turn][index] = moves - losing_moves
+            capture_losses[turn][index] = slowest_loss
+            if not moves:
+                king_square = squares[codes.index(turn * 6 + KING)]
+                occupied = sum(1 << square for square in squares)
+                if _is_attacked(codes, squares, king_square, turn ^ 1, occupied):
+                    buckets[0].append(index << 1 | turn)
+            elif moves == losing_moves:
+                buckets[slowest_loss].append(index << 1 | turn)
+
+    for distance, bucket in enumerate(buckets):
+        for queued in bucket:
+            turn, index = queued & 1, queued >> 1
+            if done[turn][index]:
+                continue
+            done[turn][index] = 1
+            if not entries[turn][index]:
+                entries[turn][index] = distance + 1
+            parent_turn = turn ^ 1
+            parent_entries = entries[parent_turn]
+            parent_pending = pending[parent_turn]
+            squares = tablebase.squares(index)
+            occupied = sum(1 << square for square in squares)
+            for piece_index, code in enumerate(codes):
+                if code // 6 != parent_turn:
+                    continue
+                parent = list(squares)
+                square = squares[piece_index]
+                shift = 6 * (len(codes) - 1 - piece_index)
+                origins = piece_attacks(code, square, occupied) & ~occupied
+                while origins:
+                    origin_bit = origins & -origins
+                    origins ^= origin_bit
+                    origin = origin_bit.bit_length() - 1
+                    if piece_index:
+                        # The white king keeps its square, so no mirroring is involved.
+                        parent_index = index ^ (square ^ origin) << shift
+                    else:
+                        parent[0] = origin
+                        parent_index = tablebase.index(parent)
+                    if parent_entries[parent_index]:
+                        continue
+                    if distance % 2 == 0:
+                        # Resolved right away, so other lost positions do not queue it again.
+                        parent_entries[parent_index] = distance + 2
+                        buckets[distance + 1].append(parent_index << 1 | parent_turn)
+                        continue
+                    parent_pending[parent_index] -= 1
+                    if not parent_pending[parent_index]:
+                        loss = max(distance + 1, capture_losses[parent_turn][parent_index])
+                        buckets[loss].append(parent_index << 1 | parent_turn)
+    return tablebase
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate or probe endgame tablebases")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    generate_parser = subparsers.add_parser("generate", help="Generate tables like KQvK")
+    generate_parser.add_argument("materials", nargs="+")
+    generate_parser.add_argument("--directory", required=True)
+    probe_parser = subparsers.add_parser("probe", help="Probe the tables for a position")
+    probe_parser.add_argument("fen")
+    probe_parser.add_argument("--directory", default=None)
+    args = parser.parse_args()
+
+    if args.command == "generate":
+        tablebases = Tablebases(args.directory)
+        for material in args.materials:
+            tablebase = tablebases.get(material)
+            print(f"{tablebase.material}: {2 * tablebase.size} entries")
+        return
+    tablebases = Tablebases(args.directory)
+    position = parse_fen(args.fen)
+    result = tablebases.probe(position)
+    if result is None:
+        print("Position not covered by the tablebases")
+        return
+    outcome = {WIN: "win", DRAW: "draw", LOSS: "loss"}[result.wdl]
+    distance = f", mate in {result.plies_to_mate} plies" if result.plies_to_mate else ""
+    best_move = tablebases.best_move(position)
+    print(f"{outcome}{distance}, best move {move_to_algebraic(best_move) if best_move else '-'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+from array import array
+from typing import NamedTuple, Sequence
+
+NO_BOUND = 0
+EXACT = 1
+LOWER_BOUND = 2
+UPPER_BOUND = 3
+
+DEPTH_PREFERRED = "depth"
+ALWAYS_REPLACE = "always"
+
+BUCKET_SIZE = 4
+ENTRY_BYTES = 16
+MAX_AGE = 64
+SCORE_OFFSET = 1 << 15
+
+# Every slot is a 64-bit key plus a 64-bit data word laid out as:
+# move (bits 0-15), score + SCORE_OFFSET (16-31), depth (32-39), bound (40-41), age (42-47)
+# The key is stored xored with the data word, so a slot torn by a concurrent writer
+# sharing the buffer fails verification instead of returning a wrong entry.
+MOVE_MASK = 0xFFFF
+DEPTH_SHIFT = 32
+BOUND_SHIFT = 40
+AGE_SHIFT = 42
+
+
+class TranspositionEntry(NamedTuple):
+    depth: int
+    score: int
+    bound: int
+    move: int
+
+
+def table_slots(size_mb: float) -> int:
+    buckets = max(1, int(size_mb * 1024 * 1024) // (ENTRY_BYTES * BUCKET_SIZE))
+    return (1 << (buckets.bit_length() - 1)) * BUCKET_SIZE
+
+
+def table_bytes(size_mb: float) -> int:
+    return table_slots(size_mb) * ENTRY_BYTES
+
+
+def pack_entry(depth: int, score: int, bound: int, move: int, age: int) -> int:
+    return (
+        move
+        | (score + SCORE_OFFSET) << 16
+        | min(depth, 255) << DEPTH_SHIFT
+        | bound << BOUND_SHIFT
+        | age << AGE_SHIFT
+    )
+
+
+class TranspositionTable:
+    def __init__(
+        self,
+        size_mb: float = 16,
+        replacement: str = DEPTH_PREFERRED,
+        buffer: memoryview | None = None,
+    ):
+        if replacement not in (DEPTH_PREFERRED, ALWAYS_REPLACE):
+            raise ValueError(f"Unknown replacement policy {replacement}")
+        self.size = table_slots(size_mb)
+        self.bucket_count = self.size // BUCKET_SIZE
+        self.replacement = replacement
+        self.buffer = buffer
+        self.keys: Sequence[int]
+        self.data: Sequence[int]
+        self._allocate()
+        self.age = 0
+        self.hits = 0
+        self.misses = 0
+        self.collisions = 0
+        self.stores = 0
+
+    def _allocate(self):
+        if self.buffer is None:
+            self.keys = array("Q", bytes(8 * self.size))
+            self.data = array("Q", bytes(8 * self.size))
+        else:
+            slots = memoryview(self.buffer).cast("B")[: self.memory_bytes].cast("Q")
+            self.keys = slots[: self.size]
+            self.data = slots[self.size :]
+
+    @property
+    def memory_bytes(self) -> int:
+        return self.size * ENTRY_BYTES
+
+    def _bucket_start(self, key: int) -> int:
+        return (key & (self.bucket_count - 1)) * BUCKET_SIZE
+
+    def probe(self, key: int) -> TranspositionEntry | None:
+        start = self._bucket_start(key)
+        keys = self.keys
+        for slot in range(start, start + BUCKET_SIZE):
+            data = self.data[slot]
+            if keys[slot] ^ data == key:
+                if data >> BOUND_SHIFT & 3:
+                    self.hits += 1
+                    return TranspositionEntry(
+                        (data >> DEPTH_SHIFT) & 0xFF,
+                        ((data >> 16) & 0xFFFF) - SCORE_OFFSET,
+                        (data >> BOUND_SHIFT) & 3,
+                        data & MOVE_MASK,
+                    )
+        self.misses += 1
+        return None
+
+    def store(self, key: int, depth: int, score: int, bound: int, move: int = 0):
+        start = self._bucket_start(key)
+        keys = self.keys
+        data = self.data
+        victim = start
+        victim_value: int | None = None
+        for slot in range(start, start + BUCKET_SIZE):
+            slot_data = data[slot]
+            is_same_key = keys[slot] ^ slot_data == key
+            if is_same_key or not slot_data >> BOUND_SHIFT & 3:
+                if is_same_key and not move:
+                    move = slot_data & MOVE_MASK
+                victim = slot
+                victim_value = None
+                break
+            # Stale entries are evicted before current ones, then the shallowest one.
+            is_stale = (slot_data >> AGE_SHIFT) & (MAX_AGE - 1) != self.age
+            value = (0 if is_stale else 256) + ((slot_data >> DEPTH_SHIFT) & 0xFF)
+            if victim_value is None or value < victim_value:
+                victim = slot
+                victim_value = value
+        else:
+            if self.replacement == DEPTH_PREFERRED and victim_value is not None:
+                if victim_value >= 256 and victim_value - 256 > depth:
+                    return
+            self.collisions += 1
+        entry = pack_entry(depth, score, bound, move, self.age)
+        keys[victim] = key ^ entry
+        data[victim] = entry
+        self.stores += 1
+
+    def new_search(self):
+        self.age = (self.age + 1) % MAX_AGE
+
+    def clear(self):
+        if self.buffer is None:
+            self._allocate()
+        else:
+            for slot in range(self.size):
+                self.keys[slot] = 0
+                self.data[slot] = 0
+        self.age = 0
+        self.reset_counters()
+
+    def reset_counters(self):
+        self.hits = 0
+        self.misses = 0
+        self.collisions = 0
+        self.stores = 0
+
+    def hashfull(self) -> int:
+        sample = min(self.size, 1000)
+        used = sum(
+            1
+            for slot in range(sample)
+            if self.data[slot] >> BOUND_SHIFT & 3
+            and (self.data[slot] >> AGE_SHIFT) & (MAX_AGE - 1) == self.age
+        )
+        return used * 1000 // sample
@@ -22,8 +22,22 @@ def indexes_to_algebraic(row_index: int, column_index: int) -> str:
 
 
 def algebraic_to_indexes(coordinate: str) -> Tuple[int, int]:
+    if len(coordinate) != 2 or coordinate[0] not in "abcdefgh" or coordinate[1] not in "12345678":
+        raise ValueError(f"{coordinate} is not a square")
     column_coordinate = coordinate[0]
     row_coordinate = coordinate[1]
     row_index = row_algebraic_to_index(row_coordinate)
     column_index = column_algebraic_to_index(column_coordinate)
     return row_index, column_index
+
+
+def algebraic_to_square(coordinate: str) -> int:
+    row_index, column_index = algebraic_to_indexes(coordinate)
+    return row_index * 8 + column_index
+
+
+SQUARE_NAMES = [
+    indexes_to_algebraic(row_index, column_index)
+    for row_index in range(8)
+    for column_index in range(8)
+]
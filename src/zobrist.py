@@ -0,0 +1,24 @@
+import random
+from typing import List
+
+from .bitboard import BLACK, iter_squares
+
+_random = random.Random(0x5EED)
+
+PIECE_KEYS: List[List[int]] = [[_random.getrandbits(64) for _ in range(64)] for _ in range(12)]
+SIDE_KEY = _random.getrandbits(64)
+CASTLING_KEYS = [0] + [_random.getrandbits(64) for _ in range(15)]
+EN_PASSANT_KEYS = [_random.getrandbits(64) for _ in range(8)]
+
+
+def compute_hash(pieces: List[int], turn: int, castling: int, en_passant: int | None) -> int:
+    key = 0
+    for code, bitboard in enumerate(pieces):
+        for square in iter_squares(bitboard):
+            key ^= PIECE_KEYS[code][square]
+    if turn == BLACK:
+        key ^= SIDE_KEY
+    key ^= CASTLING_KEYS[castling]
+    if en_passant is not None:
+        key ^= EN_PASSANT_KEYS[en_passant & 7]
+    return key
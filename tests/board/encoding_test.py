@@ -0,0 +1,60 @@
+import pytest
+from pytest import mark as m
+from src.encoding import (
+    CASTLING_PLANE,
+    EN_PASSANT_PLANE,
+    SIDE_PLANE,
+    allocate_planes,
+    encode_positions,
+)
+from src.fen import parse_fen
+from src.perft import START_FEN
+from src.position import BLACK_KINGSIDE, WHITE_QUEENSIDE
+from src.utils import algebraic_to_square
+
+np = pytest.importorskip("numpy")
+
+
+def plane_square(planes, plane: int, square_name: str):
+    square = algebraic_to_square(square_name)
+    return planes[plane, square >> 3, square & 7]
+
+
+@m.describe("Test board encoding")
+class TestEncoding:
+    @m.context("Test planes")
+    @m.it("Planes should hold the pieces, side to move, castling rights and en passant")
+    def test_planes(self):
+        positions = [
+            parse_fen(START_FEN),
+            parse_fen("4k2r/8/8/3pP3/8/8/8/R3K3 w Qk d6 0 1"),
+        ]
+        planes = encode_positions(positions)
+        assert planes.shape == (2, 18, 8, 8)
+        assert planes[0, :12].sum() == 32
+        assert plane_square(planes[0], 0, "e2") == 1
+        assert plane_square(planes[0], 11, "e8") == 1
+        assert planes[0, SIDE_PLANE].all()
+        assert planes[0, CASTLING_PLANE : CASTLING_PLANE + 4].all()
+        assert not planes[0, EN_PASSANT_PLANE].any()
+
+        assert planes[1, :12].sum() == 6
+        assert plane_square(planes[1], 6, "d5") == 1
+        castling = planes[1, CASTLING_PLANE : CASTLING_PLANE + 4, 0, 0]
+        expected = [bool((WHITE_QUEENSIDE | BLACK_KINGSIDE) >> bit & 1) for bit in range(4)]
+        assert list(castling.astype(bool)) == expected
+        assert planes[1, EN_PASSANT_PLANE].sum() == 1
+        assert plane_square(planes[1], EN_PASSANT_PLANE, "d6") == 1
+
+    @m.context("Test buffers")
+    @m.it("Batches should be written into a preallocated buffer, clearing older planes")
+    def test_buffer(self):
+        buffer = allocate_planes(4)
+        encode_positions([parse_fen(START_FEN)] * 4, buffer)
+        planes = encode_positions([parse_fen("4k3/8/8/8/8/8/8/4K3 b - - 0 1")], buffer)
+        assert np.shares_memory(planes, buffer)
+        assert buffer[0, :12].sum() == 2
+        assert not buffer[0, SIDE_PLANE].any()
+        assert buffer[1, :12].sum() == 32
+        with pytest.raises(ValueError):
+            encode_positions([parse_fen(START_FEN)] * 5, buffer)
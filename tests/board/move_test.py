@@ -0,0 +1,55 @@
+import pytest
+from pytest import mark as m
+from src.bitboard import KNIGHT, QUEEN
+from src.move import (
+    CAPTURE,
+    EN_PASSANT,
+    PROMOTION,
+    encode_move,
+    is_capture,
+    move_destination,
+    move_flags,
+    move_origin,
+    move_promotion,
+    move_to_algebraic,
+)
+from src.parser import parse_command
+from src.utils import algebraic_to_square
+
+
+@m.describe("Test packed move encoding")
+class TestMove:
+    @m.context("Test encoding")
+    @m.it("Moves should round trip origin, destination and flags in 16 bits")
+    def test_encode_decode(self):
+        move = encode_move(algebraic_to_square("d5"), algebraic_to_square("e6"), EN_PASSANT)
+        assert move < 1 << 16
+        assert move_origin(move) == algebraic_to_square("d5")
+        assert move_destination(move) == algebraic_to_square("e6")
+        assert move_flags(move) == EN_PASSANT
+        assert is_capture(move)
+        assert move_promotion(move) is None
+        assert move_to_algebraic(move) == "d5e6"
+
+    @m.context("Test encoding")
+    @m.it("Promotions should keep the promoted piece kind")
+    def test_encode_promotion(self):
+        flags = PROMOTION | CAPTURE | QUEEN - KNIGHT
+        move = encode_move(algebraic_to_square("b7"), algebraic_to_square("a8"), flags)
+        assert move < 1 << 16
+        assert move_promotion(move) == QUEEN
+        assert move_flags(move) & CAPTURE
+        assert move_to_algebraic(move) == "b7a8q"
+
+    @m.context("Test parsing")
+    @m.it("Commands should be parsed into square indexes")
+    def test_parse_command(self):
+        assert parse_command("e2 e4") == (52, 36)
+
+    @m.context("Test parsing")
+    @m.it("Squares off the board should be rejected")
+    def test_off_board_squares(self):
+        assert algebraic_to_square("h1") == 63
+        for coordinate in ("a9", "a0", "i1", "e", "e44", ""):
+            with pytest.raises(ValueError):
+                algebraic_to_square(coordinate)
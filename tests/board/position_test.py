@@ -0,0 +1,86 @@
+from pytest import mark as m
+from src.bitboard import BLACK, NO_PIECE, PAWN, ROOK, WHITE, piece_code
+from src.board import Board
+from src.move import CAPTURE, DOUBLE_PAWN_PUSH, EN_PASSANT, encode_move
+from src.pieces import King, Pawn, Rook
+from src.utils import SQUARE_NAMES
+
+
+def square(name: str) -> int:
+    return SQUARE_NAMES.index(name)
+
+
+def snapshot(board: Board):
+    position = board.position
+    return (
+        list(position.pieces),
+        list(position.colors),
+        position.occupied,
+        bytes(position.mailbox),
+        position.en_passant,
+        position.moved,
+        position.turn,
+    )
+
+
+@m.describe("Test position make and unmake")
+class TestPosition:
+    @m.context("Test make move")
+    @m.it("Making a capture should remove the captured piece and mark the destination as moved")
+    def test_make_capture(self):
+        test_board = Board()
+        test_board.init_empty_board()
+        test_board.init_board_with_pieces(Rook(7, 0, True), Pawn(1, 0, False))
+        position = test_board.position
+        position.make_move(encode_move(square("a1"), square("a7"), CAPTURE))
+        assert position.piece_at(square("a7")) == piece_code(WHITE, ROOK)
+        assert position.piece_at(square("a1")) == NO_PIECE
+        assert position.pieces[piece_code(BLACK, PAWN)] == 0
+        assert position.moved == 1 << square("a7")
+        assert position.turn == BLACK
+
+    @m.context("Test make move")
+    @m.it("A double pawn push should set the en passant square, which a pawn can capture")
+    def test_make_en_passant(self):
+        test_board = Board()
+        test_board.init_empty_board()
+        test_board.init_board_with_pieces(Pawn(6, 4, True), Pawn(4, 3, False))
+        position = test_board.position
+        position.make_move(encode_move(square("e2"), square("e4"), DOUBLE_PAWN_PUSH))
+        assert position.en_passant == square("e3")
+        position.make_move(encode_move(square("d4"), square("e3"), EN_PASSANT))
+        assert position.piece_at(square("e4")) == NO_PIECE
+        assert position.pieces[piece_code(WHITE, PAWN)] == 0
+        assert position.en_passant is None
+
+    @m.context("Test unmake move")
+    @m.it("Unmaking moves should restore the exact previous state")
+    def test_unmake_restores_state(self):
+        test_board = Board()
+        test_board.init_board()
+        test_board.init_board_with_pieces(Pawn(4, 3, False))
+        initial = snapshot(test_board)
+        position = test_board.position
+        position.make_move(encode_move(square("e2"), square("e4"), DOUBLE_PAWN_PUSH))
+        after_push = snapshot(test_board)
+        position.make_move(encode_move(square("d4"), square("e3"), EN_PASSANT))
+        position.make_move(encode_move(square("f2"), square("e3"), CAPTURE))
+        position.unmake_move()
+        position.unmake_move()
+        assert snapshot(test_board) == after_push
+        position.unmake_move()
+        assert snapshot(test_board) == initial
+        assert position.history == []
+
+    @m.context("Test attacked squares")
+    @m.it("Squares attacked by sliders should depend on blockers")
+    def test_is_square_attacked(self):
+        test_board = Board()
+        test_board.init_empty_board()
+        test_board.init_board_with_pieces(King(7, 4, True), Rook(0, 4, False))
+        position = test_board.position
+        assert position.is_square_attacked(square("e1"), BLACK)
+        assert not position.is_square_attacked(square("e1"), WHITE)
+        test_board.init_board_with_pieces(Pawn(4, 4, True))
+        assert not position.is_square_attacked(square("e1"), BLACK)
+        assert position.is_square_attacked(square("d5"), WHITE)
@@ -0,0 +1,90 @@
+from pytest import mark as m
+from src.bitboard import BLACK, KING, NO_PIECE, PAWN, WHITE, bit, piece_code, pop_count
+from src.board import Board
+from src.perft import START_FEN
+from src.pieces import King, Knight, Pawn
+
+
+@m.describe("Test Board Logic")
+class TestBoard:
+    @m.context("Test initial board bitboards")
+    @m.it("Bitboards should match the pieces of the initial position")
+    def test_initial_board_bitboards(self):
+        test_board = Board()
+        test_board.init_board()
+        position = test_board.position
+        assert pop_count(position.occupied) == 32
+        assert pop_count(position.colors[WHITE]) == 16
+        assert pop_count(position.colors[BLACK]) == 16
+        assert position.pieces[piece_code(WHITE, PAWN)] == 0xFF << 48
+        assert position.pieces[piece_code(BLACK, PAWN)] == 0xFF << 8
+        assert position.pieces[piece_code(WHITE, KING)] == bit(60)
+        assert position.pieces[piece_code(BLACK, KING)] == bit(4)
+        for row_index in range(8):
+            for column_index in range(8):
+                piece = test_board.get_square_from_row_column(row_index, column_index)
+                code = position.piece_at(row_index * 8 + column_index)
+                assert code == (piece.code if piece else NO_PIECE)
+
+    @m.context("Test squares view")
+    @m.it("Writing through squares should keep the bitboards in sync")
+    def test_squares_view_updates_bitboards(self):
+        test_board = Board()
+        test_board.init_empty_board()
+        king = King(4, 4, True)
+        test_board.squares[4][4] = king
+        assert test_board.squares[4][4] is king
+        assert test_board.position.pieces[piece_code(WHITE, KING)] == bit(36)
+        assert test_board.position.occupied == bit(36)
+        test_board.squares[4][4] = None
+        assert test_board.squares[4][4] is None
+        assert test_board.position.occupied == 0
+        assert test_board.position.pieces[piece_code(WHITE, KING)] == 0
+
+    @m.context("Test squares view")
+    @m.it("Replacing a piece should drop the previous piece from the bitboards")
+    def test_squares_view_replaces_piece(self):
+        test_board = Board()
+        test_board.init_empty_board()
+        test_board.init_board_with_pieces(Pawn(3, 3, True))
+        test_board.squares[3][3] = Pawn(3, 3, False)
+        assert test_board.position.colors[WHITE] == 0
+        assert test_board.position.colors[BLACK] == bit(27)
+
+    @m.context("Test board printing")
+    @m.it("Printing the board should show every piece through the squares view")
+    def test_board_str(self):
+        test_board = Board()
+        test_board.init_board()
+        lines = str(test_board).splitlines()
+        assert lines[0] == "8 ♜ ♞ ♝ ♛ ♚ ♝ ♞ ♜ "
+        assert lines[7] == "1 ♖ ♘ ♗ ♕ ♔ ♗ ♘ ♖ "
+        assert lines[8] == "  a b c d e f g h"
+
+    @m.context("Test compact pieces")
+    @m.it("Pieces should use slots and share their movement vectors per class")
+    def test_pieces_are_compact(self):
+        first_knight = Knight(7, 1, True)
+        second_knight = Knight(0, 1, False)
+        assert not hasattr(first_knight, "__dict__")
+        assert first_knight._movement_vectors is second_knight._movement_vectors
+        assert Pawn(6, 0, True)._movement_vectors is Pawn(6, 1, True)._movement_vectors
+
+    @m.context("Test flyweight board")
+    @m.it("A flyweight board should hold piece codes and match a regular board")
+    def test_flyweight_board(self):
+        regular_board = Board()
+        regular_board.init_board()
+        flyweight_board = Board(flyweight=True)
+        flyweight_board.init_board()
+        assert flyweight_board.pieces == []
+        assert flyweight_board.position.hash == regular_board.position.hash
+        assert str(flyweight_board) == str(regular_board)
+        assert flyweight_board.squares[7][4] is flyweight_board.get_square_from_row_column(7, 4)
+        assert isinstance(flyweight_board.squares[7][4], King)
+        flyweight_board.squares[7][4] = None
+        assert flyweight_board.squares[7][4] is None
+        assert flyweight_board.position.pieces[piece_code(WHITE, KING)] == 0
+        fen_board = Board(flyweight=True)
+        assert fen_board.init_board_from_fen(START_FEN) == (({}, {}), ({}, {}))
+        assert len(fen_board.get_pieces()) == 32
@@ -0,0 +1,90 @@
+import pytest
+from pytest import mark as m
+from src.board import Board
+from src.fen import parse_fen
+from src.exceptions import HashMismatchException
+from src.game import Game
+from src.move import DOUBLE_PAWN_PUSH, QUIET, encode_move
+from src.perft import START_FEN, perft
+from src.utils import algebraic_to_square
+
+
+def play(board: Board, *moves: str):
+    for move in moves:
+        origin, destination = algebraic_to_square(move[0:2]), algebraic_to_square(move[2:4])
+        is_double_push = move[4:] == "!"
+        board.position.make_move(
+            encode_move(origin, destination, DOUBLE_PAWN_PUSH if is_double_push else QUIET)
+        )
+
+
+@m.describe("Test Zobrist hashing")
+class TestZobrist:
+    @m.context("Test initial hash")
+    @m.it("The incremental hash should match a full recomputation after setup")
+    def test_initial_hash(self):
+        board = Board()
+        board.init_board()
+        assert board.position.hash == board.position.compute_hash()
+        assert board.position.hash == parse_fen(START_FEN).hash
+
+    @m.context("Test transpositions")
+    @m.it("Different move orders reaching the same position should share the hash")
+    def test_transposition(self):
+        board_a = Board()
+        board_a.init_board()
+        board_b = Board()
+        board_b.init_board()
+        play(board_a, "e2e3", "e7e6", "d2d3")
+        play(board_b, "d2d3", "e7e6", "e2e3")
+        assert board_a.position.hash == board_b.position.hash
+        play(board_a, "g8f6", "g1f3", "f6g8", "f3g1")
+        play(board_b, "b8c6", "b1c3", "c6b8", "c3b1")
+        assert board_a.position.hash == board_b.position.hash
+
+    @m.context("Test en passant and side to move")
+    @m.it("En passant squares and the side to move should change the hash")
+    def test_en_passant_changes_hash(self):
+        board_a = Board()
+        board_a.init_board()
+        board_b = Board()
+        board_b.init_board()
+        play(board_a, "e2e4!")
+        play(board_b, "g1f3", "g8f6", "f3g1", "f6g8", "e2e4")
+        assert board_a.position.occupied == board_b.position.occupied
+        assert board_a.position.turn == board_b.position.turn
+        assert board_a.position.hash != board_b.position.hash
+        board_b.position.set_en_passant(algebraic_to_square("e3"))
+        assert board_a.position.hash == board_b.position.hash
+
+    @m.context("Test debug check")
+    @m.it("The debug check should hold during a full perft and the hash should be restored")
+    def test_debug_perft(self):
+        position = parse_fen("8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1")
+        initial_hash = position.hash
+        position.debug = True
+        assert perft(position, 3) == 2812
+        assert position.hash == initial_hash
+
+    @m.context("Test game moves")
+    @m.it("Moving pieces through the game should keep the hash in sync")
+    def test_game_moves(self):
+        game = Game()
+        pawn = game.board.get_square_from_row_column(6, 4)
+        game.update_legal_moves(game.player_1)
+        game.move_piece(game.player_1, pawn, game.player_2, 52, 36)
+        position = game.board.position
+        assert position.hash == position.compute_hash()
+        assert position.en_passant == algebraic_to_square("e3")
+
+    @m.context("Test debug check")
+    @m.it("The debug check should run after every game move")
+    def test_debug_game_moves(self):
+        game = Game()
+        position = game.board.position
+        position.debug = True
+        for move in ("e2e4", "d7d5", "e4e5", "f7f5", "e5f6", "e7f6", "d1h5", "g7g6"):
+            game.play_move(algebraic_to_square(move[0:2]), algebraic_to_square(move[2:4]))
+        position.hash ^= 1
+        with pytest.raises(HashMismatchException):
+            game.play_move(algebraic_to_square("h5"), algebraic_to_square("g6"))
@@ -0,0 +1,59 @@
+from pytest import mark as m
+from src.attacks import (
+    KING_ATTACKS,
+    KNIGHT_ATTACKS,
+    PAWN_ATTACKS,
+    bishop_attacks,
+    queen_attacks,
+    rook_attacks,
+)
+from src.bitboard import BLACK, WHITE, bit, iter_squares
+from src.utils import SQUARE_NAMES
+
+
+def to_algebraic(bitboard: int):
+    return sorted(SQUARE_NAMES[square] for square in iter_squares(bitboard))
+
+
+def from_algebraic(*names: str) -> int:
+    bitboard = 0
+    for name in names:
+        bitboard |= bit(SQUARE_NAMES.index(name))
+    return bitboard
+
+
+@m.describe("Test precomputed attack tables")
+class TestAttacks:
+    @m.context("Test leaper tables")
+    @m.it("Knights and kings in the corner should only attack squares inside the board")
+    def test_leapers_in_corner(self):
+        a1 = SQUARE_NAMES.index("a1")
+        assert to_algebraic(KNIGHT_ATTACKS[a1]) == ["b3", "c2"]
+        assert to_algebraic(KING_ATTACKS[a1]) == ["a2", "b1", "b2"]
+
+    @m.context("Test leaper tables")
+    @m.it("Pawns should attack diagonally towards the opponent")
+    def test_pawn_attacks(self):
+        e4 = SQUARE_NAMES.index("e4")
+        assert to_algebraic(PAWN_ATTACKS[WHITE][e4]) == ["d5", "f5"]
+        assert to_algebraic(PAWN_ATTACKS[BLACK][e4]) == ["d3", "f3"]
+        assert PAWN_ATTACKS[WHITE][SQUARE_NAMES.index("a8")] == 0
+
+    @m.context("Test sliding attacks")
+    @m.it("Rooks should stop at the first blocker in every direction, including it")
+    def test_rook_attacks_with_blockers(self):
+        occupied = from_algebraic("e6", "c4", "e2")
+        attacks = rook_attacks(SQUARE_NAMES.index("e4"), occupied)
+        assert to_algebraic(attacks) == ["c4", "d4", "e2", "e3", "e5", "e6", "f4", "g4", "h4"]
+
+    @m.context("Test sliding attacks")
+    @m.it("Bishops should stop at the first blocker in every direction, including it")
+    def test_bishop_attacks_with_blockers(self):
+        occupied = from_algebraic("g6", "c2", "b7")
+        attacks = bishop_attacks(SQUARE_NAMES.index("e4"), occupied)
+        assert to_algebraic(attacks) == ["b7", "c2", "c6", "d3", "d5", "f3", "f5", "g2", "g6", "h1"]
+
+    @m.context("Test sliding attacks")
+    @m.it("Queens on an empty board should attack 27 squares from the centre")
+    def test_queen_attacks_empty_board(self):
+        assert len(to_algebraic(queen_attacks(SQUARE_NAMES.index("d4"), 0))) == 27
@@ -1,6 +1,7 @@
 from pytest import mark as m
 from src.board import Board
 from src.pieces import Bishop
+from src.utils import algebraic_to_square
 
 test_board = Board().init_empty_board()
 test_white_bishop = Bishop(row=6, column=4, is_white=True)
@@ -30,10 +31,24 @@ class TestBishopk:
         bishop = Bishop(row=initial_row, column=initial_column, is_white=True)
         test_board.init_board_with_pieces(bishop)
         bishop.update_possible_moves(test_board.squares)
-        expected_possible_moves = ["f5", "g6", "h7", "d5", "c6", "b7", "a8", "d3", "c2", "b1", "f3", "g2", "h1"]
+        expected_possible_moves = [
+            "f5",
+            "g6",
+            "h7",
+            "d5",
+            "c6",
+            "b7",
+            "a8",
+            "d3",
+            "c2",
+            "b1",
+            "f3",
+            "g2",
+            "h1",
+        ]
         assert len(bishop.possible_moves) == len(expected_possible_moves)
         for expected_possible_move in expected_possible_moves:
-            assert expected_possible_move in bishop.possible_moves
+            assert algebraic_to_square(expected_possible_move) in bishop.possible_moves
 
     @m.context("Test bishop possible moves")
     @m.it("Bishop shouldn't be able to move where a piece of the same color is")
@@ -50,7 +65,7 @@ class TestBishopk:
         expected_possible_moves = ["f5", "d5", "c6", "b7", "a8", "d3", "f3", "g2", "h1"]
         assert len(bishop.possible_moves) == len(expected_possible_moves)
         for expected_possible_move in expected_possible_moves:
-            assert expected_possible_move in bishop.possible_moves
+            assert algebraic_to_square(expected_possible_move) in bishop.possible_moves
 
     @m.context("Test bishop possible moves")
     @m.it("Bishop should be able to move where a piece of the opposite color is")
@@ -69,4 +84,4 @@ class TestBishopk:
         expected_possible_moves = ["f5", "d5", "c6", "b7", "a8", "d3", "f3", "g2", "h1", "g6"]
         assert len(bishop.possible_moves) == len(expected_possible_moves)
         for expected_possible_move in expected_possible_moves:
-            assert expected_possible_move in bishop.possible_moves
+            assert algebraic_to_square(expected_possible_move) in bishop.possible_moves
@@ -1,6 +1,7 @@
 from pytest import mark as m
 from src.board import Board
 from src.pieces import King
+from src.utils import algebraic_to_square
 
 test_board = Board().init_empty_board()
 test_white_king = King(row=6, column=4, is_white=True)
@@ -12,7 +13,16 @@ class TestKingk:
     @m.context("Test king movement vectors")
     @m.it("King should have its correct movement vectors")
     def test_movement_vectors_white_king(self):
-        expected_white_king_movement_vectors = [(-1, -1), (-1, 1), (-1, 0), (1, -1), (1, 1), (1, 0), (0, -1), (0, 1)]
+        expected_white_king_movement_vectors = [
+            (-1, -1),
+            (-1, 1),
+            (-1, 0),
+            (1, -1),
+            (1, 1),
+            (1, 0),
+            (0, -1),
+            (0, 1),
+        ]
         assert all(
             [
                 movement_vector in test_white_king._movement_vectors
@@ -33,7 +43,7 @@ class TestKingk:
         expected_possible_moves = ["d4", "f4", "e5", "e3", "d5", "f5", "d3", "f3"]
         assert len(king.possible_moves) == len(expected_possible_moves)
         for expected_possible_move in expected_possible_moves:
-            assert expected_possible_move in king.possible_moves
+            assert algebraic_to_square(expected_possible_move) in king.possible_moves
 
     @m.context("Test king possible moves")
     @m.it("King shouldn't be able to move where a piece of the same color is")
@@ -50,7 +60,7 @@ class TestKingk:
         expected_possible_moves = ["d4", "f4", "e5", "e3", "f5", "d3"]
         assert len(king.possible_moves) == len(expected_possible_moves)
         for expected_possible_move in expected_possible_moves:
-            assert expected_possible_move in king.possible_moves
+            assert algebraic_to_square(expected_possible_move) in king.possible_moves
 
     @m.context("Test king possible moves")
     @m.it("King should be able to move where a piece of the opposite color is")
@@ -69,4 +79,4 @@ class TestKingk:
         expected_possible_moves = ["d4", "f4", "e5", "e3", "f5", "d3", "f3"]
         assert len(king.possible_moves) == len(expected_possible_moves)
         for expected_possible_move in expected_possible_moves:
-            assert expected_possible_move in king.possible_moves
+            assert algebraic_to_square(expected_possible_move) in king.possible_moves
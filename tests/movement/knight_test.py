@@ -1,6 +1,7 @@
 from pytest import mark as m
 from src.board import Board
 from src.pieces import Knight
+from src.utils import algebraic_to_square
 
 test_board = Board().init_empty_board()
 test_white_knight = Knight(row=6, column=4, is_white=True)
@@ -42,7 +43,7 @@ class TestKnightk:
         expected_possible_moves = ["d6", "f6", "d2", "f2", "c5", "c3", "g5", "g3"]
         assert len(knight.possible_moves) == len(expected_possible_moves)
         for expected_possible_move in expected_possible_moves:
-            assert expected_possible_move in knight.possible_moves
+            assert algebraic_to_square(expected_possible_move) in knight.possible_moves
 
     @m.context("Test knight possible moves")
     @m.it("Knight shouldn't be able to move out of bounds")
@@ -57,7 +58,7 @@ class TestKnightk:
         expected_possible_moves = ["b3", "c2"]
         assert len(knight.possible_moves) == len(expected_possible_moves)
         for expected_possible_move in expected_possible_moves:
-            assert expected_possible_move in knight.possible_moves
+            assert algebraic_to_square(expected_possible_move) in knight.possible_moves
 
     @m.context("Test knight possible moves")
     @m.it("Knight shouldn't be able to move where a piece of the same color is")
@@ -74,7 +75,7 @@ class TestKnightk:
         expected_possible_moves = ["f6", "d2", "f2", "c5", "g5", "g3"]
         assert len(knight.possible_moves) == len(expected_possible_moves)
         for expected_possible_move in expected_possible_moves:
-            assert expected_possible_move in knight.possible_moves
+            assert algebraic_to_square(expected_possible_move) in knight.possible_moves
 
     @m.context("Test knight possible moves")
     @m.it("Knight should be able to move where a piece of the opposite color is")
@@ -91,4 +92,4 @@ class TestKnightk:
         expected_possible_moves = ["f6", "d2", "f2", "c5", "g5", "g3", "d6"]
         assert len(knight.possible_moves) == len(expected_possible_moves)
         for expected_possible_move in expected_possible_moves:
-            assert expected_possible_move in knight.possible_moves
+            assert algebraic_to_square(expected_possible_move) in knight.possible_moves
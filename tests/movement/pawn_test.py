@@ -1,7 +1,7 @@
 from pytest import mark as m
+from src.bitboard import square_index
 from src.board import Board
 from src.pieces import Pawn
-from src.utils import indexes_to_algebraic
 
 test_white_pawn = Pawn(row=6, column=4, is_white=True)
 test_black_pawn = Pawn(row=2, column=4, is_white=False)
@@ -42,8 +42,8 @@ class TestPawn:
             white_pawn = Pawn(row=initial_row, column=column, is_white=True)
             test_board.squares[initial_row][column] = white_pawn
             white_pawn.update_possible_moves(test_board.squares)
-            assert indexes_to_algebraic(initial_row - 1, column) in white_pawn.possible_moves
-            assert indexes_to_algebraic(initial_row - 2, column) in white_pawn.possible_moves
+            assert square_index(initial_row - 1, column) in white_pawn.possible_moves
+            assert square_index(initial_row - 2, column) in white_pawn.possible_moves
         test_board = Board()
         test_board.init_empty_board()
         next_row = initial_row - 1
@@ -51,8 +51,8 @@ class TestPawn:
             white_pawn = Pawn(row=next_row, column=column, is_white=True)
             test_board.squares[next_row][column] = white_pawn
             white_pawn.update_possible_moves(test_board.squares)
-            assert indexes_to_algebraic(next_row - 1, column) in white_pawn.possible_moves
-            assert indexes_to_algebraic(next_row - 2, column) not in white_pawn.possible_moves
+            assert square_index(next_row - 1, column) in white_pawn.possible_moves
+            assert square_index(next_row - 2, column) not in white_pawn.possible_moves
 
     @m.context("Test white pawn possible moves")
     @m.it("If next square is blocked by a white piece, pawn shouldn't be able to move")
@@ -65,8 +65,8 @@ class TestPawn:
         blocking_white_pawn = Pawn(initial_row - 1, initial_column, True)
         test_board.init_board_with_pieces(white_pawn, blocking_white_pawn)
         white_pawn.update_possible_moves(test_board.squares)
-        assert indexes_to_algebraic(initial_row - 1, initial_column) not in white_pawn.possible_moves
-        assert indexes_to_algebraic(initial_row - 2, initial_column) not in white_pawn.possible_moves
+        assert square_index(initial_row - 1, initial_column) not in white_pawn.possible_moves
+        assert square_index(initial_row - 2, initial_column) not in white_pawn.possible_moves
 
     @m.context("Test white pawn possible moves")
     @m.it("If next square is blocked by a black piece, pawn shouldn't be able to capture it")
@@ -79,8 +79,8 @@ class TestPawn:
         blocking_black_pawn = Pawn(initial_row - 1, initial_column, False)
         test_board.init_board_with_pieces(white_pawn, blocking_black_pawn)
         white_pawn.update_possible_moves(test_board.squares)
-        assert indexes_to_algebraic(initial_row - 1, initial_column) not in white_pawn.possible_moves
-        assert indexes_to_algebraic(initial_row - 2, initial_column) not in white_pawn.possible_moves
+        assert square_index(initial_row - 1, initial_column) not in white_pawn.possible_moves
+        assert square_index(initial_row - 2, initial_column) not in white_pawn.possible_moves
 
     @m.context("Test white pawn capture moves")
     @m.it("If next square is blocked by a black piece, pawn shouldn't be able to capture it")
@@ -97,9 +97,9 @@ class TestPawn:
         white_pawn.update_possible_moves(test_board.squares)
         print(test_board)
         assert white_pawn.capture_moves
-        assert indexes_to_algebraic(initial_row - 1, initial_column) not in white_pawn.capture_moves
-        assert indexes_to_algebraic(initial_row - 1, initial_column - 1) in white_pawn.capture_moves
-        assert indexes_to_algebraic(initial_row - 1, initial_column + 1) in white_pawn.capture_moves
+        assert square_index(initial_row - 1, initial_column) not in white_pawn.capture_moves
+        assert square_index(initial_row - 1, initial_column - 1) in white_pawn.capture_moves
+        assert square_index(initial_row - 1, initial_column + 1) in white_pawn.capture_moves
 
     @m.context("Test black pawn movement vectors")
     @m.it("Black pawn should have its correct movement vectors")
@@ -134,8 +134,8 @@ class TestPawn:
             black_pawn = Pawn(row=initial_row, column=column, is_white=False)
             test_board.squares[initial_row][column] = black_pawn
             black_pawn.update_possible_moves(test_board.squares)
-            assert indexes_to_algebraic(initial_row + 1, column) in black_pawn.possible_moves
-            assert indexes_to_algebraic(initial_row + 2, column) in black_pawn.possible_moves
+            assert square_index(initial_row + 1, column) in black_pawn.possible_moves
+            assert square_index(initial_row + 2, column) in black_pawn.possible_moves
         test_board = Board()
         test_board.init_empty_board()
         next_row = initial_row + 1
@@ -143,8 +143,8 @@ class TestPawn:
             black_pawn = Pawn(row=next_row, column=column, is_white=False)
             test_board.squares[next_row][column] = black_pawn
             black_pawn.update_possible_moves(test_board.squares)
-            assert indexes_to_algebraic(next_row + 1, column) in black_pawn.possible_moves
-            assert indexes_to_algebraic(next_row + 2, column) not in black_pawn.possible_moves
+            assert square_index(next_row + 1, column) in black_pawn.possible_moves
+            assert square_index(next_row + 2, column) not in black_pawn.possible_moves
 
     @m.context("Test black pawn possible moves")
     @m.it("If next square is blocked by a black piece, pawn shouldn't be able to move")
@@ -157,8 +157,8 @@ class TestPawn:
         blocking_black_pawn = Pawn(initial_row + 1, initial_column, False)
         test_board.init_board_with_pieces(black_pawn, blocking_black_pawn)
         black_pawn.update_possible_moves(test_board.squares)
-        assert indexes_to_algebraic(initial_row + 1, initial_column) not in black_pawn.possible_moves
-        assert indexes_to_algebraic(initial_row + 2, initial_column) not in black_pawn.possible_moves
+        assert square_index(initial_row + 1, initial_column) not in black_pawn.possible_moves
+        assert square_index(initial_row + 2, initial_column) not in black_pawn.possible_moves
 
     @m.context("Test black pawn possible moves")
     @m.it("If next square is blocked by a white piece, pawn shouldn't be able to capture it")
@@ -171,8 +171,8 @@ class TestPawn:
         blocking_white_pawn = Pawn(initial_row + 1, initial_column, True)
         test_board.init_board_with_pieces(black_pawn, blocking_white_pawn)
         black_pawn.update_possible_moves(test_board.squares)
-        assert indexes_to_algebraic(initial_row + 1, initial_column) not in black_pawn.possible_moves
-        assert indexes_to_algebraic(initial_row + 2, initial_column) not in black_pawn.possible_moves
+        assert square_index(initial_row + 1, initial_column) not in black_pawn.possible_moves
+        assert square_index(initial_row + 2, initial_column) not in black_pawn.possible_moves
 
     @m.context("Test black pawn capture moves")
     @m.it("If next square is blocked by a black piece, pawn shouldn't be able to capture it")
@@ -189,6 +189,6 @@ class TestPawn:
         black_pawn.update_possible_moves(test_board.squares)
         print(test_board)
         assert black_pawn.capture_moves
-        assert indexes_to_algebraic(initial_row + 1, initial_column) not in black_pawn.capture_moves
-        assert indexes_to_algebraic(initial_row + 1, initial_column - 1) in black_pawn.capture_moves
-        assert indexes_to_algebraic(initial_row + 1, initial_column + 1) in black_pawn.capture_moves
+        assert square_index(initial_row + 1, initial_column) not in black_pawn.capture_moves
+        assert square_index(initial_row + 1, initial_column - 1) in black_pawn.capture_moves
+        assert square_index(initial_row + 1, initial_column + 1) in black_pawn.capture_moves
@@ -1,6 +1,7 @@
 from pytest import mark as m
 from src.board import Board
 from src.pieces import Queen
+from src.utils import algebraic_to_square
 
 test_board = Board().init_empty_board()
 test_white_queen = Queen(row=6, column=4, is_white=True)
@@ -12,7 +13,16 @@ class TestQueenk:
     @m.context("Test queen movement vectors")
     @m.it("Queen should have its correct movement vectors")
     def test_movement_vectors_white_queen(self):
-        expected_white_queen_movement_vectors = [(-1, -1), (-1, 1), (-1, 0), (1, -1), (1, 1), (1, 0), (0, -1), (0, 1)]
+        expected_white_queen_movement_vectors = [
+            (-1, -1),
+            (-1, 1),
+            (-1, 0),
+            (1, -1),
+            (1, 1),
+            (1, 0),
+            (0, -1),
+            (0, 1),
+        ]
         assert all(
             [
                 movement_vector in test_white_queen._movement_vectors
@@ -48,11 +58,13 @@ class TestQueenk:
             "h1",
         ]
         expected_possible_moves = (
-            expected_possible_moves_same_column + expected_possible_moves_same_row + expected_possible_moves_diagonals
+            expected_possible_moves_same_column
+            + expected_possible_moves_same_row
+            + expected_possible_moves_diagonals
         )
         assert len(queen.possible_moves) == len(expected_possible_moves)
         for expected_possible_move in expected_possible_moves:
-            assert expected_possible_move in queen.possible_moves
+            assert algebraic_to_square(expected_possible_move) in queen.possible_moves
 
     @m.context("Test queen possible moves")
     @m.it("Queen shouldn't be able to move where a piece of the same color is")
@@ -77,11 +89,13 @@ class TestQueenk:
             "b1",
         ]
         expected_possible_moves = (
-            expected_possible_moves_same_column + expected_possible_moves_same_row + expected_possible_moves_diagonals
+            expected_possible_moves_same_column
+            + expected_possible_moves_same_row
+            + expected_possible_moves_diagonals
         )
         assert len(queen.possible_moves) == len(expected_possible_moves)
         for expected_possible_move in expected_possible_moves:
-            assert expected_possible_move in queen.possible_moves
+            assert algebraic_to_square(expected_possible_move) in queen.possible_moves
 
     @m.context("Test queen possible moves")
     @m.it("Queen should be able to move where a piece of the opposite color is")
@@ -99,8 +113,10 @@ class TestQueenk:
         expected_possible_moves_same_row = ["a4", "b4", "c4", "d4", "f4", "g4", "h4"]
         expected_possible_moves_diagonals = ["f5", "g6", "h7", "d3", "c2", "b1", "f3"]
         expected_possible_moves = (
-            expected_possible_moves_same_column + expected_possible_moves_same_row + expected_possible_moves_diagonals
+            expected_possible_moves_same_column
+            + expected_possible_moves_same_row
+            + expected_possible_moves_diagonals
         )
         assert len(queen.possible_moves) == len(expected_possible_moves)
         for expected_possible_move in expected_possible_moves:
-            assert expected_possible_move in queen.possible_moves
+            assert algebraic_to_square(expected_possible_move) in queen.possible_moves
@@ -1,6 +1,7 @@
 from pytest import mark as m
 from src.board import Board
 from src.pieces import Rook
+from src.utils import algebraic_to_square
 
 test_board = Board().init_empty_board()
 test_white_rook = Rook(row=6, column=4, is_white=True)
@@ -35,7 +36,7 @@ class TestRook:
         expected_moves = expected_possible_moves_same_column + expected_possible_moves_same_row
         assert len(rook.possible_moves) == len(expected_moves)
         for expected_possible_move in expected_moves:
-            assert expected_possible_move in rook.possible_moves
+            assert algebraic_to_square(expected_possible_move) in rook.possible_moves
 
     @m.context("Test rook possible moves")
     @m.it("Rook shouldn't be able to move if a same color piece blocks the way")
@@ -54,7 +55,7 @@ class TestRook:
         expected_moves = expected_possible_moves_same_column + expected_possible_moves_same_row
         assert len(rook_e4.possible_moves) == len(expected_moves)
         for expected_possible_move in expected_moves:
-            assert expected_possible_move in rook_e4.possible_moves
+            assert algebraic_to_square(expected_possible_move) in rook_e4.possible_moves
 
     @m.context("Test rook possible moves")
     @m.it("Rook should be able to capture opposing pieces")
@@ -73,4 +74,4 @@ class TestRook:
         expected_moves = expected_possible_moves_same_column + expected_possible_moves_same_row
         assert len(rook_e4.possible_moves) == len(expected_moves)
         for expected_possible_move in expected_moves:
-            assert expected_possible_move in rook_e4.possible_moves
+            assert algebraic_to_square(expected_possible_move) in rook_e4.possible_moves
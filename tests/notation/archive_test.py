@@ -0,0 +1,87 @@
+import os
+
+import pytest
+from pytest import mark as m
+from src.archive import (
+    BLACK_WINS,
+    DRAW,
+    INDEX_SUFFIX,
+    ArchiveReader,
+    ArchiveWriter,
+    GameRecord,
+    record_from_game,
+    record_from_pgn,
+)
+from src.game import Game
+from src.pgn import PgnGame
+from src.utils import algebraic_to_square
+
+SCHOLARS_MATE = PgnGame(
+    {"WhiteElo": "1500", "BlackElo": "1400"},
+    ["e4", "e5", "Bc4", "Nc6", "Qh5", "Nf6", "Qxf7#"],
+    "1-0",
+    0,
+)
+ENDGAME_FEN = "4k3/8/8/8/8/8/4P3/R3K3 w - - 0 1"
+
+
+def play(game: Game, *moves: str):
+    for move in moves:
+        game.start_turn(*game.get_players_to_move())
+        game.play_move(algebraic_to_square(move[:2]), algebraic_to_square(move[2:]))
+
+
+@pytest.fixture
+def archive_path(tmp_path):
+    path = str(tmp_path / "games.wgca")
+    endgame = Game.from_fen(ENDGAME_FEN)
+    play(endgame, "e2e4", "e8d7", "a1a7")
+    with ArchiveWriter(path) as writer:
+        assert writer.write_games([record_from_pgn(SCHOLARS_MATE), GameRecord([], DRAW)]) == 2
+    with ArchiveWriter(path) as writer:
+        writer.write_game(record_from_game(endgame, BLACK_WINS))
+    return path
+
+
+@m.describe("Test binary game archive")
+class TestArchive:
+    @m.context("Test records")
+    @m.it("Records appended in several batches should be read back from the index")
+    def test_read_records(self, archive_path):
+        with ArchiveReader(archive_path) as reader:
+            assert len(reader) == 3
+            first = reader.read_record(0)
+            assert len(first.moves) == 7
+            assert (first.white_rating, first.black_rating, first.fen) == (1500, 1400, None)
+            assert reader.read_record(1) == GameRecord([], DRAW)
+            last = reader.read_record(2)
+            assert last.result == BLACK_WINS
+            assert last.fen == ENDGAME_FEN
+            assert len(last.moves) == 3
+
+    @m.context("Test replay")
+    @m.it("Any game should be replayed to any ply through a Game")
+    def test_replay(self, archive_path):
+        with ArchiveReader(archive_path) as reader:
+            game = reader.replay(0)
+            assert game.checkmate
+            assert game.to_fen().startswith("r1bqkb1r/pppp1Qpp/2n2n2/4p3/2B1P3")
+            assert reader.replay(0, 2).to_fen().startswith("rnbqkbnr/pppp1ppp/8/4p3/4P3/")
+            assert reader.replay(2, 1).to_fen() == "4k3/8/8/8/4P3/8/8/R3K3 b - e3 0 1"
+            assert reader.replay_position(2).hash == reader.replay(2).board.position.hash
+            assert reader.replay_position(2, 1).hash == reader.replay(2, 1).board.position.hash
+            for ply in (4, -1):
+                with pytest.raises(IndexError, match=f"Game 2 has no ply {ply}"):
+                    reader.replay(2, ply)
+                with pytest.raises(IndexError, match=f"Game 2 has no ply {ply}"):
+                    reader.replay_position(2, ply)
+
+    @m.context("Test index")
+    @m.it("A missing index file should be rebuilt by scanning the records")
+    def test_scan_without_index(self, archive_path):
+        with ArchiveReader(archive_path) as reader:
+            offsets = list(reader.offsets)
+        os.remove(archive_path + INDEX_SUFFIX)
+        with ArchiveReader(archive_path) as reader:
+            assert reader.offsets == offsets
+            assert [len(moves) for moves in reader.iter_moves()] == [7, 0, 3]
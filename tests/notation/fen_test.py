@@ -0,0 +1,83 @@
+from pytest import mark as m
+from src.bitboard import BLACK, WHITE
+from src.fen import parse_fen, position_to_fen
+from src.game import Game
+from src.move import DOUBLE_PAWN_PUSH, encode_move
+from src.perft import START_FEN
+from src.pieces import King, Pawn
+from src.utils import algebraic_to_square
+
+EN_PASSANT_FEN = "rnbqkbnr/ppp1pppp/8/8/3pP3/8/PPPP1PPP/RNBQKBNR b KQkq e3 0 3"
+ENDGAME_FEN = "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 12 40"
+
+
+@m.describe("Test FEN import and export")
+class TestFen:
+    @m.context("Test round trip")
+    @m.it("Exported FENs should match the imported ones")
+    def test_round_trip(self):
+        for fen in (START_FEN, EN_PASSANT_FEN, ENDGAME_FEN):
+            assert position_to_fen(parse_fen(fen)) == fen
+            assert Game.from_fen(fen).to_fen() == fen
+        assert Game().to_fen() == START_FEN
+
+    @m.context("Test game setup")
+    @m.it("The board, players and side to move should be filled from the FEN")
+    def test_game_from_fen(self):
+        game = Game.from_fen(ENDGAME_FEN)
+        assert game.board.position.turn == WHITE
+        assert len(game.player_1.own_pieces) == 5
+        assert len(game.player_2.own_pieces) == 5
+        assert all(piece.is_white for piece in game.player_1.own_pieces)
+        king = game.board.pieces[algebraic_to_square("a5")]
+        assert isinstance(king, King) and king in game.player_1.own_pieces
+        assert (king.row, king.column) == (3, 0)
+        assert game.player_1.get_piece(algebraic_to_square("a5")) is king
+        assert game.player_1.king_square == algebraic_to_square("a5")
+        assert game.player_1.get_pieces(King) == [king]
+        assert game.board.position.hash == game.board.position.compute_hash()
+
+    @m.context("Test en passant")
+    @m.it("An en passant square should let the side to move capture en passant")
+    def test_en_passant_from_fen(self):
+        game = Game.from_fen(EN_PASSANT_FEN)
+        assert game.board.position.en_passant == algebraic_to_square("e3")
+        assert game.board.pieces[algebraic_to_square("e3")] is None
+        game.update_legal_moves(game.player_2)
+        pawn = game.board.pieces[algebraic_to_square("d4")]
+        assert isinstance(pawn, Pawn) and pawn.color == BLACK
+        assert algebraic_to_square("e3") in pawn.capture_moves
+
+    @m.context("Test move counters")
+    @m.it("Game moves and position make and unmake should keep the move counters")
+    def test_move_counters(self):
+        game = Game()
+        game.update_legal_moves(game.player_1)
+        knight = game.board.pieces[algebraic_to_square("g1")]
+        game.move_piece(
+            game.player_1,
+            knight,
+            game.player_2,
+            algebraic_to_square("g1"),
+            algebraic_to_square("f3"),
+        )
+        assert game.to_fen().endswith(" b KQkq - 1 1")
+        position = game.board.position
+        position.make_move(
+            encode_move(algebraic_to_square("e7"), algebraic_to_square("e5"), DOUBLE_PAWN_PUSH)
+        )
+        assert game.to_fen().endswith(" w KQkq e6 0 2")
+        position.unmake_move()
+        assert game.to_fen().endswith(" b KQkq - 1 1")
+
+    @m.context("Test castling rights")
+    @m.it("Moving a king or rook through the game should drop its castling rights")
+    def test_castling_rights_after_game_moves(self):
+        game = Game.from_fen("r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1")
+        game.update_legal_moves(game.player_1)
+        rook = game.board.pieces[algebraic_to_square("h1")]
+        game.move_piece(
+            game.player_1, rook, game.player_2, algebraic_to_square("h1"), algebraic_to_square("h8")
+        )
+        assert game.to_fen() == "r3k2R/8/8/8/8/8/8/R3K3 b Qq - 0 1"
+        assert game.board.position.hash == game.board.position.compute_hash()
@@ -0,0 +1,81 @@
+import pytest
+from pytest import mark as m
+from src.exceptions import InvalidSanException
+from src.fen import parse_fen
+from src.move import move_to_algebraic
+from src.pgn import PgnReader, iter_game_moves, iter_pgn_games, san_to_move
+
+PGN = """[Event "First"]
+[White "Alice"]
+[Black "Bob \\"B\\" Smith"]
+[Result "0-1"]
+
+1. e4 e5 2. Nf3 {Main line} Nc6 (2... d6 3. d4 (3. Bc4)) 3. Bc4 $1 Nd4? 4. Nxe5 Qg5
+5. Nxf7 Qxg2 6. Rf1 Qxe4+ 7. Be2 Nf3# 0-1
+
+[Event "Second"]
+[FEN "4k3/8/8/8/8/8/8/R3K3 w - - 0 1"]
+
+1. Ra8# 1-0
+
+[Event "Third"]
+
+1. d4 d5 2. c4 ; a comment
+1/2-1/2
+"""
+
+
+@pytest.fixture
+def pgn_path(tmp_path):
+    path = tmp_path / "games.pgn"
+    path.write_text(PGN)
+    return str(path)
+
+
+@m.describe("Test streaming PGN reader")
+class TestPgnReader:
+    @m.context("Test game splitting")
+    @m.it("Games should be yielded with headers, mainline moves and result")
+    def test_iter_games(self, pgn_path):
+        games = list(iter_pgn_games(pgn_path))
+        assert len(games) == 3
+        assert games[0].headers["Black"] == 'Bob "B" Smith'
+        assert games[0].moves[:5] == ["e4", "e5", "Nf3", "Nc6", "Bc4"]
+        assert games[0].moves[-1] == "Nf3#"
+        assert games[0].result == "0-1"
+        assert games[2].moves == ["d4", "d5", "c4"]
+        assert games[2].result == "1/2-1/2"
+
+    @m.context("Test offset index")
+    @m.it("Any game should be reachable from the offset index")
+    def test_game_by_number(self, pgn_path):
+        with PgnReader(pgn_path) as reader:
+            assert reader.game(2).headers["Event"] == "Third"
+            assert len(reader.offsets) == 3
+            assert reader.game(1).headers["Event"] == "Second"
+            assert len(reader) == 3
+            assert [game.headers["Event"] for game in reader.iter_games(1)] == ["Second", "Third"]
+            with pytest.raises(IndexError):
+                reader.game(3)
+
+    @m.context("Test move resolution")
+    @m.it("SAN moves should resolve to legal moves from the game start or FEN tag")
+    def test_resolve_moves(self, pgn_path):
+        games = list(iter_pgn_games(pgn_path))
+        moves = [move_to_algebraic(move) for move in iter_game_moves(games[0])]
+        assert moves[:3] == ["e2e4", "e7e5", "g1f3"]
+        assert moves[-1] == "d4f3"
+        assert [move_to_algebraic(move) for move in iter_game_moves(games[1])] == ["a1a8"]
+
+    @m.context("Test move resolution")
+    @m.it("Disambiguated, ambiguous and illegal SAN moves should be handled")
+    def test_san_disambiguation(self):
+        position = parse_fen("4k3/8/8/8/8/8/4K3/R6R w - - 0 1")
+        assert move_to_algebraic(san_to_move(position, "Rad1")) == "a1d1"
+        assert move_to_algebraic(san_to_move(position, "Rhd1")) == "h1d1"
+        with pytest.raises(InvalidSanException):
+            san_to_move(position, "Rd1")
+        with pytest.raises(InvalidSanException):
+            san_to_move(position, "Nf3")
+        with pytest.raises(InvalidSanException):
+            san_to_move(position, "O-O")
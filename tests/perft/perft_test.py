@@ -0,0 +1,37 @@
+from pytest import mark as m
+from src.board import Board
+from src.fen import parse_fen
+from src.perft import PERFT_SUITE, START_FEN, divide, perft
+
+MAX_TEST_NODES = 50000
+
+
+@m.describe("Test perft node counts")
+class TestPerft:
+    @m.context("Test bundled positions")
+    @m.it("Every bundled position should match its reference node counts")
+    def test_suite(self):
+        for _, fen, expected_nodes in PERFT_SUITE:
+            position = parse_fen(fen)
+            for depth, expected in expected_nodes.items():
+                if expected <= MAX_TEST_NODES:
+                    assert perft(position, depth) == expected
+
+    @m.context("Test divide")
+    @m.it("Divide should add up to the perft count of the position")
+    def test_divide(self):
+        position = parse_fen(START_FEN)
+        results = divide(position, 3)
+        assert len(results) == 20
+        assert results["e2e4"] == 600
+        assert sum(results.values()) == 8902
+
+    @m.context("Test board position")
+    @m.it("Perft should run over the position of a game board and leave it untouched")
+    def test_board_perft(self):
+        board = Board()
+        board.init_board()
+        occupied = board.position.occupied
+        assert perft(board.position, 3) == 8902
+        assert board.position.occupied == occupied
+        assert board.position.history == []
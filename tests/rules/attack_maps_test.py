@@ -0,0 +1,67 @@
+import random
+
+from pytest import mark as m
+from src.attack_maps import AttackMaps
+from src.bitboard import BLACK, WHITE
+from src.game import Game
+from src.move import move_destination, move_origin
+from src.movegen import generate_legal_moves
+from src.utils import algebraic_to_square
+
+
+def play_random_moves(game: Game, plies: int, seed: int):
+    generator = random.Random(seed)
+    attacking_player, defending_player = game.player_1, game.player_2
+    for _ in range(plies):
+        moves = generate_legal_moves(game.board.position, attacking_player.color)
+        if not moves:
+            return
+        game.update_legal_moves(attacking_player)
+        move = generator.choice(moves)
+        origin, destination = move_origin(move), move_destination(move)
+        game.move_piece(
+            attacking_player, game.board.pieces[origin], defending_player, origin, destination
+        )
+        yield
+        attacking_player, defending_player = defending_player, attacking_player
+
+
+@m.describe("Test incremental attack maps")
+class TestAttackMaps:
+    @m.context("Test incremental updates")
+    @m.it("Maps updated move by move should match maps built from scratch")
+    def test_incremental_matches_rebuild(self):
+        for seed in range(3):
+            game = Game()
+            for _ in play_random_moves(game, 60, seed):
+                position = game.board.position
+                rebuilt = AttackMaps(position)
+                assert game.attack_maps.hash == position.hash
+                assert game.attack_maps.attackers == rebuilt.attackers
+                assert game.attack_maps.attacked == rebuilt.attacked
+                for square in range(64):
+                    for color in (WHITE, BLACK):
+                        assert game.is_square_attacked(square, color) == (
+                            position.is_square_attacked(square, color)
+                        )
+
+    @m.context("Test check detection")
+    @m.it("A pawn giving check should be reported as a checking piece")
+    def test_pawn_check(self):
+        game = Game.from_fen("4k3/8/8/8/8/8/3p4/4K3 w - - 0 1")
+        checkers = game._get_opposite_checking_pieces(game.player_2, game.player_1)
+        assert checkers == [game.board.pieces[algebraic_to_square("d2")]]
+        assert game.is_square_attacked(algebraic_to_square("e1"), BLACK)
+        assert game.is_square_attacked(algebraic_to_square("d1"), WHITE)
+
+    @m.context("Test lazy construction")
+    @m.it("The maps should only be built once attacks are asked for")
+    def test_lazy_construction(self):
+        game = Game()
+        assert game.attack_maps is None
+        assert not game.is_square_attacked(algebraic_to_square("e4"), BLACK)
+        attack_maps = game.attack_maps
+        assert attack_maps is not None and attack_maps.hash == game.board.position.hash
+        game.play_move(algebraic_to_square("e2"), algebraic_to_square("e4"))
+        assert game.attack_maps is attack_maps
+        assert game.is_square_attacked(algebraic_to_square("d5"), WHITE)
@@ -1,13 +1,13 @@
 from pytest import mark as m
 from src.game import Game
-from src.pieces import EnPassantPawn, Pawn
-from src.utils import algebraic_to_indexes
+from src.pieces import Pawn
+from src.utils import algebraic_to_indexes, algebraic_to_square
 
 
 @m.describe("Test game logic special capture cases")
 class TestCaptureSpecialCases:
     @m.context("Test en passant capture white to black")
-    @m.it("should create a en passant pawn when moving two squares from start")
+    @m.it("should set the en passant square when moving two squares from start")
     def test_en_passant_creation_white(self):
         game = Game()
         game.board.init_empty_board()
@@ -18,10 +18,17 @@ class TestCaptureSpecialCases:
         game.board.init_board_with_pieces(moving_pawn, defending_pawn)
         game.update_all_player_moves(game.player_1)
         game.update_all_player_moves(game.player_2)
-        game.move_piece_to_square(moving_pawn, "e2", "e4", game.player_1, game.player_2)
+        game.move_piece_to_square(
+            moving_pawn,
+            algebraic_to_square("e2"),
+            algebraic_to_square("e4"),
+            game.player_1,
+            game.player_2,
+        )
         dest_row_index, dest_column_index = algebraic_to_indexes("e4")
         assert game.board.squares[dest_row_index][dest_column_index] == moving_pawn
-        assert isinstance(game.board.squares[dest_row_index + 1][dest_column_index], EnPassantPawn)
+        assert game.board.squares[dest_row_index + 1][dest_column_index] is None
+        assert game.board.position.en_passant == algebraic_to_square("e3")
 
     @m.context("Test en passant capture white to black")
     @m.it("black captures en passant pawn, also removes original pawn")
@@ -35,17 +42,30 @@ class TestCaptureSpecialCases:
         game.board.init_board_with_pieces(moving_pawn, defending_pawn)
         game.update_all_player_moves(game.player_1)
         game.update_all_player_moves(game.player_2)
-        game.move_piece_to_square(moving_pawn, "e2", "e4", game.player_1, game.player_2)
+        game.move_piece_to_square(
+            moving_pawn,
+            algebraic_to_square("e2"),
+            algebraic_to_square("e4"),
+            game.player_1,
+            game.player_2,
+        )
         dest_row_index, dest_column_index = algebraic_to_indexes("e4")
         game.update_all_player_moves(game.player_1)
         game.update_all_player_moves(game.player_2)
-        game.move_piece_to_square(defending_pawn, "d4", "e3", game.player_2, game.player_1)
+        game.move_piece_to_square(
+            defending_pawn,
+            algebraic_to_square("d4"),
+            algebraic_to_square("e3"),
+            game.player_2,
+            game.player_1,
+        )
         assert game.board.squares[dest_row_index][dest_column_index] == None
         assert game.board.squares[dest_row_index + 1][dest_column_index] == defending_pawn
         assert len(game.player_1.own_pieces) == 0
+        assert game.board.position.en_passant is None
 
     @m.context("Test en passant capture black to white")
-    @m.it("should create a en passant pawn when moving two squares from start")
+    @m.it("should set the en passant square when moving two squares from start")
     def test_en_passant_creation_black_to_white(self):
         game = Game()
         game.board.init_empty_board()
@@ -56,10 +76,17 @@ class TestCaptureSpecialCases:
         game.board.init_board_with_pieces(moving_pawn, defending_pawn)
         game.update_all_player_moves(game.player_1)
         game.update_all_player_moves(game.player_2)
-        game.move_piece_to_square(moving_pawn, "d7", "d5", game.player_2, game.player_1)
+        game.move_piece_to_square(
+            moving_pawn,
+            algebraic_to_square("d7"),
+            algebraic_to_square("d5"),
+            game.player_2,
+            game.player_1,
+        )
         dest_row_index, dest_column_index = algebraic_to_indexes("d5")
         assert game.board.squares[dest_row_index][dest_column_index] == moving_pawn
-        assert isinstance(game.board.squares[dest_row_index - 1][dest_column_index], EnPassantPawn)
+        assert game.board.squares[dest_row_index - 1][dest_column_index] is None
+        assert game.board.position.en_passant == algebraic_to_square("d6")
 
     @m.context("Test en passant capture white to black")
     @m.it("black captures en passant pawn, also removes original pawn")
@@ -73,12 +100,43 @@ class TestCaptureSpecialCases:
         game.board.init_board_with_pieces(moving_pawn, defending_pawn)
         game.update_all_player_moves(game.player_1)
         game.update_all_player_moves(game.player_2)
-        game.move_piece_to_square(moving_pawn, "d7", "d5", game.player_2, game.player_1)
+        game.move_piece_to_square(
+            moving_pawn,
+            algebraic_to_square("d7"),
+            algebraic_to_square("d5"),
+            game.player_2,
+            game.player_1,
+        )
         dest_row_index, dest_column_index = algebraic_to_indexes("d5")
         game.update_all_player_moves(game.player_1)
         game.update_all_player_moves(game.player_2)
         print(defending_pawn.capture_moves + defending_pawn.possible_moves)
-        game.move_piece_to_square(defending_pawn, "e5", "d6", game.player_1, game.player_2)
+        game.move_piece_to_square(
+            defending_pawn,
+            algebraic_to_square("e5"),
+            algebraic_to_square("d6"),
+            game.player_1,
+            game.player_2,
+        )
         assert game.board.squares[dest_row_index][dest_column_index] == None
         assert game.board.squares[dest_row_index - 1][dest_column_index] == defending_pawn
         assert len(game.player_2.own_pieces) == 0
+
+    @m.context("Test en passant square")
+    @m.it("The en passant square should only last for the reply to the double push")
+    def test_en_passant_square_expires(self):
+        game = Game()
+        for origin, destination in (("e2", "e4"), ("a7", "a6"), ("e4", "e5"), ("d7", "d5")):
+            game.start_turn(*game.get_players_to_move())
+            game.play_move(algebraic_to_square(origin), algebraic_to_square(destination))
+        assert game.board.position.en_passant == algebraic_to_square("d6")
+        game.start_turn(*game.get_players_to_move())
+        pawn = game.board.pieces[algebraic_to_square("e5")]
+        assert algebraic_to_square("d6") in pawn.capture_moves
+        game.play_move(algebraic_to_square("g1"), algebraic_to_square("f3"))
+        assert game.board.position.en_passant is None
+        game.start_turn(*game.get_players_to_move())
+        game.play_move(algebraic_to_square("a6"), algebraic_to_square("a5"))
+        game.start_turn(*game.get_players_to_move())
+        assert pawn.capture_moves == []
+        assert game.board.position.hash == game.board.position.compute_hash()
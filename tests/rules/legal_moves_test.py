@@ -0,0 +1,233 @@
+import random
+
+import pytest
+from pytest import mark as m
+from src.bitboard import BLACK, WHITE
+from src.board import Board
+from src.exceptions import ImpossibleMoveException
+from src.game import Game
+from src.move import (
+    CAPTURE,
+    DOUBLE_PAWN_PUSH,
+    EN_PASSANT,
+    encode_move,
+    is_capture,
+    move_to_algebraic,
+)
+from src.fen import parse_fen
+from src.movegen import (
+    CAPTURE_STAGE,
+    QUIET_STAGE,
+    generate_legal_moves,
+    has_legal_move,
+    is_legal_move,
+    iter_legal_moves,
+)
+from src.perft import START_FEN
+from src.pieces import Bishop, King, Knight, Pawn, Queen, Rook
+from src.utils import algebraic_to_square
+
+
+def legal_moves(board: Board, color: int):
+    return sorted(move_to_algebraic(move) for move in generate_legal_moves(board.position, color))
+
+
+def empty_board(*pieces) -> Board:
+    board = Board()
+    board.init_empty_board()
+    board.init_board_with_pieces(*pieces)
+    return board
+
+
+@m.describe("Test legal move generation")
+class TestLegalMoves:
+    @m.context("Test initial position")
+    @m.it("Each side should have twenty legal moves in the initial position")
+    def test_initial_position(self):
+        board = Board()
+        board.init_board()
+        assert len(legal_moves(board, WHITE)) == 20
+        assert len(legal_moves(board, BLACK)) == 20
+
+    @m.context("Test pinned pieces")
+    @m.it("A pinned rook should only move along the pin ray")
+    def test_pinned_rook(self):
+        # King e1, rook e2 pinned by queen e8
+        board = empty_board(King(7, 4, True), Rook(6, 4, True), Queen(0, 4, False))
+        rook_moves = [move for move in legal_moves(board, WHITE) if move.startswith("e2")]
+        assert rook_moves == ["e2e3", "e2e4", "e2e5", "e2e6", "e2e7", "e2e8"]
+
+    @m.context("Test pinned pieces")
+    @m.it("A pinned knight should not be able to move")
+    def test_pinned_knight(self):
+        board = empty_board(King(7, 4, True), Knight(6, 3, True), Bishop(4, 1, False))
+        assert not [move for move in legal_moves(board, WHITE) if move.startswith("d2")]
+
+    @m.context("Test check evasions")
+    @m.it("In check, only blocks, captures of the checker and king moves should be legal")
+    def test_single_check(self):
+        # King e1 checked by rook e8, white rook a4 can block on e4, bishop b5 can capture
+        board = empty_board(
+            King(7, 4, True), Rook(0, 4, False), Rook(4, 0, True), Bishop(3, 1, True)
+        )
+        moves = legal_moves(board, WHITE)
+        assert "a4e4" in moves
+        assert "b5e8" in moves
+        assert "a4a5" not in moves
+        assert "e1e2" not in moves
+        assert "e1d1" in moves
+
+    @m.context("Test check evasions")
+    @m.it("In double check, only the king should be able to move")
+    def test_double_check(self):
+        board = empty_board(
+            King(7, 4, True), Rook(0, 4, False), Bishop(4, 1, False), Rook(4, 0, True)
+        )
+        assert all(move.startswith("e1") for move in legal_moves(board, WHITE))
+
+    @m.context("Test en passant")
+    @m.it("En passant should not be legal when it exposes the king along the row")
+    def test_en_passant_discovered_check(self):
+        board = empty_board(
+            King(3, 0, True), Pawn(3, 1, True), Pawn(1, 2, False), Rook(3, 7, False)
+        )
+        c7, c5 = algebraic_to_square("c7"), algebraic_to_square("c5")
+        board.position.make_move(encode_move(c7, c5, DOUBLE_PAWN_PUSH))
+        assert "b5c6" not in legal_moves(board, WHITE)
+        board.position.unmake_move()
+        board.init_board_with_pieces(Rook(3, 7, True))
+        board.position.make_move(encode_move(c7, c5, DOUBLE_PAWN_PUSH))
+        assert "b5c6" in legal_moves(board, WHITE)
+
+    @m.context("Test game legal moves")
+    @m.it("Game should only expose legal moves on the pieces of the player")
+    def test_game_update_legal_moves(self):
+        game = Game()
+        game.board.init_empty_board()
+        king = King(7, 4, True)
+        rook = Rook(6, 4, True)
+        pawn = Pawn(6, 3, True)
+        game.player_1.own_pieces = [king, rook, pawn]
+        game.player_2.own_pieces = [Queen(0, 4, False), Bishop(3, 0, False)]
+        game.board.init_board_with_pieces(*game.player_1.own_pieces, *game.player_2.own_pieces)
+        game.update_legal_moves(game.player_1)
+        assert algebraic_to_square("e3") in rook.possible_moves
+        assert algebraic_to_square("d2") not in rook.possible_moves
+        assert pawn.possible_moves == [] and pawn.capture_moves == []
+
+    @m.context("Test staged generation")
+    @m.it("Captures, en passant included, should come before quiet moves")
+    def test_staged_generation(self):
+        position = parse_fen("4k3/8/8/3pP3/8/2n5/8/R3K3 w - d6 0 1")
+        moves = list(iter_legal_moves(position, WHITE))
+        captures = generate_legal_moves(position, WHITE, CAPTURE_STAGE)
+        quiets = generate_legal_moves(position, WHITE, QUIET_STAGE)
+        assert sorted(moves) == sorted(generate_legal_moves(position, WHITE))
+        assert moves == captures + quiets
+        assert sorted(move_to_algebraic(move) for move in captures) == ["e5d6"]
+        assert all(is_capture(move) for move in captures)
+        assert not any(is_capture(move) for move in quiets)
+
+    @m.context("Test staged generation")
+    @m.it("Later stages should only be generated when they are reached")
+    def test_stages_are_lazy(self, monkeypatch):
+        game = Game()
+        generated_stages = []
+        original_generate = generate_legal_moves
+
+        def recording_generate(position, color, stages):
+            generated_stages.append(stages)
+            return original_generate(position, color, stages)
+
+        monkeypatch.setattr("src.movegen.generate_legal_moves", recording_generate)
+        moves = game.iter_legal_moves(stages=(QUIET_STAGE, CAPTURE_STAGE))
+        assert next(moves)
+        assert generated_stages == [QUIET_STAGE]
+        assert len(list(moves)) == 19
+        assert generated_stages == [QUIET_STAGE, CAPTURE_STAGE]
+
+    @m.context("Test game termination")
+    @m.it("The early exit check should agree with full generation in played out games")
+    def test_has_legal_move(self):
+        generator = random.Random(7)
+        for _ in range(20):
+            position = parse_fen(START_FEN)
+            for _ in range(150):
+                moves = generate_legal_moves(position, position.turn)
+                assert has_legal_move(position, position.turn) == bool(moves)
+                if not moves:
+                    break
+                position.make_move(generator.choice(moves))
+
+    @m.context("Test game termination")
+    @m.it("Games should tell checkmate from stalemate, en passant escapes included")
+    def test_game_termination(self):
+        cases = [
+            ("7k/6Q1/5K2/8/8/8/8/8 b - - 0 1", True, False),
+            ("7k/8/6Q1/5K2/8/8/8/8 b - - 0 1", False, True),
+            ("8/8/8/8/k2Pp2Q/8/8/3K4 b - d3 0 1", False, False),
+        ]
+        for fen, checkmate, stalemate in cases:
+            game = Game.from_fen(fen)
+            assert game.start_turn(*game.get_players_to_move()) == (not checkmate and not stalemate)
+            assert (game.checkmate, game.stalemate) == (checkmate, stalemate)
+
+    @m.context("Test cached legal moves")
+    @m.it("Legal moves should be generated once per position and validate moves by lookup")
+    def test_cached_legal_moves(self, monkeypatch):
+        game = Game()
+        generated = []
+        original_generate = generate_legal_moves
+
+        def recording_generate(position, color, *args):
+            generated.append(color)
+            return original_generate(position, color, *args)
+
+        monkeypatch.setattr("src.game.generate_legal_moves", recording_generate)
+        game.start_turn(*game.get_players_to_move())
+        legal_moves = game.get_legal_moves()
+        assert len(legal_moves) == 20
+        g1, f3 = algebraic_to_square("g1"), algebraic_to_square("f3")
+        assert legal_moves[(g1, f3)] == encode_move(g1, f3)
+        for origin, destination in (("e2", "e5"), ("g1", "g3"), ("e1", "e2")):
+            with pytest.raises(ImpossibleMoveException):
+                game.play_move(algebraic_to_square(origin), algebraic_to_square(destination))
+        assert game.get_legal_moves() is legal_moves
+        assert generated == [WHITE]
+        game.play_move(algebraic_to_square("e2"), algebraic_to_square("e4"))
+        game.start_turn(*game.get_players_to_move())
+        assert (algebraic_to_square("e7"), algebraic_to_square("e5")) in game.get_legal_moves()
+        assert generated == [WHITE, BLACK]
+
+    @m.context("Test staged generation")
+    @m.it("Single moves should be checked by generating only their piece and stage")
+    def test_is_legal_move(self):
+        position = parse_fen("4k3/8/8/3pP3/8/2n5/8/R3K3 w - d6 0 1")
+        legal = generate_legal_moves(position, WHITE)
+        for origin in range(64):
+            for destination in range(64):
+                for flags in (0, CAPTURE, EN_PASSANT, DOUBLE_PAWN_PUSH):
+                    move = encode_move(origin, destination, flags)
+                    assert is_legal_move(position, move) == (move in legal)
+
+    @m.context("Test move validation")
+    @m.it("Moving a piece to a square should only accept legal moves and keep their flags")
+    def test_move_piece_to_square_validation(self):
+        game = Game.from_fen("4k3/8/8/3pP3/8/8/8/4K3 w - d6 0 1")
+        pawn = game.board.pieces[algebraic_to_square("e5")]
+        position = game.board.position
+        initial_hash = position.hash
+        for destination in ("e7", "f6", "d5"):
+            with pytest.raises(ImpossibleMoveException):
+                game.move_piece_to_square(
+                    pawn,
+                    algebraic_to_square("e5"),
+                    algebraic_to_square(destination),
+                    game.player_1,
+                    game.player_2,
+                )
+        assert position.hash == initial_hash and game.hash_history == []
+        e5, d6 = algebraic_to_square("e5"), algebraic_to_square("d6")
+        game.move_piece_to_square(pawn, e5, d6, game.player_1, game.player_2)
+        assert game.move_history == [encode_move(e5, d6, EN_PASSANT)]
+        assert game.board.pieces[algebraic_to_square("d5")] is None
@@ -0,0 +1,58 @@
+import random
+
+from pytest import mark as m
+from src.bitboard import BLACK, KNIGHT, WHITE, piece_code
+from src.fen import parse_fen
+from src.game import Game
+from src.material import is_dead_position, piece_count
+from src.movegen import generate_legal_moves
+from src.perft import START_FEN
+from src.utils import algebraic_to_square
+
+
+def is_dead(fen: str) -> bool:
+    return is_dead_position(parse_fen(fen).material)
+
+
+@m.describe("Test material signatures")
+class TestMaterial:
+    @m.context("Test incremental updates")
+    @m.it("The signature should match a full count after every move and take back")
+    def test_incremental_signature(self):
+        generator = random.Random(5)
+        position = parse_fen(START_FEN)
+        assert piece_count(position.material, piece_code(BLACK, KNIGHT)) == 2
+        for _ in range(120):
+            moves = generate_legal_moves(position, position.turn)
+            if not moves:
+                break
+            position.make_move(generator.choice(moves))
+            assert position.material == position.compute_material()
+        while position.history:
+            position.unmake_move()
+            assert position.material == position.compute_material()
+
+    @m.context("Test dead positions")
+    @m.it("Only material that can never mate should make a dead position")
+    def test_dead_positions(self):
+        assert is_dead("8/8/8/4k3/8/8/8/4K3 w - - 0 1")
+        assert is_dead("8/8/8/4k3/8/8/8/2B1K3 w - - 0 1")
+        assert is_dead("8/8/8/4k3/8/8/8/4K1n1 b - - 0 1")
+        assert is_dead("2b5/8/8/4k3/8/8/8/4KB2 w - - 0 1")
+        assert is_dead("2b5/8/8/4k3/8/3B4/8/4KB2 w - - 0 1")
+        assert not is_dead("1b6/8/8/4k3/8/8/8/4KB2 w - - 0 1")
+        assert not is_dead("8/8/8/4k3/8/8/8/1N2KN2 w - - 0 1")
+        assert not is_dead("8/8/8/4k3/8/8/4P3/4K3 w - - 0 1")
+        assert not is_dead(START_FEN)
+
+    @m.context("Test game")
+    @m.it("Games should end once a capture leaves a dead position")
+    def test_game_dead_position(self):
+        game = Game.from_fen("8/8/8/4k3/8/8/8/2rK4 w - - 0 1")
+        assert game.start_turn(*game.get_players_to_move())
+        game.play_move(algebraic_to_square("d1"), algebraic_to_square("c1"))
+        assert game.board.position.material == game.board.position.compute_material()
+        assert not game.start_turn(*game.get_players_to_move())
+        assert game.dead_position
+        assert not game.checkmate and not game.stalemate
+        assert piece_count(game.board.position.material, piece_code(WHITE, KNIGHT)) == 0
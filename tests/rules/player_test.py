@@ -0,0 +1,43 @@
+from pytest import mark as m
+from src.bitboard import KING
+from src.game import Game
+from src.pieces import Knight, Pawn
+from src.utils import algebraic_to_square
+
+from .attack_maps_test import play_random_moves
+
+
+@m.describe("Test player piece indexes")
+class TestPlayer:
+    @m.context("Test indexes")
+    @m.it("Square, type and king indexes should follow the board through a game")
+    def test_indexes_follow_board(self):
+        for seed in range(3):
+            game = Game()
+            for _ in play_random_moves(game, 80, seed):
+                position = game.board.position
+                for player in (game.player_1, game.player_2):
+                    board_pieces = {
+                        square: piece
+                        for square, piece in enumerate(game.board.pieces)
+                        if piece is not None and piece.is_white == player.is_white
+                    }
+                    assert player.pieces_by_square == board_pieces
+                    assert player.king_square == position.king_square(player.color)
+                    for piece_type, pieces in player.pieces_by_type.items():
+                        assert all(type(piece) is piece_type for piece in pieces.values())
+                    assert sum(map(len, player.pieces_by_type.values())) == len(board_pieces)
+
+    @m.context("Test indexes")
+    @m.it("Pieces should be found by type and square without scanning")
+    def test_lookups(self):
+        game = Game()
+        assert len(game.player_1.get_pieces(Knight)) == 2
+        assert len(game.player_2.get_pieces(Pawn)) == 8
+        assert game.player_1.king_square == algebraic_to_square("e1")
+        assert game.player_2.get_piece(algebraic_to_square("e8")).code % 6 == KING
+        assert game.player_1.get_piece(algebraic_to_square("e8")) is None
+        game.play_move(algebraic_to_square("e2"), algebraic_to_square("e4"))
+        assert game.player_1.get_piece(algebraic_to_square("e3")) is None
+        game.play_move(algebraic_to_square("e7"), algebraic_to_square("e5"))
+        assert game.player_1.get_piece(algebraic_to_square("e4")) in game.player_1.get_pieces(Pawn)
@@ -0,0 +1,68 @@
+import random
+
+import pytest
+from pytest import mark as m
+from src.book import BEST_MOVE, ENTRY, OpeningBook, build_book
+from src.fen import parse_fen
+from src.game import Game
+from src.move import move_to_algebraic
+from src.perft import START_FEN
+
+PGN = """[Result "1-0"]
+
+1. e4 e5 2. Nf3 Nc6 1-0
+
+[Result "1/2-1/2"]
+
+1. e4 c5 2. Nf3 d6 1/2-1/2
+
+[Result "1/2-1/2"]
+
+1. d4 d5 2. c4 e6 1/2-1/2
+"""
+
+
+@pytest.fixture
+def book_path(tmp_path):
+    pgn_path = tmp_path / "games.pgn"
+    pgn_path.write_text(PGN)
+    path = str(tmp_path / "book.bin")
+    assert build_book([str(pgn_path)], path, max_plies=3) == 7
+    return path
+
+
+@m.describe("Test opening book")
+class TestOpeningBook:
+    @m.context("Test book file")
+    @m.it("Built books should hold entries sorted by key")
+    def test_sorted_entries(self, book_path):
+        with open(book_path, "rb") as file:
+            data = file.read()
+        keys = [ENTRY.unpack_from(data, offset)[0] for offset in range(0, len(data), ENTRY.size)]
+        assert keys == sorted(keys)
+
+    @m.context("Test probing")
+    @m.it("Probing should find the book moves of a position with their weights")
+    def test_probe(self, book_path):
+        with OpeningBook(book_path) as book:
+            position = parse_fen(START_FEN)
+            weights = {
+                move_to_algebraic(entry.move): entry.weight
+                for entry in book.get_entries(position.hash)
+            }
+            # Moves of the losing side get no weight and are left out of the book.
+            assert weights == {"e2e4": 3, "d2d4": 1}
+            assert move_to_algebraic(book.probe(position, BEST_MOVE)) == "e2e4"
+            moves = {book.probe(position, generator=random.Random(seed)) for seed in range(20)}
+            assert sorted(move_to_algebraic(move) for move in moves) == ["d2d4", "e2e4"]
+            assert book.probe(parse_fen("4k3/8/8/8/8/8/8/R3K3 w - - 0 1")) is None
+
+    @m.context("Test game")
+    @m.it("The computer should answer from the book when it has the position")
+    def test_computer_book_move(self, book_path):
+        game = Game()
+        game.opening_book = OpeningBook(book_path)
+        game.player_1.is_computer = True
+        game._player_turn(game.player_1, game.player_2)
+        assert [move_to_algebraic(move) for move in game.move_history] in (["e2e4"], ["d2d4"])
+        game.opening_book.close()
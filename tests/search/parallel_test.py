@@ -0,0 +1,42 @@
+from pytest import mark as m
+from src.fen import parse_fen
+from src.game import Game
+from src.move import move_to_algebraic
+from src.parallel import parallel_search
+from src.search import MATE_SCORE, Search
+from src.transposition import TranspositionTable
+
+MATE_IN_ONE_FEN = "6k1/5ppp/8/8/8/8/5PPP/3Q2K1 w - - 0 1"
+MIDDLEGAME_FEN = "r1bqkbnr/pppp1ppp/2n5/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R w KQkq - 2 3"
+
+
+@m.describe("Test parallel root splitting search")
+class TestParallelSearch:
+    @m.context("Test scores")
+    @m.it("Workers should score every root move like a serial fixed depth search")
+    def test_matches_serial_scores(self):
+        position = parse_fen(MIDDLEGAME_FEN)
+        result = parallel_search(position, depth=2, workers=2)
+        search = Search(parse_fen(MIDDLEGAME_FEN), TranspositionTable(1))
+        for move, score in result.move_scores.items():
+            assert score == search.score_root_move(move, 2)
+        assert result.score == max(result.move_scores.values())
+        assert result.move_scores[result.best_move] == result.score
+
+    @m.context("Test shared table")
+    @m.it("A table shared by the workers should find a mate in one")
+    def test_shared_table_mate_in_one(self):
+        result = parallel_search(parse_fen(MATE_IN_ONE_FEN), depth=2, workers=2, shared_table_mb=1)
+        assert move_to_algebraic(result.best_move) == "d1d8"
+        assert result.score == MATE_SCORE - 1
+
+    @m.context("Test statistics")
+    @m.it("Node counts should be reported per worker and in total")
+    def test_worker_statistics(self):
+        game = Game()
+        result = game.find_best_move_parallel(depth=2, workers=2)
+        assert 1 <= len(result.workers) <= 2
+        assert sum(stats.moves for stats in result.workers) == 20
+        assert sum(stats.nodes for stats in result.workers) == result.nodes
+        assert result.nodes_per_second > 0
+        assert game.board.position.history == []
@@ -0,0 +1,72 @@
+from pytest import mark as m
+from src.fen import parse_fen
+from src.game import Game
+from src.move import algebraic_to_squares, encode_move, move_to_algebraic
+from src.search import MATE_SCORE, Search, search_position
+
+MATE_IN_ONE_FEN = "6k1/5ppp/8/8/8/8/5PPP/3Q2K1 w - - 0 1"
+
+
+@m.describe("Test alpha-beta search")
+class TestSearch:
+    @m.context("Test mates")
+    @m.it("Search should find a mate in one and report it in the score and PV")
+    def test_mate_in_one(self):
+        result = search_position(parse_fen(MATE_IN_ONE_FEN), max_depth=3)
+        assert move_to_algebraic(result.best_move) == "d1d8"
+        assert result.score == MATE_SCORE - 1
+        assert [move_to_algebraic(move) for move in result.pv] == ["d1d8"]
+
+    @m.context("Test material")
+    @m.it("Search should capture a hanging queen")
+    def test_capture_hanging_queen(self):
+        position = parse_fen("4k3/8/8/3q4/8/8/3R4/4K3 w - - 0 1")
+        result = search_position(position, max_depth=2)
+        assert move_to_algebraic(result.best_move) == "d2d5"
+        assert result.score > 0
+
+    @m.context("Test limits")
+    @m.it("Node and time limits should stop the search with a legal best move")
+    def test_limits(self):
+        position = parse_fen("r1bqkbnr/pppp1ppp/2n5/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R w KQkq - 2 3")
+        initial_hash = position.hash
+        result = search_position(position, max_nodes=2000)
+        assert result.best_move
+        assert result.nodes < 2000 + 1024
+        result = search_position(position, time_limit=0.2)
+        assert result.best_move
+        assert result.elapsed < 1.0
+        assert position.hash == initial_hash
+        assert position.history == []
+
+    @m.context("Test iterative deepening")
+    @m.it("The PV should start with the best move and grow with the depth")
+    def test_principal_variation(self):
+        result = search_position(parse_fen("4k3/8/8/8/8/8/8/R3K3 w - - 0 1"), max_depth=3)
+        assert result.depth == 3
+        assert result.pv[0] == result.best_move
+        assert len(result.pv) == 3
+
+    @m.context("Test game API")
+    @m.it("The computer should play its best move through the game")
+    def test_computer_turn(self):
+        game = Game()
+        game.player_1.is_computer = True
+        game.computer_time_limit = 0.2
+        game._player_turn(game.player_1, game.player_2)
+        assert game.board.position.turn == game.player_2.color
+        assert len([piece for piece in game.board.pieces if piece and piece.has_moved]) == 1
+
+    @m.context("Test repetitions")
+    @m.it("Positions already played in the game should count as repetitions")
+    def test_game_repetitions(self):
+        game = Game()
+        for move in ("g1f3", "g8f6", "f3g1", "f6g8"):
+            game.start_turn(*game.get_players_to_move())
+            game.play_move(*algebraic_to_squares(move))
+        assert game.board.position.hash == game.hash_history[0]
+        position = game.board.position
+        knight_move = encode_move(*algebraic_to_squares("g1f3"))
+        assert Search(position).score_root_move(knight_move, 1) != 0
+        game_search = Search(position, previous_hashes=game.hash_history)
+        assert game_search.score_root_move(knight_move, 1) == 0
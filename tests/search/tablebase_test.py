@@ -0,0 +1,79 @@
+import pytest
+from pytest import mark as m
+from src.bitboard import WHITE
+from src.fen import parse_fen
+from src.game import Game
+from src.move import move_to_algebraic
+from src.tablebase import (
+    DRAW,
+    ILLEGAL_ENTRY,
+    LOSS,
+    WIN,
+    Tablebase,
+    TablebaseResult,
+    Tablebases,
+)
+
+MATE_IN_ONE_FEN = "7k/8/5K2/8/8/8/8/6Q1 w - - 0 1"
+
+
+@pytest.fixture(scope="module")
+def tablebases(tmp_path_factory):
+    return Tablebases(str(tmp_path_factory.mktemp("tablebases")))
+
+
+@m.describe("Test endgame tablebases")
+class TestTablebases:
+    @m.context("Test generation")
+    @m.it("King and queen against king should be mated in at most ten moves")
+    def test_longest_mate(self, tablebases):
+        entries = tablebases.get("KQvK").entries[WHITE]
+        assert max(entry for entry in entries if entry != ILLEGAL_ENTRY) == 20
+
+    @m.context("Test probing")
+    @m.it("Probing should give the result and distance to mate for the side to move")
+    def test_probe(self, tablebases):
+        assert tablebases.probe(parse_fen(MATE_IN_ONE_FEN)) == TablebaseResult(WIN, 1)
+        checkmate = parse_fen("7k/6Q1/5K2/8/8/8/8/8 b - - 0 1")
+        assert tablebases.probe(checkmate) == TablebaseResult(LOSS, 0)
+        stalemate = parse_fen("7k/8/6Q1/5K2/8/8/8/8 b - - 0 1")
+        assert tablebases.probe(stalemate) == TablebaseResult(DRAW, None)
+        # Positions with the queen on Black's side are probed with the colors flipped.
+        black_queen = tablebases.probe(parse_fen("8/8/8/8/8/1K6/6q1/7k w - - 0 1"))
+        assert black_queen.wdl == LOSS
+        assert tablebases.probe(parse_fen("7K/6Q1/1k6/8/8/8/8/8 b - - 0 1")) == black_queen
+        assert tablebases.probe(parse_fen("8/8/8/8/8/8/6q1/6K1 w - - 0 1")) is None
+        assert tablebases.probe(parse_fen("8/8/8/4k3/8/8/6q1/6K1 w - - 0 1")).wdl == DRAW
+        assert tablebases.probe(parse_fen("4k3/4p3/8/8/8/8/8/4K3 w - - 0 1")) is None
+
+    @m.context("Test best moves")
+    @m.it("The best move should mate as fast as possible")
+    def test_best_move(self, tablebases):
+        assert move_to_algebraic(tablebases.best_move(parse_fen(MATE_IN_ONE_FEN))) == "g1g7"
+
+    @m.context("Test table files")
+    @m.it("Generated tables should be saved and loaded back from the directory")
+    def test_load(self, tablebases):
+        loaded = Tablebases(tablebases.directory).get("KvKQ")
+        assert loaded.material == "KQvK"
+        assert loaded.entries == tablebases.get("KQvK").entries
+        with pytest.raises(ValueError):
+            Tablebase("KPvK")
+
+    @m.context("Test game")
+    @m.it("The computer should mate with the tablebase move")
+    def test_game_move(self, tablebases):
+        game = Game.from_fen(MATE_IN_ONE_FEN)
+        game.tablebases = tablebases
+        game.player_1.is_computer = True
+        game._player_turn(game.player_1, game.player_2)
+        assert not game.start_turn(*game.get_players_to_move())
+        assert game.checkmate
+
+    @m.context("Test game")
+    @m.it("Games should end early once the tablebases show a draw")
+    def test_game_draw(self, tablebases, capsys):
+        game = Game.from_fen("8/8/8/4k3/8/8/8/K7 w - - 0 1")
+        game.tablebases = tablebases
+        game.play_game()
+        assert "Draw" in capsys.readouterr().out
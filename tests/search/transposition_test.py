@@ -0,0 +1,82 @@
+from pytest import mark as m
+from src.transposition import (
+    ALWAYS_REPLACE,
+    BUCKET_SIZE,
+    DEPTH_PREFERRED,
+    EXACT,
+    LOWER_BOUND,
+    UPPER_BOUND,
+    TranspositionTable,
+)
+
+
+def colliding_keys(table: TranspositionTable, count: int):
+    return [1 + index * table.bucket_count for index in range(count)]
+
+
+@m.describe("Test transposition table")
+class TestTranspositionTable:
+    @m.context("Test memory cap")
+    @m.it("The table should be preallocated within its size in MB")
+    def test_memory_cap(self):
+        table = TranspositionTable(size_mb=1)
+        assert table.memory_bytes <= 1024 * 1024
+        assert table.memory_bytes > 512 * 1024
+        assert len(table.keys) == len(table.data) == table.size
+
+    @m.context("Test store and probe")
+    @m.it("Stored entries should be returned with their depth, score, bound and move")
+    def test_store_probe(self):
+        table = TranspositionTable(size_mb=1)
+        table.store(0x1234_5678_9ABC_DEF0, 5, -250, LOWER_BOUND, 0xABC)
+        entry = table.probe(0x1234_5678_9ABC_DEF0)
+        assert entry == (5, -250, LOWER_BOUND, 0xABC)
+        assert table.probe(0x0FED_CBA9_8765_4321) is None
+        assert table.hits == 1
+        assert table.misses == 1
+
+    @m.context("Test store and probe")
+    @m.it("Updating an entry without a move should keep the previous best move")
+    def test_store_keeps_move(self):
+        table = TranspositionTable(size_mb=1)
+        table.store(42, 3, 10, EXACT, 77)
+        table.store(42, 4, 12, UPPER_BOUND)
+        assert table.probe(42) == (4, 12, UPPER_BOUND, 77)
+
+    @m.context("Test replacement")
+    @m.it("Depth preferred buckets should keep deeper entries of the current search")
+    def test_depth_preferred(self):
+        table = TranspositionTable(size_mb=1, replacement=DEPTH_PREFERRED)
+        keys = colliding_keys(table, BUCKET_SIZE + 1)
+        for depth, key in enumerate(keys[:BUCKET_SIZE], start=2):
+            table.store(key, depth, 0, EXACT)
+        table.store(keys[-1], 1, 0, EXACT)
+        assert table.probe(keys[-1]) is None
+        assert table.collisions == 0
+        table.new_search()
+        table.store(keys[-1], 1, 0, EXACT)
+        assert table.probe(keys[-1]) is not None
+        assert table.probe(keys[0]) is None
+        assert table.collisions == 1
+
+    @m.context("Test replacement")
+    @m.it("Always replace buckets should evict the shallowest entry")
+    def test_always_replace(self):
+        table = TranspositionTable(size_mb=1, replacement=ALWAYS_REPLACE)
+        keys = colliding_keys(table, BUCKET_SIZE + 1)
+        for depth, key in enumerate(keys[:BUCKET_SIZE], start=2):
+            table.store(key, depth, 0, EXACT)
+        table.store(keys[-1], 1, 0, EXACT)
+        assert table.probe(keys[-1]) is not None
+        assert table.probe(keys[0]) is None
+        assert table.probe(keys[1]) is not None
+
+    @m.context("Test clear")
+    @m.it("Clearing the table should drop entries and counters")
+    def test_clear(self):
+        table = TranspositionTable(size_mb=1)
+        table.store(7, 1, 1, EXACT)
+        assert table.hashfull() >= 0
+        table.clear()
+        assert table.probe(7) is None
+        assert table.stores == 0
@@ -0,0 +1,87 @@
+import asyncio
+
+from pytest import mark as m
+from src.load_client import GameClient, run_load
+from src.game import Game
+from src.server import GameServer, GameSession, start_server
+
+MATE_IN_ONE_FEN = "6k1/5ppp/8/8/8/8/5PPP/3Q2K1 w - - 0 1"
+
+
+async def with_server(scenario, think_time: float = 0.05):
+    server = await start_server(GameServer(think_time=think_time), port=0)
+    port = server.sockets[0].getsockname()[1]
+    try:
+        return await scenario(port)
+    finally:
+        server.close()
+        await server.wait_closed()
+
+
+@m.describe("Test asyncio game server")
+class TestGameServer:
+    @m.context("Test human moves")
+    @m.it("A session should accept legal moves and report errors for illegal ones")
+    def test_moves(self):
+        async def scenario(port: int):
+            client = await GameClient.connect(port=port)
+            game = await client.request("new")
+            assert game["ok"] and game["turn"] == "white"
+            moves = await client.request("moves", game=game["game"])
+            assert len(moves["moves"]) == 20
+            response = await client.request("move", game=game["game"], move="e2e4")
+            assert response["ok"] and response["turn"] == "black" and response["reply"] is None
+            assert response["fen"].startswith("rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b")
+            response = await client.request("move", game=game["game"], move="e2e4")
+            assert not response["ok"]
+            for off_board in ("a9a1", "e7i5", "e0e1"):
+                response = await client.request("move", game=game["game"], move=off_board)
+                assert response["error"] == f"{off_board} is not made of two squares on the board"
+            response = await client.request("dance", game=game["game"])
+            assert not response["ok"]
+            for malformed in ({"game": [game["game"]]}, {"computer": []}, {"fen": 5}):
+                command = "state" if "game" in malformed else "new"
+                assert not (await client.request(command, **malformed))["ok"]
+            assert (await client.request("state", game=game["game"]))["ok"]
+            assert (await client.request("close", game=game["game"]))["ok"]
+            assert not (await client.request("state", game=game["game"]))["ok"]
+            await client.close()
+
+        asyncio.run(with_server(scenario))
+
+    @m.context("Test engine moves")
+    @m.it("The engine should reply from the executor and finish the game")
+    def test_computer_reply(self):
+        async def scenario(port: int):
+            client = await GameClient.connect(port=port)
+            game = await client.request("new", fen=MATE_IN_ONE_FEN, computer="white")
+            assert game["ok"]
+            assert game["reply"] == "d1d8"
+            assert game["status"] == "checkmate"
+            response = await client.request("move", game=game["game"], move="g8h8")
+            assert not response["ok"]
+            await client.close()
+
+        asyncio.run(with_server(scenario))
+
+    @m.context("Test load generator")
+    @m.it("Concurrent sessions should be served without errors")
+    def test_load_client(self):
+        async def scenario(port: int):
+            return await run_load(sessions=20, plies=6, port=port)
+
+        report = asyncio.run(with_server(scenario))
+        assert report.sessions == 20
+        assert report.errors == 0
+        assert report.requests >= 20 * 6
+
+    @m.context("Test game termination")
+    @m.it("Sessions should only check for a first legal move until a move is played")
+    def test_lazy_legal_moves(self):
+        session = GameSession(1, Game())
+        assert not session.is_over and session.game.legal_moves == {}
+        session.play("e2e4")
+        assert (52, 36) in session.game.legal_moves
+        assert not session.is_over and session.game.legal_moves.get((12, 28)) is None
+        session = GameSession(2, Game.from_fen("7k/6Q1/5K2/8/8/8/8/8 b - - 0 1"))
+        assert session.is_over and session.status == "checkmate"